@@ -1,5 +1,23 @@
-from django.contrib import admin
-from .models import Service, Stylist, Booking, ContactMessage, Review, SalonSettings
+from django.contrib import admin, messages
+from .models import Service, Stylist, Booking, Customer, ContactMessage, Review, SalonSettings, EmailOutbox
+from .customers import refresh_customers
+from .stats import invalidate_booking_stats
+from .events import publish_booking_events
+from .scheduling import SlotTaken, confirm_booking
+from .search import search_object_ids
+
+
+# ==================== FULL-TEXT SEARCH ====================
+class FullTextSearchMixin:
+    """Changelist search through the full-text index instead of LIKE '%...%' scans"""
+    search_kind = None
+    search_limit = 1000
+    
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        ids = search_object_ids(self.search_kind, search_term, self.search_limit)
+        return queryset.filter(pk__in=ids), False
 
 
 # ==================== SERVICE ADMIN ====================
@@ -52,10 +70,11 @@ class StylistAdmin(admin.ModelAdmin):
 
 # ==================== BOOKING ADMIN ====================
 @admin.register(Booking)
-class BookingAdmin(admin.ModelAdmin):
+class BookingAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['fullname', 'service', 'stylist', 'date', 'time', 'status', 'phone']
     list_filter = ['status', 'date', 'service']
     search_fields = ['fullname', 'phone', 'email']
+    search_kind = 'booking'
     readonly_fields = ['created_at', 'updated_at', 'confirmed_at', 'completed_at']
     date_hierarchy = 'date'
     
@@ -78,25 +97,68 @@ class BookingAdmin(admin.ModelAdmin):
     actions = ['confirm_booking', 'mark_completed', 'cancel_booking']
     
     def confirm_booking(self, request, queryset):
-        updated = queryset.update(status='confirmed')
-        self.message_user(request, f'{updated} bookings confirmed')
+        """Confirm one by one under the stylist lock; bookings whose slot was re-booked are skipped"""
+        confirmed, skipped = 0, []
+        for booking in queryset.select_related('service', 'stylist').exclude(status='confirmed'):
+            try:
+                confirm_booking(booking)
+                confirmed += 1
+            except SlotTaken:
+                skipped.append(booking)
+        invalidate_booking_stats()
+        self.message_user(request, f'{confirmed} bookings confirmed')
+        if skipped:
+            self.message_user(
+                request,
+                f'{len(skipped)} not confirmed, their stylist is already booked at that time: '
+                + ', '.join(str(booking) for booking in skipped),
+                level=messages.WARNING,
+            )
     
     def mark_completed(self, request, queryset):
         from django.utils import timezone
-        updated = queryset.update(status='completed', completed_at=timezone.now())
+        now = timezone.now()
+        ids = list(queryset.values_list('id', flat=True))
+        phone_keys = set(queryset.values_list('phone_key', flat=True))
+        updated = queryset.update(status='completed', completed_at=now, updated_at=now)
+        invalidate_booking_stats()
+        refresh_customers(phone_keys)
+        publish_booking_events('completed', ids)
         self.message_user(request, f'{updated} bookings marked as completed')
     
     def cancel_booking(self, request, queryset):
-        updated = queryset.update(status='cancelled')
+        from django.utils import timezone
+        ids = list(queryset.values_list('id', flat=True))
+        phone_keys = set(queryset.values_list('phone_key', flat=True))
+        updated = queryset.update(status='cancelled', updated_at=timezone.now())
+        invalidate_booking_stats()
+        refresh_customers(phone_keys)
+        publish_booking_events('cancelled', ids)
         self.message_user(request, f'{updated} bookings cancelled')
 
 
+# ==================== CUSTOMER ADMIN ====================
+@admin.register(Customer)
+class CustomerAdmin(admin.ModelAdmin):
+    list_display = ['name', 'phone_key', 'booking_count', 'completed_count', 'cancelled_count', 'total_spent', 'last_booking_at']
+    search_fields = ['phone_key', 'name']
+    readonly_fields = [
+        'phone_key', 'name', 'email', 'booking_count', 'completed_count', 'cancelled_count',
+        'total_spent', 'first_booking_at', 'last_booking_at', 'last_visit_at', 'updated_at'
+    ]
+    
+    def has_add_permission(self, request):
+        # Rows are derived from bookings
+        return False
+
+
 # ==================== CONTACT MESSAGE ADMIN ====================
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'is_read', 'replied', 'created_at']
     list_filter = ['is_read', 'replied', 'created_at']
     search_fields = ['name', 'email', 'subject', 'message']
+    search_kind = 'contact'
     readonly_fields = ['created_at']
     date_hierarchy = 'created_at'
     
@@ -126,10 +188,11 @@ class ContactMessageAdmin(admin.ModelAdmin):
 
 # ==================== REVIEW ADMIN ====================
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['client_name', 'rating', 'title', 'is_approved', 'created_at']
     list_filter = ['rating', 'is_approved', 'created_at']
     search_fields = ['client_name', 'title', 'comment']
+    search_kind = 'review'
     readonly_fields = ['created_at']
     date_hierarchy = 'created_at'
     
@@ -149,7 +212,8 @@ class ReviewAdmin(admin.ModelAdmin):
     actions = ['approve_reviews']
     
     def approve_reviews(self, request, queryset):
-        updated = queryset.update(is_approved=True)
+        from django.utils import timezone
+        updated = queryset.update(is_approved=True, updated_at=timezone.now())
         self.message_user(request, f'{updated} reviews approved')
 
 
@@ -182,3 +246,22 @@ class SalonSettingsAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         # Prevent deletion
         return False
+
+
+# ==================== EMAIL OUTBOX ADMIN ====================
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['subject']
+    readonly_fields = ['subject', 'body', 'from_email', 'recipients', 'attempts', 'last_error',
+                       'claim_token', 'created_at', 'sent_at']
+    
+    actions = ['retry_emails']
+    
+    def retry_emails(self, request, queryset):
+        from django.utils import timezone
+        from .emails import dispatch_outbox
+        updated = queryset.exclude(status='sent').update(status='pending', next_attempt_at=timezone.now())
+        dispatch_outbox()
+        self.message_user(request, f'{updated} emails queued for retry')
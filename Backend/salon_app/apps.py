@@ -5,3 +5,6 @@ class SalonAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'salon_app'
     verbose_name = 'Salon Management'
+
+    def ready(self):
+        from . import filters, signals  # noqa: F401
@@ -0,0 +1,161 @@
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Booking, SalonSettings, Stylist
+
+
+# ==================== HELPERS ====================
+def to_minutes(value):
+    """Minutes since midnight for a time"""
+    return value.hour * 60 + value.minute
+
+
+def from_minutes(minutes):
+    """Time for a number of minutes since midnight"""
+    return time(minutes // 60, minutes % 60)
+
+
+def get_slot_interval():
+    """Minutes between two consecutive slot start times"""
+    return getattr(settings, 'BOOKING_SLOT_INTERVAL_MINUTES', 60)
+
+
+def get_opening_hours():
+    """Opening and closing time of the salon, in minutes since midnight"""
+    salon = SalonSettings.get_settings()
+    opening_time = salon.opening_time
+    closing_time = salon.closing_time
+    if isinstance(opening_time, str):
+        opening_time = datetime.strptime(opening_time, '%H:%M').time()
+    if isinstance(closing_time, str):
+        closing_time = datetime.strptime(closing_time, '%H:%M').time()
+    return to_minutes(opening_time), to_minutes(closing_time)
+
+
+def merge_intervals(intervals):
+    """Sort and merge overlapping (start, end) intervals"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def overlaps(intervals, start, end):
+    """Check if [start, end) overlaps any of the sorted, merged intervals"""
+    index = bisect_right(intervals, (start, float('inf')))
+    if index and intervals[index - 1][1] > start:
+        return True
+    return index < len(intervals) and intervals[index][0] < end
+
+
+# ==================== OCCUPANCY ====================
+def occupancy_queryset(stylist_ids, date_from, date_to, exclude_booking_id=None):
+    """Rows of (stylist_id, date, time, starts_at, ends_at) for bookings that block a stylist"""
+    bookings = Booking.objects.filter(
+        stylist_id__in=stylist_ids,
+        date__range=(date_from, date_to),
+        status__in=Booking.BLOCKING_STATUSES,
+    )
+    if exclude_booking_id:
+        bookings = bookings.exclude(pk=exclude_booking_id)
+    return bookings.order_by().values_list('stylist_id', 'date', 'time', 'starts_at', 'ends_at')
+
+
+def get_occupancy(stylist_ids, date_from, date_to, exclude_booking_id=None):
+    """
+    Booked intervals per stylist and day, fetched with a single query.
+    Returns {(stylist_id, date): [(start_minute, end_minute), ...]}
+    """
+    intervals = defaultdict(list)
+    rows = occupancy_queryset(stylist_ids, date_from, date_to, exclude_booking_id)
+    for stylist_id, day, start_time, starts_at, ends_at in rows:
+        start = to_minutes(start_time)
+        intervals[(stylist_id, day)].append((start, start + (ends_at - starts_at) // timedelta(minutes=1)))
+
+    return {key: merge_intervals(value) for key, value in intervals.items()}
+
+
+def free_slots(intervals, duration, opening, closing, interval, not_before=None):
+    """Slot start minutes where a service of `duration` fits between the bookings"""
+    slots = []
+    start = opening
+    while start + duration <= closing:
+        if (not_before is None or start >= not_before) and not overlaps(intervals, start, start + duration):
+            slots.append(start)
+        start += interval
+    return slots
+
+
+# ==================== AVAILABILITY ====================
+def get_candidate_stylists(service=None, stylists=None):
+    """Active stylists offering the service, optionally restricted to a set"""
+    queryset = Stylist.objects.filter(is_active=True)
+    if service is not None:
+        queryset = queryset.filter(available_services=service)
+    if stylists is not None:
+        queryset = queryset.filter(pk__in=[getattr(s, 'pk', s) for s in stylists])
+    return list(queryset.order_by('name', 'id'))
+
+
+def find_available_slots(service=None, date_from=None, date_to=None, stylists=None):
+    """
+    Free slots for many stylists and days at once.
+    Returns {stylist: {date: [time, ...]}} in stylist order.
+    """
+    date_from = date_from or timezone.localdate()
+    date_to = date_to or date_from
+    if stylists is None or service is not None or not all(isinstance(s, Stylist) for s in stylists):
+        stylists = get_candidate_stylists(service, stylists)
+    stylists = list(stylists)
+
+    interval = get_slot_interval()
+    duration = service.duration_minutes if service is not None else interval
+    opening, closing = get_opening_hours()
+
+    now = timezone.localtime()
+    occupancy = get_occupancy([stylist.pk for stylist in stylists], date_from, date_to)
+
+    days = []
+    day = date_from
+    while day <= date_to:
+        days.append(day)
+        day += timedelta(days=1)
+
+    availability = {}
+    for stylist in stylists:
+        per_day = {}
+        for day in days:
+            if day < now.date():
+                per_day[day] = []
+                continue
+            not_before = to_minutes(now) + 1 if day == now.date() else None
+            slots = free_slots(
+                occupancy.get((stylist.pk, day), []),
+                duration, opening, closing, interval, not_before
+            )
+            per_day[day] = [from_minutes(start) for start in slots]
+        availability[stylist] = per_day
+
+    return availability
+
+
+def find_first_available_slot(service=None, date_from=None, days=14, stylists=None):
+    """Earliest (stylist, date, time) with a free slot, or None"""
+    date_from = date_from or timezone.localdate()
+    date_to = date_from + timedelta(days=days - 1)
+    availability = find_available_slots(service, date_from, date_to, stylists)
+
+    best = None
+    for stylist, per_day in availability.items():
+        for day, slots in per_day.items():
+            if slots and (best is None or (day, slots[0]) < (best[1], best[2])):
+                best = (stylist, day, slots[0])
+    return best
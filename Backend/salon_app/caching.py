@@ -0,0 +1,55 @@
+from django.core.cache import cache
+
+
+# Process-local hit/miss counters, exported by the metrics endpoint
+CACHE_STATS = {'hits': 0, 'misses': 0}
+
+
+# ==================== MODEL VERSIONS ====================
+def model_version_key(model):
+    return f'salon:version:{model._meta.label_lower}'
+
+
+def get_model_version(model):
+    """Current cache version of a model (bumped on every write)"""
+    key = model_version_key(model)
+    version = cache.get(key)
+    if version is None:
+        version = 1
+        cache.add(key, version, None)
+    return version
+
+
+def bump_model_version(model):
+    """Invalidate every cached value built from this model"""
+    key = model_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def versioned_key(name, models, *parts):
+    """Cache key that changes whenever any of the models is written"""
+    versions = '.'.join(str(get_model_version(model)) for model in models)
+    suffix = ':'.join(str(part) for part in parts)
+    return f'salon:{name}:{versions}:{suffix}'
+
+
+# ==================== READ-THROUGH CACHE ====================
+def get_or_compute(key, compute, timeout=None):
+    """Return the cached value for key, computing and storing it on a miss"""
+    value = cache.get(key)
+    if value is not None:
+        CACHE_STATS['hits'] += 1
+        return value
+
+    CACHE_STATS['misses'] += 1
+    value = compute()
+    cache.set(key, value, timeout)
+    return value
+
+
+def cached_for_models(name, models, compute, *parts, timeout=300):
+    """Cache compute() until one of the models is written or timeout expires"""
+    return get_or_compute(versioned_key(name, models, *parts), compute, timeout)
@@ -0,0 +1,319 @@
+import csv
+import json
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import bump_model_version
+from .models import Booking, Service, Stylist
+
+
+SERVICE_FIELDS = ['name', 'category', 'description', 'price', 'duration_minutes', 'is_active']
+STYLIST_FIELDS = ['email', 'name', 'phone', 'specialization', 'bio', 'is_active', 'services']
+
+# Service names in a stylist's CSV "services" column
+SERVICES_SEPARATOR = '|'
+
+# Same rule as the Stylist.phone validator (bulk_create skips model validation)
+PHONE_RE = re.compile(r'^\+?[0-9]{7,}$')
+
+
+class CatalogError(Exception):
+    """Invalid catalog file; carries one message per bad row"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__('\n'.join(errors))
+
+
+# ==================== READING ====================
+def read_catalog(stream, fmt, kind=None):
+    """
+    Parse a JSON document ({"services": [...], "stylists": [...]}) or a CSV
+    file of one kind. CSV kind is taken from the header when not given.
+    Returns (services, stylists) as lists of raw dicts.
+    """
+    if fmt == 'json':
+        data = json.load(stream)
+        return data.get('services', []), data.get('stylists', [])
+
+    reader = csv.DictReader(stream)
+    header = set(reader.fieldnames or [])
+    kind = kind or ('stylists' if 'email' in header else 'services')
+    rows = []
+    for row in reader:
+        if kind == 'stylists' and 'services' in row:
+            names = row['services'] or ''
+            row['services'] = [name.strip() for name in names.split(SERVICES_SEPARATOR) if name.strip()]
+        rows.append(row)
+    return (rows, []) if kind == 'services' else ([], rows)
+
+
+def to_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'y')
+
+
+def clean_service(row, line, categories):
+    errors = []
+    name = (row.get('name') or '').strip()
+    if not name:
+        errors.append(f'services[{line}]: name is required')
+    category = (row.get('category') or '').strip()
+    if category not in categories:
+        errors.append(f'services[{line}]: unknown category "{category}"')
+    try:
+        price = Decimal(str(row.get('price'))).quantize(Decimal('0.01'))
+        if price < 0:
+            raise InvalidOperation
+    except (InvalidOperation, ValueError):
+        errors.append(f'services[{line}]: invalid price "{row.get("price")}"')
+        price = None
+    try:
+        duration = int(row.get('duration_minutes') or 60)
+    except (TypeError, ValueError):
+        errors.append(f'services[{line}]: invalid duration_minutes "{row.get("duration_minutes")}"')
+        duration = None
+
+    values = {
+        'name': name,
+        'category': category,
+        'description': (row.get('description') or '').strip(),
+        'price': price,
+        'duration_minutes': duration,
+        'is_active': to_bool(row.get('is_active', True)),
+    }
+    return values, errors
+
+
+def clean_stylist(row, line, service_names):
+    errors = []
+    email = (row.get('email') or '').strip()
+    try:
+        validate_email(email)
+    except ValidationError:
+        errors.append(f'stylists[{line}]: invalid email "{email}"')
+    phone = (row.get('phone') or '').strip()
+    if not PHONE_RE.match(phone):
+        errors.append(f'stylists[{line}]: invalid phone "{phone}"')
+    specialization = (row.get('specialization') or 'general').strip()
+    if specialization not in dict(Stylist.SPECIALIZATION_CHOICES):
+        errors.append(f'stylists[{line}]: unknown specialization "{specialization}"')
+
+    values = {
+        'email': email,
+        'name': (row.get('name') or '').strip(),
+        'phone': phone,
+        'specialization': specialization,
+        'bio': (row.get('bio') or '').strip(),
+        'is_active': to_bool(row.get('is_active', True)),
+    }
+
+    # None leaves the stylist's services untouched; a list replaces them
+    services = None
+    if row.get('services') is not None:
+        services = set(row['services'])
+        for name in sorted(services - service_names):
+            errors.append(f'stylists[{line}]: unknown service "{name}"')
+    return values, services, errors
+
+
+# ==================== IMPORT ====================
+def diff_rows(model, records, key, existing):
+    """Split records into new instances and (instance, changed fields) for existing ones"""
+    to_create, to_update, unchanged = [], [], 0
+    for values in records:
+        instance = existing.get(values[key])
+        if instance is None:
+            to_create.append(model(**values))
+            continue
+        changed = [field for field, value in values.items() if getattr(instance, field) != value]
+        if changed:
+            for field in changed:
+                setattr(instance, field, values[field])
+            to_update.append((instance, changed))
+        else:
+            unchanged += 1
+    return to_create, to_update, unchanged
+
+
+def apply_updates(model, to_update, now):
+    """One bulk_update covering every changed field; updated_at moves so cached responses revalidate"""
+    if not to_update:
+        return
+    fields = {'updated_at'}
+    for instance, changed in to_update:
+        fields.update(changed)
+        instance.updated_at = now
+    model.objects.bulk_update([instance for instance, changed in to_update], sorted(fields), batch_size=500)
+
+
+def import_catalog(services, stylists, deactivate_missing=False, dry_run=False):
+    """
+    Diff the parsed catalog against the database and apply the changes with
+    bulk_create/bulk_update in a single transaction. Services are keyed by
+    name and stylists by email; a stylist's "services" list replaces its
+    available services. Returns a summary dict.
+    """
+    errors = []
+    service_records = []
+    seen = set()
+    # Older data uses categories outside the model choices (e.g. "general"); keep them importable
+    categories = set(dict(Service.SERVICE_CATEGORY_CHOICES))
+    categories.update(Service.objects.order_by().values_list('category', flat=True).distinct())
+    for line, row in enumerate(services, start=1):
+        values, row_errors = clean_service(row, line, categories)
+        if values['name'] in seen:
+            row_errors.append(f'services[{line}]: duplicate name "{values["name"]}"')
+        seen.add(values['name'])
+        errors.extend(row_errors)
+        service_records.append(values)
+
+    existing_services = {service.name: service for service in Service.objects.all()}
+    # Stylists may reference services created by this same import
+    service_names = set(existing_services) | seen
+
+    stylist_records = []
+    seen = set()
+    for line, row in enumerate(stylists, start=1):
+        values, links, row_errors = clean_stylist(row, line, service_names)
+        if values['email'] in seen:
+            row_errors.append(f'stylists[{line}]: duplicate email "{values["email"]}"')
+        seen.add(values['email'])
+        errors.extend(row_errors)
+        stylist_records.append((values, links))
+
+    if errors:
+        raise CatalogError(errors)
+
+    now = timezone.now()
+    summary = {}
+    with transaction.atomic():
+        # ---------- services ----------
+        to_create, to_update, unchanged = diff_rows(Service, service_records, 'name', existing_services)
+        if deactivate_missing and services:
+            names = {values['name'] for values in service_records}
+            for name, service in existing_services.items():
+                if name not in names and service.is_active:
+                    service.is_active = False
+                    to_update.append((service, ['is_active']))
+        created = Service.objects.bulk_create(to_create, batch_size=500)
+        apply_updates(Service, to_update, now)
+        # bulk_update skips the post_save signal that keeps booking end times in sync
+        retimed = [service.pk for service, changed in to_update if 'duration_minutes' in changed]
+        if retimed:
+            Booking.objects.filter(service_id__in=retimed, starts_at__gte=now).refresh_ends_at()
+        summary['services'] = {'created': len(created), 'updated': len(to_update), 'unchanged': unchanged}
+
+        service_ids = {service.name: service.pk for service in existing_services.values()}
+        service_ids.update({service.name: service.pk for service in created})
+
+        # ---------- stylists ----------
+        existing_stylists = {stylist.email: stylist for stylist in Stylist.objects.all()}
+        to_create, to_update, unchanged = diff_rows(
+            Stylist, [values for values, links in stylist_records], 'email', existing_stylists
+        )
+        if deactivate_missing and stylists:
+            emails = {values['email'] for values, links in stylist_records}
+            for email, stylist in existing_stylists.items():
+                if email not in emails and stylist.is_active:
+                    stylist.is_active = False
+                    to_update.append((stylist, ['is_active']))
+        created = Stylist.objects.bulk_create(to_create, batch_size=500)
+        stylist_ids = {email: stylist.pk for email, stylist in existing_stylists.items()}
+        stylist_ids.update({stylist.email: stylist.pk for stylist in created})
+
+        # ---------- stylist services ----------
+        desired = {
+            stylist_ids[values['email']]: {service_ids[name] for name in links}
+            for values, links in stylist_records if links is not None
+        }
+        Through = Stylist.available_services.through
+        current = {}
+        for link_id, stylist_id, service_id in Through.objects.filter(
+            stylist_id__in=desired
+        ).values_list('id', 'stylist_id', 'service_id'):
+            current.setdefault(stylist_id, {})[service_id] = link_id
+
+        to_link, to_unlink, relinked = [], [], set()
+        for stylist_id, service_set in desired.items():
+            linked = current.get(stylist_id, {})
+            for service_id in service_set - set(linked):
+                to_link.append(Through(stylist_id=stylist_id, service_id=service_id))
+                relinked.add(stylist_id)
+            for service_id in set(linked) - service_set:
+                to_unlink.append(linked[service_id])
+                relinked.add(stylist_id)
+
+        Through.objects.bulk_create(to_link, batch_size=1000)
+        if to_unlink:
+            Through.objects.filter(id__in=to_unlink).delete()
+
+        summary['stylists'] = {'created': len(created), 'updated': len(to_update), 'unchanged': unchanged}
+        summary['links'] = {'added': len(to_link), 'removed': len(to_unlink)}
+
+        # Stylists whose services changed get a new updated_at, like the m2m_changed signal does
+        updated_ids = {instance.pk for instance, changed in to_update}
+        to_update.extend(
+            (stylist, []) for stylist in existing_stylists.values()
+            if stylist.pk in relinked and stylist.pk not in updated_ids
+        )
+        apply_updates(Stylist, to_update, now)
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    if not dry_run:
+        if summary['services']['created'] or summary['services']['updated']:
+            bump_model_version(Service)
+        if summary['stylists']['created'] or to_update or to_link or to_unlink:
+            bump_model_version(Stylist)
+    return summary
+
+
+# ==================== EXPORT ====================
+def service_rows():
+    for values in Service.objects.order_by('category', 'name').values(*SERVICE_FIELDS).iterator():
+        values['price'] = str(values['price'])
+        yield values
+
+
+def stylist_rows():
+    links = {}
+    for stylist_id, name in (
+        Stylist.available_services.through.objects
+        .order_by('service__name').values_list('stylist_id', 'service__name')
+    ):
+        links.setdefault(stylist_id, []).append(name)
+
+    fields = [field for field in STYLIST_FIELDS if field != 'services']
+    for values in Stylist.objects.order_by('name', 'email').values('id', *fields).iterator():
+        values['services'] = links.get(values.pop('id'), [])
+        yield values
+
+
+def write_csv(stream, kind):
+    fields = SERVICE_FIELDS if kind == 'services' else STYLIST_FIELDS
+    rows = service_rows() if kind == 'services' else stylist_rows()
+    writer = csv.DictWriter(stream, fieldnames=fields)
+    writer.writeheader()
+    for row in rows:
+        if kind == 'stylists':
+            row['services'] = SERVICES_SEPARATOR.join(row['services'])
+        writer.writerow(row)
+
+
+def write_json(stream):
+    """Written row by row so large catalogs are never held in memory"""
+    stream.write('{\n  "services": [')
+    for index, row in enumerate(service_rows()):
+        stream.write((',' if index else '') + '\n    ' + json.dumps(row, ensure_ascii=False))
+    stream.write('\n  ],\n  "stylists": [')
+    for index, row in enumerate(stylist_rows()):
+        stream.write((',' if index else '') + '\n    ' + json.dumps(row, ensure_ascii=False))
+    stream.write('\n  ]\n}\n')
@@ -0,0 +1,86 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+# ==================== CONDITIONAL GET ====================
+def make_etag(*parts):
+    """Strong ETag from the given version parts"""
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def not_modified_response(request, etag=None, last_modified=None):
+    """304 response if the client's copy is still current, else None"""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag=None, last_modified=None, max_age=0, private=False):
+    """Add ETag, Last-Modified and Cache-Control headers (private: browser cache only)"""
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    if private:
+        patch_cache_control(response, private=True, max_age=max_age, must_revalidate=True)
+    else:
+        patch_cache_control(response, public=True, max_age=max_age, must_revalidate=True)
+    return response
+
+
+# ==================== CACHED CATALOG VIEWS ====================
+class ConditionalCatalogMixin:
+    """
+    Conditional GET and server-side response caching for read-mostly viewsets.
+    Validators come from the queryset's updated_at maximum and row count, so any
+    save or delete produces a new ETag and a new cache key. Authenticated users
+    may see more rows (inactive stylists), so their responses are private and
+    every response varies on Authorization.
+    """
+    catalog_max_age = 60
+
+    def get_catalog_querysets(self):
+        """Querysets whose updated_at/count determine the representation"""
+        return [self.get_queryset()]
+
+    def get_catalog_validators(self):
+        last_modified = None
+        parts = [self.basename, self.request.get_host(), self.request.get_full_path(),
+                 'auth' if self.request.user.is_authenticated else 'anon']
+        for queryset in self.get_catalog_querysets():
+            aggregates = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+            parts += [aggregates['last_modified'], aggregates['count']]
+            if aggregates['last_modified'] and (last_modified is None or aggregates['last_modified'] > last_modified):
+                last_modified = aggregates['last_modified']
+        return make_etag(*parts), last_modified
+
+    def cached_response(self, method, request, *args, **kwargs):
+        etag, last_modified = self.get_catalog_validators()
+
+        response = not_modified_response(request, etag, last_modified)
+        if response is None:
+            key = f'salon:catalog:{etag}'
+            data = cache.get(key)
+            if data is None:
+                response = method(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                data = response.data
+                cache.set(key, data, getattr(settings, 'CATALOG_CACHE_SECONDS', 300))
+            response = Response(data)
+        patch_vary_headers(response, ['Authorization'])
+        return set_validators(
+            response, etag, last_modified, max_age=self.catalog_max_age, private=request.user.is_authenticated
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,165 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Max, Min, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from .models import Booking, Customer
+
+
+# Status -> Customer counter it feeds (besides booking_count)
+STATUS_COUNTERS = {
+    'completed': 'completed_count',
+    'cancelled': 'cancelled_count',
+}
+AGGREGATE_FIELDS = [
+    'name', 'email', 'booking_count', 'completed_count', 'cancelled_count', 'total_spent',
+    'first_booking_at', 'last_booking_at', 'last_visit_at', 'updated_at',
+]
+CHUNK_SIZE = 2000
+
+
+# ==================== FULL RECOMPUTE ====================
+def customer_aggregates(bookings):
+    """One row per phone_key of the bookings queryset, with every Customer aggregate"""
+    latest = bookings.model.objects.filter(phone_key=OuterRef('phone_key')).order_by('-starts_at', '-id')
+    completed = Q(status='completed')
+    return (
+        bookings.exclude(phone_key='').order_by().values('phone_key').annotate(
+            name=Subquery(latest.values('fullname')[:1]),
+            email=Subquery(latest.values('email')[:1]),
+            booking_count=Count('id'),
+            completed_count=Count('id', filter=completed),
+            cancelled_count=Count('id', filter=Q(status='cancelled')),
+            total_spent=Coalesce(
+                Sum('service__price', filter=completed), Value(Decimal('0')), output_field=DecimalField()
+            ),
+            first_booking_at=Min('starts_at'),
+            last_booking_at=Max('starts_at'),
+            last_visit_at=Max('starts_at', filter=completed),
+        )
+    )
+
+
+def save_aggregates(rows):
+    """Upsert Customer rows from customer_aggregates() output"""
+    now = timezone.now()
+    customers = [Customer(updated_at=now, **row) for row in rows]
+    Customer.objects.bulk_create(
+        customers,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['phone_key'],
+        update_fields=AGGREGATE_FIELDS,
+    )
+    return len(customers)
+
+
+def refresh_customers(phone_keys):
+    """Recompute the given customers from their bookings (phone_key index); drop ones left without bookings"""
+    phone_keys = {key for key in phone_keys if key}
+    if not phone_keys:
+        return
+    with transaction.atomic():
+        rows = list(customer_aggregates(Booking.objects.filter(phone_key__in=phone_keys)))
+        save_aggregates(rows)
+        gone = phone_keys - {row['phone_key'] for row in rows}
+        if gone:
+            Customer.objects.filter(phone_key__in=gone).delete()
+
+
+def rebuild_customers(chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Recompute every customer, chunk by chunk of phone keys in index order,
+    one transaction per chunk. Customers not seen in the pass are deleted.
+    """
+    started = timezone.now()
+    last_key, done = '', 0
+    while True:
+        keys = list(
+            Booking.objects.filter(phone_key__gt=last_key).order_by('phone_key')
+            .values_list('phone_key', flat=True).distinct()[:chunk_size]
+        )
+        if not keys:
+            break
+        with transaction.atomic():
+            rows = customer_aggregates(Booking.objects.filter(phone_key__in=keys))
+            done += save_aggregates(rows)
+        last_key = keys[-1]
+        if progress:
+            progress(done)
+    Customer.objects.filter(updated_at__lt=started).delete()
+    return done
+
+
+# ==================== INCREMENTAL UPDATES ====================
+def later(field, value):
+    return Greatest(Coalesce(F(field), Value(value)), Value(value))
+
+
+def earlier(field, value):
+    return Least(Coalesce(F(field), Value(value)), Value(value))
+
+
+def latest_value(latest, field, value):
+    return Case(When(latest, then=Value(value)), default=F(field), output_field=Customer._meta.get_field(field))
+
+
+def record_booking(booking):
+    """Add a new booking to its customer with F() increments (no re-aggregation)"""
+    if not booking.phone_key:
+        return
+    customer, created = Customer.objects.get_or_create(
+        phone_key=booking.phone_key, defaults={'name': booking.fullname, 'email': booking.email}
+    )
+    # Name and email come from the latest appointment, as in customer_aggregates()
+    latest = Q(last_booking_at__isnull=True) | Q(last_booking_at__lte=booking.starts_at)
+    changes = {
+        'name': latest_value(latest, 'name', booking.fullname),
+        'email': latest_value(latest, 'email', booking.email),
+        'booking_count': F('booking_count') + 1,
+        'first_booking_at': earlier('first_booking_at', booking.starts_at),
+        'last_booking_at': later('last_booking_at', booking.starts_at),
+        'updated_at': timezone.now(),
+    }
+    changes.update(status_changes(booking, None))
+    Customer.objects.filter(pk=customer.pk).update(**changes)
+
+
+def record_status_change(booking, previous):
+    """Move a booking between status counters; leaving 'completed' needs refresh_customers()"""
+    changes = status_changes(booking, previous)
+    if changes and booking.phone_key:
+        Customer.objects.filter(phone_key=booking.phone_key).update(updated_at=timezone.now(), **changes)
+
+
+def status_changes(booking, previous):
+    changes = {}
+    if previous in STATUS_COUNTERS:
+        changes[STATUS_COUNTERS[previous]] = F(STATUS_COUNTERS[previous]) - 1
+    if booking.status in STATUS_COUNTERS:
+        changes[STATUS_COUNTERS[booking.status]] = F(STATUS_COUNTERS[booking.status]) + 1
+    if booking.status == 'completed':
+        changes['total_spent'] = F('total_spent') + booking.service.price
+        changes['last_visit_at'] = later('last_visit_at', booking.starts_at)
+    return changes
+
+
+def booking_saved(booking, created):
+    """
+    Keep the customer of a saved booking current. New bookings and plain
+    status transitions are applied as increments; anything that can't be
+    undone that way (phone, service or time edits, un-completing) refreshes
+    the affected customers from their bookings.
+    """
+    loaded = getattr(booking, '_loaded_customer', None)
+    previous = getattr(booking, '_loaded_status', None)
+    current = (booking.phone_key, booking.service_id, booking.starts_at)
+    if created:
+        record_booking(booking)
+    elif loaded != current or previous == 'completed' and booking.status != 'completed':
+        refresh_customers({loaded[0] if loaded else None, booking.phone_key})
+    elif previous != booking.status:
+        record_status_change(booking, previous)
+    booking._loaded_customer = current
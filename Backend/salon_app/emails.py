@@ -0,0 +1,160 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# In-process fallback when no Celery broker is configured
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='email-outbox')
+# Wakes the fallback up when the next backed-off retry is due
+_retry_timer = None
+_retry_lock = threading.Lock()
+
+
+# ==================== QUEUEING ====================
+def queue_email(subject, message, recipients, from_email=None):
+    """Persist an email in the outbox and deliver it after the transaction commits"""
+    recipients = [recipient for recipient in recipients if recipient]
+    if not recipients:
+        return None
+
+    email = EmailOutbox.objects.create(
+        subject=subject[:255],
+        body=message,
+        from_email=from_email or getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@salon.com'),
+        recipients=recipients,
+    )
+    transaction.on_commit(dispatch_outbox)
+    return email
+
+
+def dispatch_outbox():
+    """Hand outbox delivery to Celery, a background thread, or run it inline"""
+    if getattr(settings, 'EMAIL_OUTBOX_EAGER', False):
+        deliver_outbox()
+    elif getattr(settings, 'CELERY_BROKER_URL', ''):
+        from .tasks import deliver_outbox_task
+        try:
+            deliver_outbox_task.apply_async(retry=False)
+        except Exception as e:
+            # Broker unreachable: the rows stay pending for the next run
+            logger.error(f"Could not enqueue outbox delivery: {e}")
+    else:
+        _executor.submit(_deliver_in_thread)
+
+
+def _deliver_in_thread():
+    close_old_connections()
+    try:
+        deliver_outbox()
+        _schedule_retry()
+    except Exception:
+        logger.exception("Outbox delivery failed")
+    finally:
+        close_old_connections()
+
+
+def _schedule_retry():
+    """Re-dispatch when the earliest pending email is due, so backed-off retries aren't stranded"""
+    global _retry_timer
+    due_at = EmailOutbox.objects.filter(status__in=['pending', 'sending']).aggregate(
+        due_at=Min('next_attempt_at')
+    )['due_at']
+    if due_at is None:
+        return
+    poll = getattr(settings, 'EMAIL_OUTBOX_POLL_SECONDS', 60)
+    delay = min(max((due_at - timezone.now()).total_seconds(), 1), poll)
+    with _retry_lock:
+        if _retry_timer is not None and _retry_timer.is_alive():
+            return
+        _retry_timer = threading.Timer(delay, dispatch_outbox)
+        _retry_timer.daemon = True
+        _retry_timer.start()
+
+
+# ==================== DELIVERY ====================
+def claim_batch(batch_size):
+    """Atomically claim due emails so concurrent workers never send twice"""
+    now = timezone.now()
+    lease = timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_LEASE_SECONDS', 300))
+    due = Q(status='pending') | Q(status='sending')
+    ids = list(
+        EmailOutbox.objects.filter(due, next_attempt_at__lte=now)
+        .order_by('next_attempt_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    # A crashed worker's 'sending' rows become claimable again once the lease expires
+    EmailOutbox.objects.filter(due, pk__in=ids, next_attempt_at__lte=now).update(
+        status='sending', claim_token=token, next_attempt_at=now + lease
+    )
+    return list(EmailOutbox.objects.filter(claim_token=token, status='sending'))
+
+
+def deliver_outbox(batch_size=None, max_batches=None):
+    """Send due outbox emails in batches over a single SMTP connection. Returns sent count."""
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    sent = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        emails = claim_batch(batch_size)
+        if not emails:
+            break
+        batches += 1
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            for email in emails:
+                _record_failure(email, e, max_attempts)
+            break
+
+        try:
+            for email in emails:
+                try:
+                    EmailMessage(
+                        email.subject, email.body, email.from_email, email.recipients,
+                        connection=connection,
+                    ).send()
+                except Exception as e:
+                    _record_failure(email, e, max_attempts)
+                else:
+                    email.status = 'sent'
+                    email.sent_at = timezone.now()
+                    email.attempts += 1
+                    email.last_error = ''
+                    email.save(update_fields=['status', 'sent_at', 'attempts', 'last_error'])
+                    sent += 1
+        finally:
+            connection.close()
+
+    return sent
+
+
+def _record_failure(email, error, max_attempts):
+    """Reschedule with exponential backoff, or give up after max_attempts"""
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= max_attempts:
+        email.status = 'failed'
+    else:
+        email.status = 'pending'
+        email.next_attempt_at = timezone.now() + timedelta(minutes=2 ** email.attempts)
+    email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+    logger.warning(f"Email {email.pk} delivery failed (attempt {email.attempts}): {error}")
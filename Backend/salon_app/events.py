@@ -0,0 +1,252 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .feeds import FEED_ANNOTATIONS, FEED_FIELDS
+from .models import Booking
+
+logger = logging.getLogger(__name__)
+
+STREAM_TICKET_SALT = 'salon_app.events.booking-stream'
+
+
+# ==================== IN-PROCESS BROKER ====================
+class Subscription:
+    """Bounded event queue owned by one event loop (one SSE connection)"""
+
+    def __init__(self, loop, size):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=size)
+        # Set when events were dropped; the client must resync from the changes feed
+        self.overflowed = False
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class LocalBroker:
+    """
+    Fans events out to the subscribers of this process. publish() is called
+    from request threads; delivery hops onto each subscriber's event loop.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.lock = threading.Lock()
+
+    def subscribe(self):
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self.lock:
+            self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers.discard(subscription)
+
+    def publish(self, event):
+        self.deliver(event)
+
+    def deliver(self, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # Loop already closed; the connection is gone
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self):
+        with self.lock:
+            return len(self.subscribers)
+
+
+# ==================== REDIS BROKER ====================
+class RedisBroker(LocalBroker):
+    """
+    Publishes through a Redis channel so every worker process sees every
+    event; one listener thread per process feeds the local subscribers.
+    """
+
+    def __init__(self, url, channel, queue_size=100):
+        import redis
+
+        super().__init__(queue_size)
+        self.redis = redis.Redis.from_url(url)
+        self.channel = channel
+        self.listener = None
+
+    def subscribe(self):
+        self.start_listener()
+        return super().subscribe()
+
+    def publish(self, event):
+        try:
+            self.redis.publish(self.channel, json.dumps(event, cls=DjangoJSONEncoder))
+        except Exception:
+            logger.exception('Could not publish booking event to Redis')
+            # Local subscribers still get it
+            self.deliver(event)
+
+    def start_listener(self):
+        with self.lock:
+            if self.listener is not None and self.listener.is_alive():
+                return
+            self.listener = threading.Thread(target=self.listen, name='booking-events', daemon=True)
+            self.listener.start()
+
+    def listen(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    self.deliver(json.loads(message['data']))
+            except Exception:
+                logger.exception('Booking event listener lost its Redis connection, retrying')
+                threading.Event().wait(1)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """The process-wide broker: Redis when BOOKING_EVENTS_REDIS_URL is set, otherwise in-process"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                url = getattr(settings, 'BOOKING_EVENTS_REDIS_URL', '')
+                queue_size = getattr(settings, 'BOOKING_EVENTS_QUEUE_SIZE', 100)
+                if url:
+                    _broker = RedisBroker(url, getattr(settings, 'BOOKING_EVENTS_CHANNEL', 'salon:booking-events'), queue_size)
+                else:
+                    _broker = LocalBroker(queue_size)
+    return _broker
+
+
+# ==================== BOOKING EVENTS ====================
+def booking_event_type(booking, created):
+    if created:
+        return 'created'
+    previous = getattr(booking, '_loaded_status', None)
+    if previous != booking.status and booking.status in ('confirmed', 'cancelled', 'completed'):
+        return booking.status
+    return 'updated'
+
+
+def publish_booking_events(event_type, booking_ids):
+    """
+    Publish one event per booking once the current transaction commits.
+    Payloads are the flat rows of the changes feed ({"id": ...} for deletes).
+    """
+    booking_ids = list(booking_ids)
+    if not booking_ids:
+        return
+
+    def send():
+        broker = get_broker()
+        if event_type == 'deleted':
+            rows = [{'id': pk} for pk in booking_ids]
+        else:
+            rows = Booking.objects.filter(pk__in=booking_ids).order_by('id').values(*FEED_FIELDS, **FEED_ANNOTATIONS)
+        for row in rows:
+            broker.publish({'type': event_type, 'booking': row})
+
+    transaction.on_commit(send)
+
+
+def format_event(event):
+    """One SSE message"""
+    data = json.dumps(event['booking'], cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f'event: {event["type"]}\ndata: {data}\n\n'
+
+
+# ==================== SSE STREAM ====================
+def issue_stream_ticket(user):
+    """
+    Short-lived ticket that opens the events stream for `user`. EventSource
+    can't send headers, so this goes in the URL instead of the access token:
+    it only works for this stream and expires after
+    BOOKING_EVENTS_TICKET_SECONDS.
+    """
+    return signing.dumps({'user': user.pk}, salt=STREAM_TICKET_SALT)
+
+
+def authenticate_stream(request):
+    """
+    User from a JWT access token in the Authorization header or, since
+    EventSource can't send headers, a stream ticket in ?ticket=.
+    """
+    from django.contrib.auth import get_user_model
+    from rest_framework.exceptions import AuthenticationFailed
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+    if request.headers.get('Authorization'):
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except (AuthenticationFailed, InvalidToken, TokenError):
+            return None
+        return result[0] if result else None
+
+    ticket = request.GET.get('ticket')
+    if not ticket:
+        return None
+    max_age = getattr(settings, 'BOOKING_EVENTS_TICKET_SECONDS', 60)
+    try:
+        payload = signing.loads(ticket, salt=STREAM_TICKET_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
+    return get_user_model().objects.filter(pk=payload.get('user'), is_active=True).first()
+
+
+async def event_stream(heartbeat=None, max_seconds=None):
+    """
+    SSE messages for booking events until max_seconds, with a comment line
+    every `heartbeat` seconds so proxies keep idle connections open. After
+    events were dropped (slow client) a single "resync" event tells the
+    client to catch up from /api/bookings/changes/.
+    """
+    heartbeat = heartbeat or getattr(settings, 'BOOKING_EVENTS_HEARTBEAT_SECONDS', 15)
+    max_seconds = max_seconds or getattr(settings, 'BOOKING_EVENTS_MAX_SECONDS', 600)
+    broker = get_broker()
+    subscription = broker.subscribe()
+    deadline = time.monotonic() + max_seconds
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # EventSource reconnects (and re-authenticates) on its own
+                return
+            try:
+                event = await subscription.get(min(heartbeat, remaining))
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            if subscription.overflowed:
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.overflowed = False
+                yield 'event: resync\ndata: {}\n\n'
+                continue
+            yield format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,103 @@
+import csv
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.utils import timezone
+
+from .models import Booking
+
+
+# Column name -> Booking lookup, in export order
+BOOKING_EXPORT_COLUMNS = {
+    'id': 'id',
+    'fullname': 'fullname',
+    'phone': 'phone',
+    'email': 'email',
+    'service': 'service__name',
+    'category': 'service__category',
+    'stylist': 'stylist__name',
+    'price': 'service__price',
+    'duration_minutes': 'service__duration_minutes',
+    'date': 'date',
+    'time': 'time',
+    'status': 'status',
+    'notes': 'notes',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    'confirmed_at': 'confirmed_at',
+    'completed_at': 'completed_at',
+}
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+# ==================== BOOKING EXPORT ====================
+def booking_export_rows(date_from=None, date_to=None, statuses=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Tuples in BOOKING_EXPORT_COLUMNS order, read with a chunked iterator (a
+    server-side cursor on PostgreSQL) so memory stays flat for any row count.
+    """
+    queryset = Booking.objects.all()
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+    return (
+        queryset.order_by('date', 'time', 'id')
+        .values_list(*BOOKING_EXPORT_COLUMNS.values())
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class Echo:
+    """File-like object whose write() returns the line, for csv.writer in a generator"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, lines_per_chunk=500):
+    """Yield the CSV header and rows, a few hundred lines per chunk"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(list(BOOKING_EXPORT_COLUMNS))
+    buffer = []
+    for row in rows:
+        buffer.append(writer.writerow([export_value(value) for value in row]))
+        if len(buffer) >= lines_per_chunk:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def iter_ndjson(rows, lines_per_chunk=500):
+    """Yield one JSON object per line"""
+    columns = list(BOOKING_EXPORT_COLUMNS)
+    buffer = []
+    for row in rows:
+        record = {column: export_value(value) for column, value in zip(columns, row)}
+        buffer.append(json.dumps(record, ensure_ascii=False) + '\n')
+        if len(buffer) >= lines_per_chunk:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+EXPORT_FORMATS = {
+    'csv': (iter_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (iter_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
@@ -0,0 +1,171 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Booking, BookingTombstone, booking_start
+
+
+# Flat row fields sent for bookings in the upcoming set (same shape as ?compact=true)
+FEED_FIELDS = ('id', 'fullname', 'phone', 'service_id', 'stylist_id', 'date', 'time', 'status', 'updated_at')
+FEED_ANNOTATIONS = {
+    'service_name': F('service__name'),
+    'stylist_name': F('stylist__name'),
+    'price': F('service__price'),
+}
+
+
+class InvalidToken(ValueError):
+    """The since token can't be decoded"""
+
+
+class TokenExpired(Exception):
+    """The since token is older than the tombstone retention; the client must resync"""
+
+
+# ==================== TOKENS ====================
+def encode_token(state):
+    data = json.dumps(state, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_token(encoded):
+    """
+    Token state: booking and tombstone positions as [timestamp, id], plus the
+    snapshot watermark while the initial snapshot is being paged.
+    """
+    try:
+        state = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+        positions = {
+            key: (datetime.fromisoformat(state[key][0]), int(state[key][1]))
+            for key in ('b', 't')
+        }
+        watermark = datetime.fromisoformat(state['s']) if state.get('s') else None
+    except (TypeError, ValueError, KeyError, IndexError):
+        raise InvalidToken('Invalid since token')
+    if any(timezone.is_naive(value) for value, pk in positions.values()):
+        raise InvalidToken('Invalid since token')
+    return positions['b'], positions['t'], watermark
+
+
+def dump_position(position):
+    value, pk = position
+    return [value.isoformat(), pk]
+
+
+def after(field, position):
+    """Rows strictly after (field, id) = position"""
+    value, pk = position
+    return Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': pk})
+
+
+# ==================== QUERIES ====================
+def is_upcoming(row, now):
+    """Pending/confirmed and not started yet"""
+    return row['status'] in Booking.ACTIVE_STATUSES and booking_start(row['date'], row['time']) > now
+
+
+def changes_queryset(position, watermark, upcoming_only=False, now=None):
+    """Bookings written after position and settled by watermark, in (updated_at, id) order"""
+    queryset = Booking.objects.filter(updated_at__lte=watermark)
+    if position is not None:
+        queryset = queryset.filter(after('updated_at', position))
+    if upcoming_only:
+        queryset = queryset.filter(starts_at__gt=now or timezone.now(), status__in=Booking.ACTIVE_STATUSES)
+    return queryset.order_by('updated_at', 'id').values(*FEED_FIELDS, **FEED_ANNOTATIONS)
+
+
+def tombstones_queryset(position, watermark):
+    return (
+        BookingTombstone.objects.filter(after('deleted_at', position), deleted_at__lte=watermark)
+        .order_by('deleted_at', 'id').values_list('id', 'booking_id', 'deleted_at')
+    )
+
+
+def advance(position, last, has_more, watermark):
+    """
+    Next position of a stream: the last row delivered, or the watermark once
+    the stream is drained so idle clients keep a fresh token. Never moves back.
+    """
+    if has_more:
+        return last
+    return max(last or position, (watermark, 0))
+
+
+# ==================== FEED ====================
+def booking_changes(since=None, limit=200):
+    """
+    Incremental feed of upcoming (pending/confirmed, not started yet) bookings.
+
+    Without `since` the upcoming set is returned as a snapshot, paged by
+    (updated_at, id). With a token only bookings written since then are
+    returned: rows still upcoming under "changes", and the ids of rows that
+    left the upcoming set (cancelled, completed, moved to the past by an
+    edit) or were deleted under "removed". Bookings that simply age into the
+    past are not reported; clients drop them by start time.
+
+    Only rows older than BOOKING_FEED_SETTLE_SECONDS are delivered, so a
+    write committed slightly after a later-stamped one is not skipped.
+    Raises InvalidToken or TokenExpired.
+    """
+    now = timezone.now()
+    watermark = now - timedelta(seconds=getattr(settings, 'BOOKING_FEED_SETTLE_SECONDS', 1))
+    retention = timedelta(days=getattr(settings, 'BOOKING_FEED_RETENTION_DAYS', 30))
+
+    if since:
+        booking_position, tombstone_position, snapshot = decode_token(since)
+        if min(tombstone_position[0], snapshot or now) < now - retention:
+            raise TokenExpired('since token expired, resync without since')
+    else:
+        booking_position, snapshot = None, watermark
+        tombstone_position = (watermark, 0)
+
+    changes, removed = [], []
+    if snapshot:
+        # Initial snapshot: upcoming bookings as of the snapshot watermark
+        rows = list(changes_queryset(booking_position, snapshot, upcoming_only=True, now=now)[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        changes = rows
+        last = (rows[-1]['updated_at'], rows[-1]['id']) if rows else booking_position
+        if has_more:
+            state = {'b': dump_position(last), 't': dump_position(tombstone_position), 's': snapshot.isoformat()}
+        else:
+            # Done: continue incrementally from the watermark
+            state = {'b': dump_position((snapshot, 0)), 't': dump_position(tombstone_position)}
+        return {'changes': changes, 'removed': removed, 'next': encode_token(state), 'has_more': has_more}
+
+    rows = list(changes_queryset(booking_position, watermark)[:limit + 1])
+    bookings_more = len(rows) > limit
+    rows = rows[:limit]
+    for row in rows:
+        if is_upcoming(row, now):
+            changes.append(row)
+        else:
+            removed.append(row['id'])
+    last = (rows[-1]['updated_at'], rows[-1]['id']) if rows else None
+    booking_position = advance(booking_position, last, bookings_more, watermark)
+
+    tombstones = list(tombstones_queryset(tombstone_position, watermark)[:limit + 1])
+    tombstones_more = len(tombstones) > limit
+    tombstones = tombstones[:limit]
+    removed.extend(booking_id for pk, booking_id, deleted_at in tombstones)
+    last = (tombstones[-1][2], tombstones[-1][0]) if tombstones else None
+    tombstone_position = advance(tombstone_position, last, tombstones_more, watermark)
+
+    state = {'b': dump_position(booking_position), 't': dump_position(tombstone_position)}
+    return {
+        'changes': changes,
+        'removed': removed,
+        'next': encode_token(state),
+        'has_more': bookings_more or tombstones_more,
+    }
+
+
+def prune_tombstones():
+    """Drop tombstones past the retention window (tokens that old are rejected anyway)"""
+    retention = timedelta(days=getattr(settings, 'BOOKING_FEED_RETENTION_DAYS', 30))
+    return BookingTombstone.objects.filter(deleted_at__lt=timezone.now() - retention).delete()[0]
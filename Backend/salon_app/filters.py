@@ -0,0 +1,116 @@
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from rest_framework.exceptions import ParseError
+from rest_framework.filters import BaseFilterBackend
+
+
+LOOKUPS = {'exact', 'gt', 'gte', 'lt', 'lte'}
+LIST_SEPARATOR = ','
+
+
+# ==================== FIELD RESOLUTION ====================
+def resolve_lookup(model, lookup):
+    """
+    Walk a lookup such as 'service__category' or 'date__gte'.
+    Returns ([(model, field), ...] for each hop, lookup type).
+    """
+    parts = lookup.split('__')
+    lookup_type = 'exact'
+    if len(parts) > 1 and parts[-1] in LOOKUPS:
+        lookup_type = parts.pop()
+    path = []
+    for name in parts:
+        if path:
+            model = path[-1][1].related_model
+        path.append((model, model._meta.get_field(name)))
+    return path, lookup_type
+
+
+def is_indexed(model, field):
+    """Is the field the leading column of a (non-partial) index of its table?"""
+    if field.primary_key or field.unique or getattr(field, 'db_index', False):
+        return True
+    for index in model._meta.indexes:
+        if index.fields and index.fields[0].lstrip('-') == field.name and index.condition is None:
+            return True
+    for fields in model._meta.unique_together:
+        if fields[0] == field.name:
+            return True
+    return False
+
+
+# ==================== FILTER BACKEND ====================
+class IndexedFilterBackend(BaseFilterBackend):
+    """
+    Filters declared on the view as `filter_fields = {query param: lookup}`.
+    Values are converted with the model field, so a malformed date or id is
+    a 400 instead of a server error or an unfiltered list; comma-separated
+    values on exact lookups become an IN (...) filter. Undeclared parameters
+    are ignored. Every lookup should hit an index (see check_filter_indexes).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filter_fields = getattr(view, 'filter_fields', None) or {}
+        for param, lookup in filter_fields.items():
+            raw = request.query_params.get(param)
+            if raw is None or raw == '':
+                continue
+            path, lookup_type = resolve_lookup(queryset.model, lookup)
+            model, field = path[-1]
+            if lookup_type == 'exact':
+                values = [self.clean(param, field, value) for value in raw.split(LIST_SEPARATOR) if value]
+                if len(values) == 1:
+                    queryset = queryset.filter(**{lookup: values[0]})
+                else:
+                    queryset = queryset.filter(**{f'{lookup.removesuffix("__exact")}__in': values})
+            else:
+                queryset = queryset.filter(**{lookup: self.clean(param, field, raw)})
+        return queryset
+
+    def clean(self, param, field, value):
+        try:
+            return field.to_python(value.strip())
+        except ValidationError:
+            raise ParseError({'error': f'Invalid value for {param}: "{value}"'})
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': param, 'required': False, 'in': 'query', 'schema': {'type': 'string'}}
+            for param in (getattr(view, 'filter_fields', None) or {})
+        ]
+
+
+# ==================== CHECKS ====================
+@checks.register()
+def check_filter_indexes(app_configs=None, **kwargs):
+    """Warn about API filters and keyset orderings that can't use an index"""
+    from .urls import router
+
+    messages = []
+    for prefix, viewset, basename in router.registry:
+        model = getattr(getattr(viewset, 'queryset', None), 'model', None)
+        if model is None:
+            continue
+        lookups = {f'?{param}': lookup for param, lookup in (getattr(viewset, 'filter_fields', None) or {}).items()}
+        pagination = getattr(viewset, 'pagination_class', None)
+        for name, ordering in (getattr(pagination, 'orderings', None) or {}).items():
+            lookups[f'?ordering={name}'] = ordering[0].lstrip('-')
+
+        for label, lookup in lookups.items():
+            try:
+                path, lookup_type = resolve_lookup(model, lookup)
+            except FieldDoesNotExist as e:
+                messages.append(checks.Error(
+                    f'{viewset.__name__} {label}: {e}', obj=viewset, id='salon_app.E001'
+                ))
+                continue
+            for hop_model, field in path:
+                if not is_indexed(hop_model, field):
+                    messages.append(checks.Warning(
+                        f'{viewset.__name__} {label} filters on {hop_model.__name__}.{field.name}, '
+                        f'which is not the leading column of an index',
+                        hint='Add an index or drop the filter; unindexed filters scan the whole table.',
+                        obj=viewset,
+                        id='salon_app.W001',
+                    ))
+    return messages
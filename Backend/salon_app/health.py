@@ -0,0 +1,167 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+
+# Probes run here so a hung dependency can't block the request thread past its timeout
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='health')
+_lock = threading.Lock()
+_results = {}
+_inflight = {}
+
+STARTED_AT = time.time()
+
+
+# ==================== DEPENDENCY CHECKS ====================
+def _close_thread_connections():
+    for connection in connections.all():
+        connection.close()
+
+
+def check_database():
+    """Open a connection and run SELECT 1"""
+    try:
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        return {'vendor': connections[DEFAULT_DB_ALIAS].vendor}
+    finally:
+        _close_thread_connections()
+
+
+def check_migrations():
+    """Fail while migrations are still unapplied"""
+    try:
+        connection = connections[DEFAULT_DB_ALIAS]
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if plan:
+            raise RuntimeError(f'{len(plan)} unapplied migration(s)')
+        return {'pending': 0}
+    finally:
+        _close_thread_connections()
+
+
+def check_cache():
+    """Write and read back a short-lived key"""
+    key = f'salon:health:{uuid.uuid4().hex}'
+    value = uuid.uuid4().hex
+    cache.set(key, value, 10)
+    try:
+        if cache.get(key) != value:
+            raise RuntimeError('cache read did not return the written value')
+    finally:
+        cache.delete(key)
+    return {'backend': settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1]}
+
+
+def check_email():
+    """Open (and close) a connection to the email backend"""
+    connection = get_connection(fail_silently=False, timeout=get_timeout())
+    connection.open()
+    connection.close()
+    return {'backend': settings.EMAIL_BACKEND.rsplit('.', 1)[-1]}
+
+
+def check_constraints():
+    """PostgreSQL: booking_no_active_overlap exists (migration 0009 skips it when rows overlap)"""
+    try:
+        connection = connections[DEFAULT_DB_ALIAS]
+        if connection.vendor != 'postgresql':
+            return {'skipped': connection.vendor}
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_constraint WHERE conname = 'booking_no_active_overlap'")
+            if cursor.fetchone() is None:
+                raise RuntimeError('booking_no_active_overlap is missing')
+        return {'booking_no_active_overlap': True}
+    finally:
+        _close_thread_connections()
+
+
+# name -> (check, required for readiness, seconds to reuse the result)
+CHECKS = {
+    'database': (check_database, True, None),
+    'migrations': (check_migrations, True, 'HEALTH_MIGRATIONS_CACHE_SECONDS'),
+    'cache': (check_cache, True, None),
+    # Email is delivered through the outbox and retried, so an unreachable
+    # SMTP server degrades the instance without taking it out of rotation
+    'email': (check_email, False, None),
+    # Bookings are still checked under the stylist lock without the constraint
+    'constraints': (check_constraints, False, 'HEALTH_MIGRATIONS_CACHE_SECONDS'),
+}
+
+
+# ==================== PROBE RUNNER ====================
+def get_timeout():
+    return getattr(settings, 'HEALTH_CHECK_TIMEOUT', 2)
+
+
+def _get_ttl(ttl_setting):
+    default = getattr(settings, 'HEALTH_CHECK_CACHE_SECONDS', 5)
+    return getattr(settings, ttl_setting, default) if ttl_setting else default
+
+
+def _timed(check):
+    start = time.perf_counter()
+    try:
+        details = check()
+        result = {'status': 'ok', **(details or {})}
+    except Exception as exc:
+        result = {'status': 'error', 'error': f'{exc.__class__.__name__}: {exc}'}
+    result['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def readiness():
+    """
+    Run every dependency check in parallel, each bounded by HEALTH_CHECK_TIMEOUT.
+    Results are reused for HEALTH_CHECK_CACHE_SECONDS so probe storms don't hit
+    the DB, and a check that is still hanging is never started twice.
+    Returns (ready, checks).
+    """
+    now = time.monotonic()
+    checks, pending = {}, {}
+    with _lock:
+        for name, (check, required, ttl_setting) in CHECKS.items():
+            cached = _results.get(name)
+            if cached and cached[0] > now:
+                checks[name] = {**cached[1], 'cached': True}
+                continue
+            future = _inflight.get(name)
+            if future is None or future.done():
+                future = _inflight[name] = _executor.submit(_timed, check)
+            pending[name] = future
+
+    deadline = now + get_timeout()
+    for name, future in pending.items():
+        check, required, ttl_setting = CHECKS[name]
+        try:
+            result = future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeout:
+            result = {'status': 'error', 'error': f'timed out after {get_timeout()}s'}
+        with _lock:
+            _results[name] = (time.monotonic() + _get_ttl(ttl_setting), result)
+        checks[name] = result
+
+    ready = all(
+        checks[name]['status'] == 'ok'
+        for name, (check, required, ttl_setting) in CHECKS.items() if required
+    )
+    return ready, {name: checks[name] for name in CHECKS}
+
+
+def liveness():
+    """The process is up and serving requests (no dependency checks)"""
+    return {'uptime_seconds': round(time.time() - STARTED_AT, 1)}
+
+
+def reset():
+    with _lock:
+        _results.clear()
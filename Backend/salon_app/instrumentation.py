@@ -0,0 +1,213 @@
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+
+_current = ContextVar('salon_request_metrics', default=None)
+
+
+# ==================== PER-REQUEST METRICS ====================
+class RequestMetrics:
+    """Timings collected while a single request is handled"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.phases = {}
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_time += time.perf_counter() - start
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to the current request's metrics"""
+    metrics = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.add(phase, time.perf_counter() - start)
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """ListSerializer that reports serialization time (use as Meta.list_serializer_class)"""
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer that reports rendering time"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+# ==================== DB CONNECTIONS ====================
+# Connection wrappers seen by request threads in this worker
+_connections = weakref.WeakSet()
+
+
+def track_connection(connection):
+    _connections.add(connection)
+
+
+def connection_stats():
+    """Open and total DB connection wrappers per alias in this worker"""
+    stats = {}
+    for connection in list(_connections):
+        entry = stats.setdefault(connection.alias, {
+            'vendor': connection.vendor,
+            'open': 0,
+            'total': 0,
+            'max_age': connection.settings_dict.get('CONN_MAX_AGE', 0),
+        })
+        entry['total'] += 1
+        if connection.connection is not None:
+            entry['open'] += 1
+    return stats
+
+
+# ==================== ROUTE AGGREGATES ====================
+# Histogram bucket upper bounds (seconds) for the Prometheus exposition
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class RouteStats:
+    """Rolling window of recent requests for one route, plus cumulative counters"""
+
+    def __init__(self, window):
+        self.count = 0
+        self.errors = 0
+        self.durations = deque(maxlen=window)
+        self.db_queries = deque(maxlen=window)
+        self.db_times = deque(maxlen=window)
+        self.sizes = deque(maxlen=window)
+        # Cumulative since process start
+        self.responses = {}
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.duration_sum = 0.0
+        self.db_queries_total = 0
+        self.db_seconds_total = 0.0
+
+    def summary(self):
+        durations = sorted(self.durations)
+        db_times = sorted(self.db_times)
+        window = len(durations) or 1
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'window': len(durations),
+            'p50_ms': _ms(percentile(durations, 0.50)),
+            'p95_ms': _ms(percentile(durations, 0.95)),
+            'p99_ms': _ms(percentile(durations, 0.99)),
+            'max_ms': _ms(durations[-1] if durations else None),
+            'db_p95_ms': _ms(percentile(db_times, 0.95)),
+            'avg_queries': round(sum(self.db_queries) / window, 2),
+            'max_queries': max(self.db_queries, default=0),
+            'avg_bytes': round(sum(self.sizes) / window),
+        }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+class RouteRegistry:
+    """In-memory, per-process aggregates keyed by route"""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self.routes = {}
+        self.lock = threading.Lock()
+
+    def record(self, route, status_code, duration, db_queries, db_time, size, method='GET'):
+        with self.lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = RouteStats(self.window)
+            stats.count += 1
+            if status_code >= 500:
+                stats.errors += 1
+            stats.durations.append(duration)
+            stats.db_queries.append(db_queries)
+            stats.db_times.append(db_time)
+            stats.sizes.append(size or 0)
+
+            key = (method, status_code)
+            stats.responses[key] = stats.responses.get(key, 0) + 1
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    stats.buckets[index] += 1
+            stats.duration_sum += duration
+            stats.db_queries_total += db_queries
+            stats.db_seconds_total += db_time
+
+    def counters(self):
+        """Cumulative counters per route, for the metrics exposition"""
+        with self.lock:
+            return {
+                route: {
+                    'count': stats.count,
+                    'responses': dict(stats.responses),
+                    'buckets': list(stats.buckets),
+                    'duration_sum': stats.duration_sum,
+                    'db_queries_total': stats.db_queries_total,
+                    'db_seconds_total': stats.db_seconds_total,
+                }
+                for route, stats in sorted(self.routes.items())
+            }
+
+    def snapshot(self):
+        with self.lock:
+            return {route: stats.summary() for route, stats in sorted(self.routes.items())}
+
+    def reset(self):
+        """Clear the rolling windows (cumulative counters keep counting)"""
+        with self.lock:
+            for stats in self.routes.values():
+                for window in (stats.durations, stats.db_queries, stats.db_times, stats.sizes):
+                    window.clear()
+
+
+route_registry = RouteRegistry()
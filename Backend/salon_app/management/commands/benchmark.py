@@ -0,0 +1,323 @@
+import itertools
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from salon_app.instrumentation import percentile
+from salon_app.models import Booking, Service, Stylist
+from salon_app.seeding import Seeder
+
+
+SCENARIOS = [
+    'services_list', 'bookings_list', 'bookings_list_compact',
+    'bookings_create', 'available_slots', 'login',
+]
+BENCH_USERNAME = 'benchmark'
+
+
+# ==================== DRIVERS ====================
+class InProcessDriver:
+    """Requests through Django's test client (one client per thread)"""
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def request(self, method, path, data=None):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = Client(raise_request_exception=False)
+        if method == 'POST':
+            response = client.post(path, data=json.dumps(data), content_type='application/json')
+        else:
+            response = client.get(path)
+        return response.status_code
+
+
+class HttpDriver:
+    """Requests against a running server (e.g. gunicorn) over HTTP"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, data=None):
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(
+            self.base_url + path, data=body, method=method,
+            headers={'Content-Type': 'application/json'}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except (urllib.error.URLError, OSError):
+            return 0
+
+
+# ==================== COMMAND ====================
+class Command(BaseCommand):
+    """
+    Seed a dataset and measure latency percentiles and throughput of the main
+    API endpoints. Results are written as JSON (tagged with the git commit) so
+    runs can be compared across commits with --compare.
+
+    Usage:
+        python manage.py benchmark                      # in-process, throwaway test database
+        python manage.py benchmark --concurrency 8 --url http://127.0.0.1:8000 --seed \\
+            --password secret                           # against a running gunicorn
+        python manage.py benchmark --compare benchmarks/previous.json
+    """
+    help = 'Benchmark the booking API and write the results as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running server (default: in-process test client)')
+        parser.add_argument('--seed', action='store_true',
+                            help='With --url: seed the configured database before running')
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                            help=f'Comma-separated subset of: {", ".join(SCENARIOS)}')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=1, help='Client threads')
+        parser.add_argument('--services', type=int, default=30)
+        parser.add_argument('--stylists', type=int, default=20)
+        parser.add_argument('--bookings', type=int, default=5000)
+        parser.add_argument('--random-seed', type=int, default=42)
+        parser.add_argument('--password', default='benchmark-password',
+                            help=f'Password of the "{BENCH_USERNAME}" user used by the login scenario')
+        parser.add_argument('--output', help='JSON file (default: benchmarks/<timestamp>-<commit>.json)')
+        parser.add_argument('--compare', help='Previous results JSON to compare against')
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Unknown scenario(s): {", ".join(sorted(unknown))}')
+
+        # One JSON log line per request would swamp the output
+        logging.getLogger('salon_app.requests').setLevel(logging.WARNING)
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+
+        if options['url']:
+            if options['seed']:
+                self.seed(options)
+            results = self.run(HttpDriver(options['url']), scenarios, options)
+        else:
+            results = self.run_in_process(scenarios, options)
+
+        self.report(results, options)
+
+    def run_in_process(self, scenarios, options):
+        """Run against a throwaway test database so real data is never touched"""
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        test_dir = None
+        if connection.vendor == 'sqlite' and options['concurrency'] > 1:
+            # The shared in-memory test database locks whole tables between threads
+            test_dir = tempfile.mkdtemp(prefix='salon-benchmark-')
+            connection.settings_dict['TEST']['NAME'] = os.path.join(test_dir, 'benchmark.sqlite3')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.seed(options)
+            return self.run(InProcessDriver(), scenarios, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            if test_dir:
+                shutil.rmtree(test_dir, ignore_errors=True)
+
+    def seed(self, options):
+        start = time.perf_counter()
+        seeder = Seeder(seed=options['random_seed'])
+        services = seeder.create_services(options['services'])
+        stylists = seeder.create_stylists(options['stylists'], services)
+        seeder.create_bookings(options['bookings'], stylists)
+
+        user, created = User.objects.get_or_create(username=BENCH_USERNAME)
+        user.set_password(options['password'])
+        user.save()
+        self.stdout.write(f'Seeded {len(services)} services, {len(stylists)} stylists, '
+                          f'{options["bookings"]} bookings in {time.perf_counter() - start:.1f}s')
+
+    # ---------- scenarios ----------
+    def build_scenarios(self, options):
+        """name -> callable(i) returning (method, path, payload)"""
+        stylists = list(
+            Stylist.objects.filter(is_active=True, available_services__isnull=False)
+            .distinct().order_by('id').values_list('id', flat=True)
+        )
+        offered = {}
+        links = Stylist.available_services.through.objects.filter(stylist_id__in=stylists)
+        for stylist_id, service_id in links.order_by('stylist_id', 'service_id').values_list('stylist_id', 'service_id'):
+            offered.setdefault(stylist_id, []).append(service_id)
+        if not stylists or not Service.objects.exists():
+            raise CommandError('No stylists offering services; seed the database first')
+
+        today = timezone.localdate()
+        # New bookings start after the latest existing one so every create gets a free slot
+        latest = Booking.objects.aggregate(latest=Max('date'))['latest']
+        first_free_day = max(latest or today, today) + timedelta(days=1)
+        # Space the start times by the longest service so bookings never overlap
+        longest = Service.objects.aggregate(longest=Max('duration_minutes'))['longest'] or 60
+        hours = list(range(9, 20, -(-longest // 60)))
+        slots = itertools.count()
+        slots_lock = threading.Lock()
+
+        def create(i):
+            with slots_lock:
+                n = next(slots)
+            stylist_id = stylists[n % len(stylists)]
+            day = first_free_day + timedelta(days=n // (len(stylists) * len(hours)))
+            hour = hours[(n // len(stylists)) % len(hours)]
+            return 'POST', '/api/bookings/', {
+                'fullname': 'Benchmark Client',
+                'phone': '+254700000000',
+                'service': offered[stylist_id][0],
+                'stylist': stylist_id,
+                'date': str(day),
+                'time': f'{hour:02d}:00',
+                'send_email': False,
+            }
+
+        def available_slots(i):
+            stylist_id = stylists[i % len(stylists)]
+            day = today + timedelta(days=1 + i % 14)
+            return 'GET', f'/api/stylists/{stylist_id}/available_slots/?date={day}&service={offered[stylist_id][0]}', None
+
+        return {
+            'services_list': lambda i: ('GET', '/api/services/', None),
+            'bookings_list': lambda i: ('GET', '/api/bookings/', None),
+            'bookings_list_compact': lambda i: ('GET', '/api/bookings/?compact=true', None),
+            'bookings_create': create,
+            'available_slots': available_slots,
+            'login': lambda i: ('POST', '/api/auth/login/', {
+                'username': BENCH_USERNAME, 'password': options['password'],
+            }),
+        }
+
+    def run(self, driver, scenarios, options):
+        builders = self.build_scenarios(options)
+        results = {}
+        for name in scenarios:
+            build = builders[name]
+
+            def call(i):
+                method, path, payload = build(i)
+                start = time.perf_counter()
+                code = driver.request(method, path, payload)
+                return code, time.perf_counter() - start
+
+            for i in range(options['warmup']):
+                call(i)
+
+            wall_start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                samples = list(executor.map(call, range(options['warmup'], options['warmup'] + options['requests'])))
+            wall = time.perf_counter() - wall_start
+
+            results[name] = self.summarize(samples, wall, options['concurrency'])
+            self.stdout.write(
+                f'  {name:<24} p50 {results[name]["p50_ms"]:>8.2f}ms  p95 {results[name]["p95_ms"]:>8.2f}ms  '
+                f'p99 {results[name]["p99_ms"]:>8.2f}ms  {results[name]["throughput_rps"]:>8.1f} req/s  '
+                f'errors {results[name]["errors"]}'
+            )
+        return results
+
+    def summarize(self, samples, wall, concurrency):
+        durations = sorted(duration for code, duration in samples)
+        codes = {}
+        for code, duration in samples:
+            codes[str(code)] = codes.get(str(code), 0) + 1
+        return {
+            'requests': len(samples),
+            'concurrency': concurrency,
+            'errors': sum(1 for code, duration in samples if not 200 <= code < 300),
+            'status_codes': codes,
+            'throughput_rps': round(len(samples) / wall, 2) if wall else None,
+            'mean_ms': round(sum(durations) / len(durations) * 1000, 2),
+            'p50_ms': round(percentile(durations, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(durations, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(durations, 0.99) * 1000, 2),
+            'max_ms': round(durations[-1] * 1000, 2),
+        }
+
+    # ---------- output ----------
+    def git_commit(self):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+            dirty = bool(subprocess.run(
+                ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True
+            ).stdout.strip())
+        except (OSError, subprocess.CalledProcessError):
+            return None, None
+        return commit, dirty
+
+    def report(self, results, options):
+        commit, dirty = self.git_commit()
+        document = {
+            'commit': commit,
+            'dirty': dirty,
+            'timestamp': timezone.now().isoformat(),
+            'mode': 'http' if options['url'] else 'in-process',
+            'url': options['url'],
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'dataset': {
+                'services': options['services'],
+                'stylists': options['stylists'],
+                'bookings': options['bookings'],
+                'random_seed': options['random_seed'],
+            },
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'scenarios': results,
+        }
+
+        output = Path(options['output'] or (
+            Path(settings.BASE_DIR) / 'benchmarks' /
+            f'{timezone.now():%Y%m%d-%H%M%S}-{(commit or "nogit")[:8]}.json'
+        ))
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(document, indent=2))
+        self.stdout.write(self.style.SUCCESS(f'Results written to {output}'))
+
+        if options['compare']:
+            self.compare(document, json.loads(Path(options['compare']).read_text()))
+
+    def compare(self, current, previous):
+        self.stdout.write(f'\nCompared with {(previous.get("commit") or "?")[:8]} ({previous.get("timestamp")}):')
+        for name, result in current['scenarios'].items():
+            before = previous.get('scenarios', {}).get(name)
+            if not before:
+                continue
+            changes = []
+            for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps'):
+                if before.get(key):
+                    changes.append(f'{key} {(result[key] - before[key]) / before[key] * 100:+.1f}%')
+            self.stdout.write(f'  {name:<24} ' + '  '.join(changes))
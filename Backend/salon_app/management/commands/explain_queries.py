@@ -0,0 +1,141 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from salon_app.availability import occupancy_queryset
+from salon_app.feeds import changes_queryset
+from salon_app.models import Booking, Customer, Review, Service, Stylist
+
+
+# Tables expected to grow without bound; a full scan of these is flagged
+LARGE_TABLES = {
+    Booking._meta.db_table,
+    Review._meta.db_table,
+    Customer._meta.db_table,
+}
+
+SQLITE_SCAN = re.compile(r'\bSCAN (?:TABLE )?(\w+)\b( USING (?:COVERING )?INDEX)?')
+POSTGRES_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+
+def find_scans(vendor, plan):
+    """
+    Tables read in full: (table scans, full index walks). SQLite reports
+    "SCAN t" for a table scan and "SCAN t USING INDEX i" for an ordered walk
+    of a whole index (cheap under a LIMIT); "SEARCH" lines use an index.
+    """
+    if vendor == 'sqlite':
+        full, walks = set(), set()
+        for table, using_index in SQLITE_SCAN.findall(plan):
+            (walks if using_index else full).add(table)
+        return full, walks
+    return set(POSTGRES_SEQ_SCAN.findall(plan)), set()
+
+
+def canonical_queries():
+    """(name, queryset) for the hot queries the API runs"""
+    today = timezone.localdate()
+    now = timezone.now()
+    stylist_id = Stylist.objects.values_list('id', flat=True).first() or 1
+    phone_key = Booking.objects.values_list('phone_key', flat=True).first() or '+254700000000'
+
+    return [
+        ('availability: stylist occupancy for a week',
+         occupancy_queryset([stylist_id], today, today + timedelta(days=7))),
+        ('double-booking check: one stylist, one slot',
+         Booking.objects.overlapping(stylist_id, now + timedelta(days=1), now + timedelta(days=1, hours=1))),
+        ('bookings/upcoming',
+         Booking.objects.with_related().upcoming()),
+        ('bookings/changes: incremental page',
+         changes_queryset((now - timedelta(hours=1), 0), now)[:200]),
+        ('bookings list: first keyset page',
+         Booking.objects.with_related().order_by('-date', '-time', '-id')[:50]),
+        ('bookings list: customer lookup by phone',
+         Booking.objects.filter(phone_key=phone_key).order_by('-date', '-time', '-id')[:50]),
+        ('customers/{phone}/bookings: history page',
+         Booking.objects.filter(phone_key=phone_key).order_by('-starts_at', '-id')
+         .values('id', 'starts_at', 'status', 'service_id', 'stylist_id', 'service__name', 'stylist__name')[:50]),
+        ('bookings list: status filter',
+         Booking.objects.filter(status='pending').order_by('-date', '-time', '-id')[:50]),
+        ('bookings list: category filter',
+         Booking.objects.filter(service__category='hair').order_by('-date', '-time', '-id')[:50]),
+        ('bookings list: newest first',
+         Booking.objects.order_by('-created_at', '-id')[:50]),
+        ('booking stats: counts per service this month',
+         Booking.objects.filter(date__gte=today.replace(day=1)).order_by()
+         .values('service_id').annotate(count=Count('id'))),
+        ('export: one year of completed bookings',
+         Booking.objects.filter(date__range=(today - timedelta(days=365), today), status__in=['completed'])
+         .order_by('date', 'time', 'id')),
+        ('customers: top spenders',
+         Customer.objects.order_by('-total_spent', '-id')[:50]),
+        ('customers: refresh one customer',
+         Booking.objects.filter(phone_key=phone_key).order_by().values('phone_key').annotate(count=Count('id'))),
+        ('services list',
+         Service.objects.filter(is_active=True).order_by('category', 'name')),
+        ('approved reviews: first page',
+         Review.objects.filter(is_approved=True).order_by('-created_at', '-id')[:50]),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Run EXPLAIN on the app's hot queries and flag full scans of large tables.
+    Works on SQLite and PostgreSQL; plans depend on table statistics, so run
+    it on realistic data (see seed_salon) or with --force-index on PostgreSQL
+    to check an index is usable at all.
+
+    Usage:
+        python manage.py explain_queries
+        python manage.py explain_queries --analyze --verbose
+        python manage.py explain_queries --strict      # exit non-zero on flagged scans (CI)
+    """
+    help = 'EXPLAIN the hot booking queries and flag sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action='store_true', help='Refresh planner statistics (ANALYZE) first')
+        parser.add_argument('--force-index', action='store_true',
+                            help='PostgreSQL: disable seq scans so tiny tables still show the usable index')
+        parser.add_argument('--verbose', action='store_true', help='Print the full plans')
+        parser.add_argument('--strict', action='store_true', help='Fail when a large table is fully scanned')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'Unsupported database vendor: {vendor}')
+
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        flagged = 0
+        with transaction.atomic():
+            if options['force_index'] and vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for name, queryset in canonical_queries():
+                plan = queryset.explain()
+                full, walks = find_scans(vendor, plan)
+                large = sorted(full & LARGE_TABLES)
+                if large:
+                    flagged += 1
+                    self.stdout.write(self.style.ERROR(f'✗ {name}: full scan of {", ".join(large)}'))
+                elif full or walks:
+                    notes = [f'scans small table {table}' for table in sorted(full)]
+                    notes += [f'walks a whole index of {table}' for table in sorted(walks)]
+                    self.stdout.write(self.style.WARNING(f'~ {name}: {"; ".join(notes)}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'✓ {name}'))
+                if options['verbose'] or large:
+                    for line in plan.splitlines():
+                        self.stdout.write(f'      {line}')
+
+        summary = f'{flagged} quer{"y" if flagged == 1 else "ies"} with full scans of large tables ({vendor})'
+        if flagged and options['strict']:
+            raise CommandError(summary)
+        self.stdout.write(summary)
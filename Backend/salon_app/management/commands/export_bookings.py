@@ -0,0 +1,62 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from salon_app.exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, booking_export_rows
+from salon_app.models import Booking
+
+
+class Command(BaseCommand):
+    """
+    Stream bookings (with service, stylist, price and timestamps) to CSV or
+    NDJSON with constant memory.
+
+    Usage:
+        python manage.py export_bookings --from 2025-01-01 --to 2025-12-31 -o bookings-2025.csv
+        python manage.py export_bookings --status completed --format ndjson > completed.ndjson
+    """
+    help = 'Export bookings as CSV or NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-o', '--output', default='-', help='Output file (default: stdout)')
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), help='Default: from the file extension, else csv')
+        parser.add_argument('--from', dest='date_from', help='YYYY-MM-DD (inclusive)')
+        parser.add_argument('--to', dest='date_to', help='YYYY-MM-DD (inclusive)')
+        parser.add_argument('--status', default='', help='Comma-separated statuses')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            date_from = datetime.strptime(options['date_from'], '%Y-%m-%d').date() if options['date_from'] else None
+            date_to = datetime.strptime(options['date_to'], '%Y-%m-%d').date() if options['date_to'] else None
+        except ValueError:
+            raise CommandError('Invalid date format. Use YYYY-MM-DD')
+
+        statuses = [code for code in options['status'].split(',') if code]
+        invalid = set(statuses) - {code for code, label in Booking.STATUS_CHOICES}
+        if invalid:
+            raise CommandError(f'Invalid status: {", ".join(sorted(invalid))}')
+
+        output = options['output']
+        fmt = options['format'] or ('ndjson' if output.endswith(('.ndjson', '.jsonl')) else 'csv')
+        stream, content_type = EXPORT_FORMATS[fmt]
+
+        count = 0
+
+        def counted(rows):
+            nonlocal count
+            for row in rows:
+                count += 1
+                yield row
+
+        chunks = stream(counted(booking_export_rows(date_from, date_to, statuses, options['chunk_size'])))
+        if output == '-':
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+        else:
+            with Path(output).open('w', newline='', encoding='utf-8') as file:
+                for chunk in chunks:
+                    file.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f'Exported {count} bookings'))
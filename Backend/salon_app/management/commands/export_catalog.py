@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from salon_app.catalog import write_csv, write_json
+
+
+class Command(BaseCommand):
+    """
+    Write services and stylists (with their service names) as JSON, or one
+    kind as CSV, in the format import_catalog reads.
+
+    Usage:
+        python manage.py export_catalog -o catalog.json
+        python manage.py export_catalog --format csv --kind stylists -o stylists.csv
+    """
+    help = 'Export services and stylists as a CSV or JSON catalog'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-o', '--output', default='-', help='Output file (default: stdout)')
+        parser.add_argument('--format', choices=['json', 'csv'], help='Default: from the file extension, else json')
+        parser.add_argument('--kind', choices=['services', 'stylists'], help='Required for CSV')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        fmt = options['format'] or ('csv' if output.lower().endswith('.csv') else 'json')
+        if fmt == 'csv' and not options['kind']:
+            raise CommandError('--kind is required for CSV exports')
+
+        def write(stream):
+            if fmt == 'csv':
+                write_csv(stream, options['kind'])
+            else:
+                write_json(stream)
+
+        if output == '-':
+            write(sys.stdout)
+            return
+        with Path(output).open('w', newline='', encoding='utf-8') as stream:
+            write(stream)
+        self.stderr.write(self.style.SUCCESS(f'Catalog written to {output}'))
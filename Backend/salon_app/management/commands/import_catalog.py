@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from salon_app.catalog import CatalogError, import_catalog, read_catalog
+
+
+class Command(BaseCommand):
+    """
+    Create or update services and stylists from a CSV or JSON catalog.
+    Services are matched by name and stylists by email; unchanged rows are
+    left alone, so re-running with the same file writes nothing.
+
+    Usage:
+        python manage.py import_catalog catalog.json
+        python manage.py import_catalog services.csv
+        python manage.py import_catalog stylists.csv --dry-run
+    """
+    help = 'Import services and stylists from a CSV or JSON catalog file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Catalog file, or - for stdin')
+        parser.add_argument('--format', choices=['json', 'csv'], help='Default: from the file extension')
+        parser.add_argument('--kind', choices=['services', 'stylists'],
+                            help='CSV only; default: stylists when there is an "email" column')
+        parser.add_argument('--deactivate-missing', action='store_true',
+                            help='Deactivate services/stylists that are not in the file')
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes without saving them')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.lower().endswith('.csv') else 'json')
+
+        try:
+            if path == '-':
+                services, stylists = read_catalog(sys.stdin, fmt, options['kind'])
+            else:
+                with Path(path).open(newline='', encoding='utf-8') as stream:
+                    services, stylists = read_catalog(stream, fmt, options['kind'])
+        except OSError as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+        except ValueError as e:
+            raise CommandError(f'Invalid {fmt.upper()} in {path}: {e}')
+
+        try:
+            summary = import_catalog(
+                services, stylists,
+                deactivate_missing=options['deactivate_missing'],
+                dry_run=options['dry_run'],
+            )
+        except CatalogError as e:
+            for error in e.errors:
+                self.stderr.write(f'  {error}')
+            raise CommandError(f'{len(e.errors)} error(s) in the catalog; nothing was imported')
+
+        for kind in ('services', 'stylists'):
+            counts = summary[kind]
+            self.stdout.write(
+                f'{kind}: {counts["created"]} created, {counts["updated"]} updated, {counts["unchanged"]} unchanged'
+            )
+        self.stdout.write(f'stylist services: {summary["links"]["added"]} added, {summary["links"]["removed"]} removed')
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: no changes saved'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ Catalog imported'))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from salon_app.emails import deliver_outbox
+
+
+class Command(BaseCommand):
+    """
+    Outbox worker for deployments without Celery.
+
+    Usage:
+        python manage.py process_outbox            # run forever
+        python manage.py process_outbox --once     # drain due emails and exit
+    """
+    help = 'Deliver queued outbox emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Deliver due emails once and exit')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds between polls')
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            sent = deliver_outbox(batch_size=options['batch_size'])
+            if sent:
+                self.stdout.write(f'Sent {sent} email(s)')
+            if options['once']:
+                break
+            time.sleep(options['interval'])
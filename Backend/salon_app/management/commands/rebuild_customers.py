@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from salon_app.customers import CHUNK_SIZE, rebuild_customers
+
+
+class Command(BaseCommand):
+    """
+    Recompute the Customer aggregate table from bookings, one chunk of phone
+    numbers per transaction. Booking signals keep it current; run this after
+    writes that skip them (queryset.update(), bulk_create(), raw SQL) or a
+    service price change that should be reflected in past spend.
+
+    Usage:
+        python manage.py rebuild_customers
+        python manage.py rebuild_customers --chunk-size 5000
+    """
+    help = 'Rebuild customer profiles from bookings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def progress(done):
+            self.stdout.write(f'  {done} customers')
+
+        total = rebuild_customers(options['chunk_size'], progress=progress)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} customers in {elapsed:.1f}s'))
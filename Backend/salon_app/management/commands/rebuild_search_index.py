@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from salon_app.search import SEARCH_SOURCES, rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the full-text search index from the source tables. Saves and
+    deletes keep it in sync; run this after bulk writes that skip signals
+    (queryset.update(), bulk_create(), seed_salon, raw SQL).
+
+    Usage:
+        python manage.py rebuild_search_index
+        python manage.py rebuild_search_index --kind booking --chunk-size 5000
+    """
+    help = 'Rebuild the full-text search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', action='append', choices=list(SEARCH_SOURCES), help='Repeatable (default: all)')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def progress(kind, done):
+            self.stdout.write(f'  {kind}: {done} indexed')
+
+        total = rebuild_index(options['kind'], options['chunk_size'], progress=progress)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} objects in {elapsed:.1f}s'))
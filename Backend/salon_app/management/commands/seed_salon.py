@@ -0,0 +1,126 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from salon_app.models import Service, Stylist
+from salon_app.customers import rebuild_customers
+from salon_app.search import rebuild_index
+from salon_app.seeding import Distribution, Seeder
+
+
+def parse_weights(value):
+    """'pending=45,confirmed=45' -> {'pending': 45.0, 'confirmed': 45.0}"""
+    weights = {}
+    for part in value.split(','):
+        key, sep, weight = part.partition('=')
+        if not sep:
+            raise CommandError(f'Expected key=weight, got "{part}"')
+        try:
+            weights[key.strip()] = float(weight)
+        except ValueError:
+            raise CommandError(f'Invalid weight in "{part}"')
+    return weights
+
+
+class Command(BaseCommand):
+    """
+    Generate synthetic salon data at scale with bulk_create in batches.
+    The same --seed on an empty database always produces the same rows.
+
+    Usage:
+        python manage.py seed_salon --bookings 1000000 --stylists 2000 --reviews 100000
+        python manage.py seed_salon --bookings 50000 --services 0 --stylists 0   # reuse the existing catalog
+        python manage.py seed_salon --stylist-skew 0 --future-statuses pending=20,confirmed=80
+    """
+    help = 'Bulk-generate services, stylists, bookings and reviews for scale testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--services', type=int, default=40)
+        parser.add_argument('--stylists', type=int, default=200)
+        parser.add_argument('--services-per-stylist', default='2-6', help='Range, e.g. 2-6')
+        parser.add_argument('--bookings', type=int, default=100000)
+        parser.add_argument('--customers', type=int, help='Distinct customers (default: bookings / 4)')
+        parser.add_argument('--reviews', type=int, default=10000, help='Reviews for completed bookings')
+        parser.add_argument('--days-back', type=int, default=365)
+        parser.add_argument('--days-ahead', type=int, default=60)
+        parser.add_argument('--stylist-skew', type=float, default=0.8,
+                            help='Zipf exponent for stylist popularity (0 = uniform)')
+        parser.add_argument('--customer-skew', type=float, default=1.1,
+                            help='Zipf exponent for repeat customers (0 = uniform)')
+        parser.add_argument('--past-statuses', default='completed=85,cancelled=15')
+        parser.add_argument('--future-statuses', default='pending=45,confirmed=45,cancelled=10')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        past = parse_weights(options['past_statuses'])
+        future = parse_weights(options['future_statuses'])
+        if set(past) - {'completed', 'cancelled'}:
+            raise CommandError('--past-statuses accepts completed and cancelled')
+        if set(future) - {'pending', 'confirmed', 'cancelled'}:
+            raise CommandError('--future-statuses accepts pending, confirmed and cancelled')
+        try:
+            low, high = (int(n) for n in options['services_per_stylist'].split('-'))
+        except ValueError:
+            raise CommandError('--services-per-stylist must look like 2-6')
+
+        distribution = Distribution(
+            days_back=options['days_back'],
+            days_ahead=options['days_ahead'],
+            stylist_skew=options['stylist_skew'],
+            customer_skew=options['customer_skew'],
+            past_statuses=past,
+            future_statuses=future,
+        )
+        self.last_report = 0
+        seeder = Seeder(seed=options['seed'], batch_size=options['batch_size'], progress=self.progress)
+        started = time.perf_counter()
+
+        if connection.vendor == 'sqlite':
+            # Skip the fsync after every batch; the data is synthetic
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA synchronous = OFF')
+
+        services = seeder.create_services(options['services']) if options['services'] else list(Service.objects.all())
+        if not services:
+            raise CommandError('No services to attach stylists to')
+
+        if options['stylists']:
+            stylists = seeder.create_stylists(options['stylists'], services, (low, high))
+        else:
+            stylists = list(Stylist.objects.filter(is_active=True))
+
+        if options['bookings']:
+            self.step_started = time.perf_counter()
+            customers = seeder.create_customers(options['customers'] or max(1, options['bookings'] // 4))
+            seeder.create_bookings(options['bookings'], stylists, distribution, customers)
+
+        if options['reviews']:
+            self.step_started = time.perf_counter()
+            seeder.create_reviews(options['reviews'])
+
+        # bulk_create skips the signals that keep customers and the search index in sync
+        if options['bookings']:
+            self.stdout.write('Rebuilding customer profiles...')
+            rebuild_customers()
+        kinds = [kind for kind, count in (('booking', options['bookings']), ('review', options['reviews'])) if count]
+        if kinds:
+            self.stdout.write('Rebuilding the search index...')
+            rebuild_index(kinds)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Done in {time.perf_counter() - started:.1f}s'))
+
+    def progress(self, label, done, total):
+        """Print at most every two seconds, plus once when a step completes"""
+        now = time.perf_counter()
+        finished = total is not None and done >= total
+        if not finished and now - self.last_report < 2:
+            return
+        self.last_report = now
+        elapsed = now - getattr(self, 'step_started', now)
+        rate = f', {done / elapsed:,.0f} rows/s' if elapsed > 0 else ''
+        if total:
+            self.stdout.write(f'  {label}: {done:,}/{total:,} ({done / total:.0%}{rate})')
+        else:
+            self.stdout.write(f'  {label}: {done:,}{rate}')
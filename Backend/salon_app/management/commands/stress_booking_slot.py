@@ -0,0 +1,101 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from salon_app.models import Booking, Service, Stylist
+
+
+class Command(BaseCommand):
+    """
+    Fire many concurrent POSTs for the same stylist slot at a running server
+    and check that exactly one booking was accepted.
+
+    Usage:
+        gunicorn salon_project.wsgi --workers 4 --threads 4 &
+        python manage.py stress_booking_slot --threads 50
+    """
+    help = 'Concurrently book the same stylist slot to verify double-booking protection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/api/bookings/')
+        parser.add_argument('--threads', type=int, default=20)
+        parser.add_argument('--service', type=int, help='Service id (default: first active service)')
+        parser.add_argument('--stylist', type=int, help='Stylist id (default: first stylist offering the service)')
+        parser.add_argument('--date', help='YYYY-MM-DD (default: 30 days from today)')
+        parser.add_argument('--time', default='10:00')
+
+    def handle(self, *args, **options):
+        service = self.get_service(options['service'])
+        stylist = self.get_stylist(options['stylist'], service)
+        date = (
+            datetime.strptime(options['date'], '%Y-%m-%d').date() if options['date']
+            else timezone.localdate() + timedelta(days=30)
+        )
+        slot = datetime.strptime(options['time'], '%H:%M').time()
+        threads = options['threads']
+
+        payload = json.dumps({
+            'fullname': 'Load Test',
+            'phone': '+254700000000',
+            'service': service.pk,
+            'stylist': stylist.pk,
+            'date': str(date),
+            'time': slot.strftime('%H:%M'),
+            'send_email': False,
+        }).encode()
+
+        barrier = threading.Barrier(threads)
+
+        def post(_):
+            request = urllib.request.Request(
+                options['url'], data=payload, headers={'Content-Type': 'application/json'}
+            )
+            barrier.wait()
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    return response.status
+            except urllib.error.HTTPError as e:
+                return e.code
+            except (urllib.error.URLError, OSError) as e:
+                return f'error: {getattr(e, "reason", e)}'
+
+        self.stdout.write(f'Booking {stylist} on {date} at {slot} from {threads} threads...')
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = Counter(executor.map(post, range(threads)))
+
+        for result, count in sorted(results.items(), key=str):
+            self.stdout.write(f'  {result}: {count}')
+
+        stored = Booking.objects.filter(
+            stylist=stylist, date=date, time=slot, status__in=Booking.ACTIVE_STATUSES
+        ).count()
+        self.stdout.write(f'Active bookings stored for the slot: {stored}')
+
+        if results.get(201, 0) == 1 and stored == 1:
+            self.stdout.write(self.style.SUCCESS('✅ Exactly one booking accepted'))
+        else:
+            raise CommandError('Expected exactly one accepted booking for the slot')
+
+    def get_service(self, service_id):
+        services = Service.objects.filter(is_active=True)
+        service = services.filter(pk=service_id).first() if service_id else services.first()
+        if service is None:
+            raise CommandError('No active service found')
+        return service
+
+    def get_stylist(self, stylist_id, service):
+        stylists = Stylist.objects.filter(is_active=True)
+        if stylist_id:
+            stylist = stylists.filter(pk=stylist_id).first()
+        else:
+            stylist = stylists.filter(available_services=service).first() or stylists.first()
+        if stylist is None:
+            raise CommandError('No active stylist found')
+        return stylist
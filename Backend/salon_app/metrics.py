@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .caching import CACHE_STATS, versioned_key
+from .instrumentation import LATENCY_BUCKETS, connection_stats, route_registry
+from .models import Booking, EmailOutbox
+
+
+# ==================== PROMETHEUS EXPOSITION ====================
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{_label(value)}"' for key, value in labels.items()) + '}'
+
+
+class Exposition:
+    """Builds the Prometheus text format (version 0.0.4)"""
+
+    def __init__(self):
+        self.lines = []
+
+    def metric(self, name, kind, help_text, samples):
+        self.lines.append(f'# HELP {name} {help_text}')
+        self.lines.append(f'# TYPE {name} {kind}')
+        for suffix, labels, value in samples:
+            self.lines.append(f'{name}{suffix}{_labels(**labels) if labels else ""} {value}')
+
+    def render(self):
+        return '\n'.join(self.lines) + '\n'
+
+
+def get_business_gauges():
+    """
+    Booking and outbox gauges, cached so scrapes don't hit the database.
+    Read and written directly: scrapes must not count towards CACHE_STATS.
+    Booking counts are keyed on the Booking version, so they can be kept
+    for many scrapes; the outbox changes without it and is kept briefly.
+    """
+    today = timezone.localdate()
+    key = versioned_key('metrics:bookings', [Booking], today)
+    bookings = cache.get(key)
+    if bookings is None:
+        bookings = Booking.objects.aggregate(
+            bookings_pending=Count('id', filter=Q(status='pending')),
+            bookings_today=Count('id', filter=Q(date=today)),
+            bookings_upcoming=Count('id', filter=Q(starts_at__gt=timezone.now(), status__in=Booking.ACTIVE_STATUSES)),
+        )
+        cache.set(key, bookings, getattr(settings, 'METRICS_BOOKING_GAUGE_CACHE_SECONDS', 300))
+
+    key = 'salon:metrics:outbox'
+    outbox = cache.get(key)
+    if outbox is None:
+        # Only unsent rows, through the (status, next_attempt_at) index
+        outbox = EmailOutbox.objects.filter(status__in=['pending', 'sending', 'failed']).aggregate(
+            email_outbox_pending=Count('id', filter=Q(status__in=['pending', 'sending'])),
+            email_outbox_failed=Count('id', filter=Q(status='failed')),
+        )
+        cache.set(key, outbox, getattr(settings, 'METRICS_GAUGE_CACHE_SECONDS', 15))
+
+    return {**bookings, **outbox}
+
+
+def render_metrics():
+    exposition = Exposition()
+    counters = route_registry.counters()
+
+    exposition.metric('salon_http_requests_total', 'counter', 'HTTP requests by view, method and status', [
+        ('', {'view': route, 'method': method, 'status': code}, count)
+        for route, data in counters.items()
+        for (method, code), count in sorted(data['responses'].items())
+    ])
+
+    histogram = []
+    for route, data in counters.items():
+        for bound, count in zip(LATENCY_BUCKETS, data['buckets']):
+            histogram.append(('_bucket', {'view': route, 'le': bound}, count))
+        histogram.append(('_bucket', {'view': route, 'le': '+Inf'}, data['count']))
+        histogram.append(('_sum', {'view': route}, round(data['duration_sum'], 6)))
+        histogram.append(('_count', {'view': route}, data['count']))
+    exposition.metric('salon_http_request_duration_seconds', 'histogram', 'Request latency by view', histogram)
+
+    exposition.metric('salon_db_queries_total', 'counter', 'SQL queries executed by view', [
+        ('', {'view': route}, data['db_queries_total']) for route, data in counters.items()
+    ])
+    exposition.metric('salon_db_query_seconds_total', 'counter', 'Time spent in SQL by view', [
+        ('', {'view': route}, round(data['db_seconds_total'], 6)) for route, data in counters.items()
+    ])
+
+    connections = connection_stats()
+    exposition.metric('salon_db_connections_open', 'gauge', 'Open DB connections in this worker', [
+        ('', {'alias': alias, 'vendor': entry['vendor']}, entry['open']) for alias, entry in connections.items()
+    ])
+    exposition.metric('salon_db_connections', 'gauge', 'DB connection slots (one per thread) in this worker', [
+        ('', {'alias': alias, 'vendor': entry['vendor']}, entry['total']) for alias, entry in connections.items()
+    ])
+    exposition.metric('salon_db_conn_max_age_seconds', 'gauge', 'Persistent connection lifetime (CONN_MAX_AGE)', [
+        ('', {'alias': alias}, entry['max_age'] if entry['max_age'] is not None else -1)
+        for alias, entry in connections.items()
+    ])
+
+    hits, misses = CACHE_STATS['hits'], CACHE_STATS['misses']
+    exposition.metric('salon_cache_hits_total', 'counter', 'Read-through cache hits', [('', None, hits)])
+    exposition.metric('salon_cache_misses_total', 'counter', 'Read-through cache misses', [('', None, misses)])
+    exposition.metric('salon_cache_hit_ratio', 'gauge', 'Read-through cache hit ratio', [
+        ('', None, round(hits / (hits + misses), 4) if hits + misses else 0)
+    ])
+
+    gauges = get_business_gauges()
+    exposition.metric('salon_email_outbox_pending', 'gauge', 'Emails waiting for delivery',
+                      [('', None, gauges['email_outbox_pending'])])
+    exposition.metric('salon_email_outbox_failed', 'gauge', 'Emails that exhausted their retries',
+                      [('', None, gauges['email_outbox_failed'])])
+    exposition.metric('salon_bookings_pending', 'gauge', 'Bookings waiting for confirmation',
+                      [('', None, gauges['bookings_pending'])])
+    exposition.metric('salon_bookings_today', 'gauge', "Bookings for today's date",
+                      [('', None, gauges['bookings_today'])])
+    exposition.metric('salon_bookings_upcoming', 'gauge', 'Pending or confirmed bookings that have not started',
+                      [('', None, gauges['bookings_upcoming'])])
+
+    return exposition.render()
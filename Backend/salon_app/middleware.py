@@ -0,0 +1,58 @@
+import json
+import logging
+from contextlib import ExitStack
+
+from django.db import connections
+
+from .instrumentation import finish_request, route_registry, start_request, track_connection
+
+logger = logging.getLogger('salon_app.requests')
+
+
+# ==================== REQUEST METRICS MIDDLEWARE ====================
+class RequestMetricsMiddleware:
+    """
+    Measure wall time, DB queries/time, serialization and rendering for every
+    request. Adds a Server-Timing header, logs one structured line per request
+    and feeds the per-route percentiles served by /api/metrics/requests/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics, token = start_request()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    track_connection(connection)
+                    stack.enter_context(connection.execute_wrapper(metrics.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            finish_request(token)
+
+        total = metrics.elapsed
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else 'unmatched'
+        size = None if response.streaming else len(response.content)
+
+        timings = [f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.db_queries} queries"']
+        for phase, seconds in metrics.phases.items():
+            timings.append(f'{phase};dur={seconds * 1000:.1f}')
+        timings.append(f'total;dur={total * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(timings)
+
+        route_registry.record(route, response.status_code, total, metrics.db_queries, metrics.db_time, size, request.method)
+
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'route': route,
+            'status': response.status_code,
+            'duration_ms': round(total * 1000, 2),
+            'db_queries': metrics.db_queries,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            **{f'{phase}_ms': round(seconds * 1000, 2) for phase, seconds in metrics.phases.items()},
+            'bytes': size,
+        }))
+        return response
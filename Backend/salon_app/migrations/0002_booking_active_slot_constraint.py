@@ -0,0 +1,58 @@
+# Generated by Django 4.2 on 2026-10-17 22:31
+
+import logging
+
+from django.db import migrations, models
+from django.db.models import Count
+
+logger = logging.getLogger('salon_app.migrations')
+
+ACTIVE_STATUSES = ['pending', 'confirmed']
+
+
+def cancel_duplicate_bookings(apps, schema_editor):
+    """
+    Existing double bookings would make the constraint fail to apply. In each
+    duplicated (stylist, date, time) slot keep one active booking (confirmed
+    before pending, then the oldest) and cancel the others, with a note.
+    """
+    Booking = apps.get_model('salon_app', 'Booking')
+    db = schema_editor.connection.alias
+    active = Booking.objects.using(db).filter(status__in=ACTIVE_STATUSES, stylist__isnull=False)
+    slots = (
+        active.order_by().values('stylist_id', 'date', 'time')
+        .annotate(count=Count('id')).filter(count__gt=1)
+    )
+    cancelled = []
+    for slot in slots:
+        bookings = list(
+            active.filter(stylist_id=slot['stylist_id'], date=slot['date'], time=slot['time'])
+            .order_by('status', 'id')  # 'confirmed' sorts before 'pending'
+        )
+        for booking in bookings[1:]:
+            booking.status = 'cancelled'
+            booking.notes = (booking.notes + '\n' if booking.notes else '') + (
+                f'Cancelled by migration 0002: double booking of the slot kept by booking #{bookings[0].pk}'
+            )
+            booking.save(update_fields=['status', 'notes'])
+            cancelled.append(booking.pk)
+    if cancelled:
+        logger.warning(
+            'unique_active_booking_slot: cancelled %d double-booked booking(s): %s',
+            len(cancelled), ', '.join(map(str, cancelled)),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salon_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(cancel_duplicate_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'confirmed'])), fields=('stylist', 'date', 'time'), name='unique_active_booking_slot'),
+        ),
+    ]
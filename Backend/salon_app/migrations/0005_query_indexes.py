@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-17 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salon_app', '0004_review_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status', 'date', 'time'], name='booking_status_date_time'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['phone', 'date', 'time'], name='booking_phone_date_time'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['stylist', 'date', 'status'], name='booking_stylist_date_status'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'confirmed'])), fields=['date', 'time'], name='booking_upcoming'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['created_at'], name='review_approved_created'),
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='salon_app_b_status_1e3a01_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='salon_app_b_phone_d8606c_idx',
+        ),
+    ]
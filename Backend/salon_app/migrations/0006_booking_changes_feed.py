@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-17 23:01
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salon_app', '0005_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_id', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['deleted_at', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['updated_at', 'id'], name='booking_updated_id'),
+        ),
+        migrations.AddIndex(
+            model_name='bookingtombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_id'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import migrations, transaction
+
+
+CHUNK_SIZE = 2000
+
+
+def backfill_times(apps, schema_editor):
+    """
+    Fill starts_at/ends_at in id order, one transaction per chunk, so a large
+    bookings table is never locked or held in memory as a whole.
+    """
+    Booking = apps.get_model('salon_app', 'Booking')
+    zone = ZoneInfo(settings.TIME_ZONE)
+    db = schema_editor.connection.alias
+    last_id = 0
+    while True:
+        rows = list(
+            Booking.objects.using(db).filter(id__gt=last_id, starts_at__isnull=True)
+            .order_by('id').values_list('id', 'date', 'time', 'service__duration_minutes')[:CHUNK_SIZE]
+        )
+        if not rows:
+            break
+        bookings = []
+        for pk, date, time, duration in rows:
+            starts_at = datetime.combine(date, time).replace(tzinfo=zone)
+            bookings.append(Booking(id=pk, starts_at=starts_at, ends_at=starts_at + timedelta(minutes=duration)))
+        with transaction.atomic(using=db):
+            Booking.objects.using(db).bulk_update(bookings, ['starts_at', 'ends_at'], batch_size=500)
+        last_id = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    # Each chunk commits on its own
+    atomic = False
+
+    dependencies = [
+        ('salon_app', '0007_booking_starts_ends'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_times, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 4.2 on 2026-10-17 23:20
+
+import logging
+
+from django.db import migrations, models
+
+logger = logging.getLogger('salon_app.migrations')
+
+# Same statuses as unique_active_booking_slot
+EXCLUSION_SQL = """
+    ALTER TABLE salon_app_booking ADD CONSTRAINT booking_no_active_overlap
+    EXCLUDE USING gist (stylist_id WITH =, tstzrange(starts_at, ends_at, '[)') WITH &&)
+    WHERE (status IN ('pending', 'confirmed') AND stylist_id IS NOT NULL)
+"""
+
+OVERLAPS_SQL = """
+    SELECT COUNT(*) FROM salon_app_booking a JOIN salon_app_booking b
+      ON a.stylist_id = b.stylist_id AND a.id < b.id
+     AND a.status IN ('pending', 'confirmed') AND b.status IN ('pending', 'confirmed')
+     AND a.starts_at < b.ends_at AND b.starts_at < a.ends_at
+"""
+
+
+def add_exclusion_constraint(apps, schema_editor):
+    """
+    PostgreSQL only: reject overlapping active bookings of a stylist in the
+    database itself. Skipped (with a warning) when existing rows already
+    overlap, since the constraint can't be added NOT VALID; /health/ready/
+    reports the constraint as missing until it is added by hand.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(OVERLAPS_SQL)
+        overlapping = cursor.fetchone()[0]
+        if overlapping:
+            logger.warning(
+                'Skipping booking_no_active_overlap: %s overlapping active booking pair(s). '
+                'Resolve them, then add the constraint by hand (see README).', overlapping
+            )
+            return
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        cursor.execute(EXCLUSION_SQL)
+
+
+def remove_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('ALTER TABLE salon_app_booking DROP CONSTRAINT IF EXISTS booking_no_active_overlap')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salon_app', '0008_backfill_booking_times'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='starts_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='ends_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_upcoming',
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'confirmed'])), fields=['starts_at'], name='booking_upcoming'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['stylist', 'ends_at', 'starts_at'], name='booking_stylist_ends_starts'),
+        ),
+        migrations.RunPython(add_exclusion_constraint, remove_exclusion_constraint),
+    ]
@@ -0,0 +1,165 @@
+# Generated by Django 4.2 on 2026-10-17 23:11
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models, transaction
+
+
+POSTGRES_SQL = [
+    """ALTER TABLE salon_app_searchentry ADD COLUMN vector tsvector
+       GENERATED ALWAYS AS (to_tsvector('simple', text)) STORED""",
+    'CREATE INDEX searchentry_vector ON salon_app_searchentry USING gin (vector)',
+]
+
+# External-content FTS5 table over salon_app_searchentry, kept in step by triggers
+SQLITE_SQL = [
+    """CREATE VIRTUAL TABLE salon_app_searchentry_fts USING fts5(
+       text, kind UNINDEXED, content='salon_app_searchentry', content_rowid='id')""",
+    """CREATE TRIGGER salon_app_searchentry_ai AFTER INSERT ON salon_app_searchentry BEGIN
+       INSERT INTO salon_app_searchentry_fts(rowid, text, kind) VALUES (new.id, new.text, new.kind);
+       END""",
+    """CREATE TRIGGER salon_app_searchentry_ad AFTER DELETE ON salon_app_searchentry BEGIN
+       INSERT INTO salon_app_searchentry_fts(salon_app_searchentry_fts, rowid, text, kind)
+       VALUES ('delete', old.id, old.text, old.kind);
+       END""",
+    """CREATE TRIGGER salon_app_searchentry_au AFTER UPDATE ON salon_app_searchentry BEGIN
+       INSERT INTO salon_app_searchentry_fts(salon_app_searchentry_fts, rowid, text, kind)
+       VALUES ('delete', old.id, old.text, old.kind);
+       INSERT INTO salon_app_searchentry_fts(rowid, text, kind) VALUES (new.id, new.text, new.kind);
+       END""",
+]
+
+
+def create_fulltext_index(apps, schema_editor):
+    """Vendor specific full-text index; other backends fall back to a substring scan"""
+    statements = {'postgresql': POSTGRES_SQL, 'sqlite': SQLITE_SQL}.get(schema_editor.connection.vendor, [])
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS searchentry_vector')
+            cursor.execute('ALTER TABLE salon_app_searchentry DROP COLUMN IF EXISTS vector')
+        elif vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS salon_app_searchentry_{suffix}')
+            cursor.execute('DROP TABLE IF EXISTS salon_app_searchentry_fts')
+
+
+# Backfill: a frozen copy of salon_app.search (and salon_app.models.normalize_phone)
+# as of this migration
+CHUNK_SIZE = 2000
+WORD_RE = re.compile(r'\w+')
+
+
+def normalize_phone(value, country_code=None):
+    country_code = country_code or getattr(settings, 'PHONE_COUNTRY_CODE', '254')
+    value = (value or '').strip()
+    digits = re.sub(r'\D', '', value)
+    if value.startswith('+'):
+        pass
+    elif digits.startswith('00'):
+        digits = digits[2:]
+    elif digits.startswith('0'):
+        digits = country_code + digits[1:]
+    elif not digits.startswith(country_code) and len(digits) <= 9:
+        digits = country_code + digits
+    if not 7 <= len(digits) <= 15:
+        return ''
+    return '+' + digits
+
+
+def phone_variants(phone):
+    digits = ''.join(WORD_RE.findall(phone or ''))
+    key = normalize_phone(phone)
+    if not key:
+        return [digits]
+    variants = {digits, key[1:]}
+    country_code = getattr(settings, 'PHONE_COUNTRY_CODE', '254')
+    if key[1:].startswith(country_code):
+        variants.add('0' + key[1 + len(country_code):])
+    return sorted(variants)
+
+
+def booking_entry(row):
+    title = f"{row['fullname']} - {row['service__name']} on {row['date']} at {row['time']:%H:%M}"
+    return title, [row['fullname'], *phone_variants(row['phone']), row['email'], row['notes']]
+
+
+def contact_entry(row):
+    title = f"{row['name']} - {row['subject']}"
+    return title, [row['name'], row['email'], row['subject'], row['message']]
+
+
+def review_entry(row):
+    title = f"{row['client_name']} - {row['rating']} stars: {row['title']}"
+    return title, [row['client_name'], row['title'], row['comment']]
+
+
+SEARCH_SOURCES = {
+    'booking': ('Booking', ['id', 'fullname', 'phone', 'email', 'notes', 'service__name', 'date', 'time'], booking_entry),
+    'contact': ('ContactMessage', ['id', 'name', 'email', 'subject', 'message'], contact_entry),
+    'review': ('Review', ['id', 'client_name', 'rating', 'title', 'comment'], review_entry),
+}
+
+
+def normalize(parts):
+    return ' '.join(WORD_RE.findall(' '.join(part for part in parts if part).lower()))
+
+
+def backfill_search_index(apps, schema_editor):
+    """Index existing rows in id order, one transaction per chunk"""
+    SearchEntry = apps.get_model('salon_app', 'SearchEntry')
+    db = schema_editor.connection.alias
+    for kind, (model_name, fields, build) in SEARCH_SOURCES.items():
+        model = apps.get_model('salon_app', model_name)
+        last_id = 0
+        while True:
+            rows = list(model.objects.using(db).filter(pk__gt=last_id).order_by('pk').values(*fields)[:CHUNK_SIZE])
+            if not rows:
+                break
+            entries = []
+            for row in rows:
+                title, parts = build(row)
+                entries.append(SearchEntry(kind=kind, object_id=row['id'], title=title[:255], text=normalize(parts)))
+            with transaction.atomic(using=db):
+                SearchEntry.objects.using(db).bulk_create(entries, batch_size=500)
+            last_id = rows[-1]['id']
+
+
+class Migration(migrations.Migration):
+
+    # The backfill commits chunk by chunk
+    atomic = False
+
+    dependencies = [
+        ('salon_app', '0010_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('booking', 'Booking'), ('contact', 'Contact message'), ('review', 'Review')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('text', models.TextField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Search Entries',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_entry'),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
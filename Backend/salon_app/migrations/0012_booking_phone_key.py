@@ -0,0 +1,69 @@
+# Generated by Django 4.2 on 2026-10-17 23:15
+
+import re
+
+from django.conf import settings
+from django.db import migrations, transaction
+import salon_app.models
+
+
+CHUNK_SIZE = 2000
+
+
+def normalize_phone(value, country_code=None):
+    """Frozen copy of salon_app.models.normalize_phone as of this migration"""
+    country_code = country_code or getattr(settings, 'PHONE_COUNTRY_CODE', '254')
+    value = (value or '').strip()
+    digits = re.sub(r'\D', '', value)
+    if value.startswith('+'):
+        pass
+    elif digits.startswith('00'):
+        digits = digits[2:]
+    elif digits.startswith('0'):
+        digits = country_code + digits[1:]
+    elif not digits.startswith(country_code) and len(digits) <= 9:
+        digits = country_code + digits
+    if not 7 <= len(digits) <= 15:
+        return ''
+    return '+' + digits
+
+
+def backfill_phone_keys(apps, schema_editor):
+    """Fill phone_key in id order, one transaction per chunk"""
+    Booking = apps.get_model('salon_app', 'Booking')
+    db = schema_editor.connection.alias
+    last_id = 0
+    while True:
+        rows = list(
+            Booking.objects.using(db).filter(id__gt=last_id)
+            .order_by('id').values_list('id', 'phone', 'phone_key')[:CHUNK_SIZE]
+        )
+        if not rows:
+            break
+        bookings = []
+        for pk, phone, phone_key in rows:
+            normalized = normalize_phone(phone)
+            if normalized != phone_key:
+                bookings.append(Booking(id=pk, phone_key=normalized))
+        with transaction.atomic(using=db):
+            Booking.objects.using(db).bulk_update(bookings, ['phone_key'], batch_size=500)
+        last_id = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    # Each chunk commits on its own
+    atomic = False
+
+    dependencies = [
+        ('salon_app', '0011_search_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='phone_key',
+            field=salon_app.models.PhoneKeyField(default='', editable=False, max_length=16, source='phone'),
+        ),
+        migrations.RunPython(backfill_phone_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-17 23:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salon_app', '0012_booking_phone_key'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_phone_date_time',
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['phone_key', 'starts_at', 'id', 'status', 'service', 'stylist'], name='booking_phone_key_history'),
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 4.2 on 2026-10-17 23:19
+
+from decimal import Decimal
+
+from django.db import migrations, models, transaction
+from django.db.models import Count, Max, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+import salon_app.models
+
+
+CHUNK_SIZE = 2000
+
+
+def customer_aggregates(Booking, bookings):
+    """One row per phone_key, as salon_app.customers computed it at this migration"""
+    latest = Booking.objects.filter(phone_key=OuterRef('phone_key')).order_by('-starts_at', '-id')
+    completed = Q(status='completed')
+    return (
+        bookings.exclude(phone_key='').order_by().values('phone_key').annotate(
+            name=Subquery(latest.values('fullname')[:1]),
+            email=Subquery(latest.values('email')[:1]),
+            booking_count=Count('id'),
+            completed_count=Count('id', filter=completed),
+            cancelled_count=Count('id', filter=Q(status='cancelled')),
+            total_spent=Coalesce(
+                Sum('service__price', filter=completed), Value(Decimal('0')), output_field=models.DecimalField()
+            ),
+            first_booking_at=Min('starts_at'),
+            last_booking_at=Max('starts_at'),
+            last_visit_at=Max('starts_at', filter=completed),
+        )
+    )
+
+
+def backfill_customers(apps, schema_editor):
+    """Build the table from existing bookings, one transaction per chunk of phone keys"""
+    Booking = apps.get_model('salon_app', 'Booking')
+    Customer = apps.get_model('salon_app', 'Customer')
+    db = schema_editor.connection.alias
+    last_key = ''
+    while True:
+        keys = list(
+            Booking.objects.using(db).filter(phone_key__gt=last_key).order_by('phone_key')
+            .values_list('phone_key', flat=True).distinct()[:CHUNK_SIZE]
+        )
+        if not keys:
+            break
+        now = timezone.now()
+        rows = customer_aggregates(Booking, Booking.objects.using(db).filter(phone_key__in=keys))
+        with transaction.atomic(using=db):
+            Customer.objects.using(db).bulk_create(
+                [Customer(updated_at=now, **row) for row in rows], batch_size=500
+            )
+        last_key = keys[-1]
+
+
+class Migration(migrations.Migration):
+
+    # The backfill commits chunk by chunk
+    atomic = False
+
+    dependencies = [
+        ('salon_app', '0013_booking_phone_key_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Customer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                # A plain CharField until after the backfill, so copying the already
+                # normalized Booking.phone_key doesn't go through PhoneKeyField.pre_save
+                ('phone_key', models.CharField(max_length=16, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('booking_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('cancelled_count', models.PositiveIntegerField(default=0)),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('first_booking_at', models.DateTimeField(blank=True, null=True)),
+                ('last_booking_at', models.DateTimeField(blank=True, null=True)),
+                ('last_visit_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Customers',
+                'ordering': ['-last_booking_at', '-id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['total_spent', 'id'], name='customer_spent_id'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['last_booking_at', 'id'], name='customer_last_booking_id'),
+        ),
+        migrations.RunPython(backfill_customers, migrations.RunPython.noop),
+        # Same column; only the migration state changes
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='customer',
+                    name='phone_key',
+                    field=salon_app.models.PhoneKeyField(max_length=16, source=None, unique=True),
+                ),
+            ],
+        ),
+    ]
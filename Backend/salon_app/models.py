@@ -1,7 +1,12 @@
+import re
+
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Now
+from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator, MinValueValidator
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 # ==================== SERVICE MODEL ====================
 class Service(models.Model):
@@ -26,9 +31,40 @@ class Service(models.Model):
     class Meta:
         ordering = ['category', 'name']
         verbose_name_plural = "Services"
+        indexes = [
+            # ?category= filter in list order
+            models.Index(fields=['category', 'name'], name='service_category_name'),
+        ]
     
     def __str__(self):
         return f"{self.name} - KES {self.price}"
+    
+    def clean(self):
+        self.check_duration_change(self.duration_minutes)
+    
+    def check_duration_change(self, duration_minutes):
+        """
+        Refuse a longer duration that would make upcoming bookings of the
+        service run into the next booking of their stylist (ends_at moves
+        with the duration on save).
+        """
+        if self.pk is None or duration_minutes is None:
+            return
+        current = Service.objects.filter(pk=self.pk).values_list('duration_minutes', flat=True).first()
+        if current is None or duration_minutes <= current:
+            return
+        clashes = list(
+            Booking.objects.filter(service_id=self.pk, starts_at__gte=timezone.now())
+            .overlapping_if_lasting(duration_minutes).select_related('stylist').order_by('starts_at')[:5]
+        )
+        if clashes:
+            listed = ', '.join(
+                f"#{booking.pk} ({booking.date} {booking.time:%H:%M} with {booking.stylist.name})" for booking in clashes
+            )
+            raise ValidationError({'duration_minutes': (
+                f'{duration_minutes} minutes would overlap the next booking of the stylist for: {listed}. '
+                'Move or cancel those bookings first.'
+            )})
 
 
 # ==================== STYLIST MODEL ====================
@@ -63,30 +99,131 @@ class Stylist(models.Model):
     def __str__(self):
         return self.name
     
-    def available_slots(self, date):
+    def available_slots(self, date, service=None):
         """Get available time slots for a specific date"""
-        # Define salon hours: 9 AM - 8 PM
-        booked_times = Booking.objects.filter(
-            stylist=self,
-            date=date,
-            status__in=['confirmed', 'completed']
-        ).values_list('time', flat=True)
-        
-        # Generate available slots (hourly, 9 AM - 8 PM)
-        from datetime import time, datetime, timedelta
-        all_slots = []
-        start_hour = 9
-        end_hour = 20
+        from .availability import find_available_slots
         
-        for hour in range(start_hour, end_hour):
-            slot_time = time(hour, 0)
-            if slot_time not in booked_times:
-                all_slots.append(slot_time)
-        
-        return all_slots
+        availability = find_available_slots(service, date, date, stylists=[self])
+        return availability.get(self, {}).get(date, [])
 
 
 # ==================== BOOKING MODEL ====================
+def booking_start(date, time):
+    """Aware start of an appointment; dates and times are in the salon's time zone"""
+    return timezone.make_aware(datetime.combine(date, time), timezone.get_default_timezone())
+
+
+def normalize_phone(value, country_code=None):
+    """
+    E.164 form of a phone number as typed: '+254 712-345 678', '0712345678',
+    '254712345678' and '00254712345678' all give '+254712345678'.
+    Returns '' when it can't be a phone number.
+    """
+    country_code = country_code or getattr(settings, 'PHONE_COUNTRY_CODE', '254')
+    value = (value or '').strip()
+    digits = re.sub(r'\D', '', value)
+    if value.startswith('+'):
+        pass
+    elif digits.startswith('00'):
+        digits = digits[2:]
+    elif digits.startswith('0'):
+        digits = country_code + digits[1:]
+    elif not digits.startswith(country_code) and len(digits) <= 9:
+        digits = country_code + digits
+    if not 7 <= len(digits) <= 15:
+        return ''
+    return '+' + digits
+
+
+class PhoneKeyField(models.CharField):
+    """
+    Canonical (E.164) phone number: a copy of the `source` field (or the
+    field's own value when source is None), normalized on every save and
+    bulk_create. Lookup values are normalized too, so filter(phone_key='0712 345678')
+    matches, and to_python() rejects values that aren't phone numbers.
+    """
+    
+    def __init__(self, *args, source='phone', **kwargs):
+        self.source = source
+        super().__init__(*args, **kwargs)
+    
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+    
+    def pre_save(self, model_instance, add):
+        value = normalize_phone(getattr(model_instance, self.source or self.attname))
+        setattr(model_instance, self.attname, value)
+        return value
+    
+    def to_python(self, value):
+        value = super().to_python(value)
+        if not value:
+            return value
+        normalized = normalize_phone(value)
+        if not normalized:
+            raise ValidationError('Enter a valid phone number', code='invalid')
+        return normalized
+    
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        return (normalize_phone(value) or value) if value else value
+
+
+class BookingQuerySet(models.QuerySet):
+    def with_related(self):
+        """Load service, stylist and the stylist's services for serialization"""
+        return self.select_related('service', 'stylist').prefetch_related('stylist__available_services')
+    
+    def with_upcoming(self):
+        """Annotate `upcoming` (starts in the future), computed by the database"""
+        return self.annotate(upcoming=models.ExpressionWrapper(
+            models.Q(starts_at__gt=Now()), output_field=models.BooleanField()
+        ))
+    
+    def upcoming(self):
+        """Pending/confirmed bookings that haven't started, soonest first"""
+        return self.filter(
+            starts_at__gt=timezone.now(), status__in=Booking.ACTIVE_STATUSES
+        ).order_by('starts_at', 'id')
+    
+    def overlapping(self, stylist_id, starts_at, ends_at):
+        """Bookings blocking the stylist at any point of [starts_at, ends_at)"""
+        return self.filter(
+            stylist_id=stylist_id,
+            status__in=Booking.BLOCKING_STATUSES,
+            ends_at__gt=starts_at,
+            starts_at__lt=ends_at,
+        )
+    
+    def overlapping_if_lasting(self, duration_minutes):
+        """Bookings that would overlap another booking of their stylist if they lasted duration_minutes"""
+        others = Booking.objects.filter(
+            stylist_id=models.OuterRef('stylist_id'),
+            status__in=Booking.BLOCKING_STATUSES,
+            starts_at__lt=models.OuterRef('new_ends_at'),
+            ends_at__gt=models.OuterRef('starts_at'),
+        ).exclude(pk=models.OuterRef('pk'))
+        return self.filter(stylist__isnull=False, status__in=Booking.BLOCKING_STATUSES).annotate(
+            new_ends_at=models.ExpressionWrapper(
+                models.F('starts_at') + timedelta(minutes=duration_minutes), output_field=models.DateTimeField()
+            )
+        ).filter(models.Exists(others))
+    
+    def refresh_ends_at(self):
+        """Recompute ends_at from the current service durations (after a duration change)"""
+        now = timezone.now()
+        updated = 0
+        services = Service.objects.filter(pk__in=self.order_by().values('service_id').distinct())
+        for service_id, duration in services.values_list('id', 'duration_minutes'):
+            ends_at = models.F('starts_at') + timedelta(minutes=duration)
+            updated += self.filter(service_id=service_id).exclude(ends_at=ends_at).update(
+                ends_at=ends_at, updated_at=now
+            )
+        return updated
+
+
 class Booking(models.Model):
     """Appointment bookings"""
     
@@ -97,6 +234,11 @@ class Booking(models.Model):
         ('cancelled', 'Cancelled'),
     ]
     
+    # Statuses that occupy the stylist's time slot
+    BLOCKING_STATUSES = ['pending', 'confirmed', 'completed']
+    # Statuses that may hold a slot in the future (one booking per stylist slot)
+    ACTIVE_STATUSES = ['pending', 'confirmed']
+    
     # Customer information
     fullname = models.CharField(max_length=100)
     phone = models.CharField(
@@ -104,6 +246,8 @@ class Booking(models.Model):
         validators=[RegexValidator(r'^\+?[0-9]{7,}$', 'Enter a valid phone number')]
     )
     email = models.EmailField(blank=True, null=True)
+    # E.164 form of phone, for lookups whichever way the number was typed
+    phone_key = PhoneKeyField(source='phone', max_length=16, default='', editable=False)
     
     # Appointment details
     service = models.ForeignKey(Service, on_delete=models.PROTECT, related_name='bookings')
@@ -112,6 +256,10 @@ class Booking(models.Model):
     time = models.TimeField()
     notes = models.TextField(blank=True)
     
+    # Aware start/end, derived from date, time and the service duration on save
+    starts_at = models.DateTimeField(editable=False)
+    ends_at = models.DateTimeField(editable=False)
+    
     # Status
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     send_email = models.BooleanField(default=True)
@@ -122,46 +270,94 @@ class Booking(models.Model):
     confirmed_at = models.DateTimeField(blank=True, null=True)
     completed_at = models.DateTimeField(blank=True, null=True)
     
+    objects = BookingQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-date', '-time']
         indexes = [
             models.Index(fields=['date', 'time']),
-            models.Index(fields=['status']),
-            models.Index(fields=['phone']),
+            # Status filters (admin, exports) with date ranges and date/time ordering
+            models.Index(fields=['status', 'date', 'time'], name='booking_status_date_time'),
+            # Customer history by phone, newest first; covers the history rows
+            # (rowid/id is implicit on SQLite) so they're read from the index alone
+            models.Index(
+                fields=['phone_key', 'starts_at', 'id', 'status', 'service', 'stylist'],
+                name='booking_phone_key_history',
+            ),
+            # Stylist occupancy (availability, double-booking checks). Not partial:
+            # SQLite can't match a partial index against bound IN (...) parameters
+            models.Index(fields=['stylist', 'date', 'status'], name='booking_stylist_date_status'),
+            # Upcoming bookings (ACTIVE_STATUSES) in start order without a sort
+            # (PostgreSQL; SQLite falls back to booking_status_date_time)
+            models.Index(
+                fields=['starts_at'],
+                condition=models.Q(status__in=['pending', 'confirmed']),
+                name='booking_upcoming',
+            ),
+            # Overlap checks: a stylist's bookings ending after a given start
+            models.Index(fields=['stylist', 'ends_at', 'starts_at'], name='booking_stylist_ends_starts'),
+            # ?ordering=created_at / -created_at
+            models.Index(fields=['created_at', 'id'], name='booking_created_id'),
+            # Incremental changes feed, keyset on (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='booking_updated_id'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['stylist', 'date', 'time'],
+                condition=models.Q(status__in=['pending', 'confirmed']),
+                name='unique_active_booking_slot',
+            ),
         ]
     
     def __str__(self):
         return f"{self.fullname} - {self.service.name} on {self.date} at {self.time}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded status so signals can tell status transitions apart"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        # What the customer aggregates were last computed from (see customers.py)
+        instance._loaded_customer = tuple(instance.__dict__.get(name) for name in ('phone_key', 'service_id', 'starts_at'))
+        return instance
+    
+    def save(self, *args, **kwargs):
+        self.set_times()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'date', 'time', 'service'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'starts_at', 'ends_at'}
+        if update_fields is not None and 'phone' in update_fields:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'phone_key'}
+        super().save(*args, **kwargs)
+    
+    def set_times(self):
+        """Derive starts_at/ends_at from date, time and the service duration"""
+        date = self._meta.get_field('date').to_python(self.date)
+        time = self._meta.get_field('time').to_python(self.time)
+        self.starts_at = booking_start(date, time)
+        self.ends_at = self.starts_at + timedelta(minutes=self.service.duration_minutes)
+    
     def is_upcoming(self):
         """Check if booking is in the future"""
-        from datetime import datetime
-        appointment_datetime = datetime.combine(self.date, self.time)
-        return appointment_datetime > datetime.now()
+        return self.starts_at > timezone.now()
     
     def is_overdue(self):
         """Check if booking time has passed"""
-        from datetime import datetime
-        appointment_datetime = datetime.combine(self.date, self.time)
-        return appointment_datetime < datetime.now() and self.status != 'completed'
+        return self.starts_at < timezone.now() and self.status != 'completed'
     
     def can_be_cancelled(self):
         """Check if booking can be cancelled (24 hours before appointment)"""
-        from datetime import datetime, timedelta
-        appointment_datetime = datetime.combine(self.date, self.time)
-        return (appointment_datetime - datetime.now()).days >= 1
+        return self.starts_at - timezone.now() >= timedelta(days=1)
     
     def send_confirmation_email(self):
-        """Send booking confirmation email"""
-        from django.core.mail import send_mail
-        from django.template.loader import render_to_string
+        """Queue booking confirmation email"""
+        from .emails import queue_email
         
         if not self.send_email or not self.email:
             return False
         
-        try:
-            subject = f"Booking Confirmation - {self.service.name}"
-            message = f"""
+        subject = f"Booking Confirmation - {self.service.name}"
+        message = f"""
             Hello {self.fullname},
             
             Your appointment has been confirmed!
@@ -178,18 +374,25 @@ class Booking(models.Model):
             
             Thank you for booking with us!
             """
-            
-            send_mail(
-                subject,
-                message,
-                'noreply@salon.com',
-                [self.email],
-                fail_silently=False,
-            )
-            return True
-        except Exception as e:
-            print(f"Error sending email: {e}")
-            return False
+        
+        queue_email(subject, message, [self.email])
+        return True
+
+
+class BookingTombstone(models.Model):
+    """Deleted bookings, kept for a while so changes feed clients can drop them"""
+    
+    booking_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_id'),
+        ]
+    
+    def __str__(self):
+        return f"Booking #{self.booking_id} deleted at {self.deleted_at}"
 
 
 # ==================== CONTACT MESSAGE MODEL ====================
@@ -240,11 +443,36 @@ class SalonSettings(models.Model):
     def __str__(self):
         return self.salon_name
     
+    CACHE_KEY = 'salon:settings'
+    _local_cache = {'value': None, 'expires_at': 0}
+    
     @classmethod
     def get_settings(cls):
-        """Get or create salon settings"""
-        settings, created = cls.objects.get_or_create(pk=1)
+        """Get or create salon settings (process-local, then shared cache)"""
+        import time
+        from django.conf import settings as django_settings
+        from django.core.cache import cache
+        
+        local = cls._local_cache
+        if local['value'] is not None and local['expires_at'] > time.monotonic():
+            return local['value']
+        
+        settings = cache.get(cls.CACHE_KEY)
+        if settings is None:
+            settings, created = cls.objects.get_or_create(pk=1)
+            cache.set(cls.CACHE_KEY, settings, getattr(django_settings, 'SALON_SETTINGS_CACHE_SECONDS', 3600))
+        
+        local['value'] = settings
+        local['expires_at'] = time.monotonic() + getattr(django_settings, 'SALON_SETTINGS_LOCAL_SECONDS', 5)
         return settings
+    
+    @classmethod
+    def clear_cache(cls):
+        """Drop cached settings (called when settings are saved)"""
+        from django.core.cache import cache
+        
+        cls._local_cache['value'] = None
+        cache.delete(cls.CACHE_KEY)
 
 
 # ==================== REVIEW/TESTIMONIAL MODEL ====================
@@ -261,9 +489,123 @@ class Review(models.Model):
     photo = models.ImageField(upload_to='reviews/', blank=True, null=True)
     is_approved = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Public list: approved reviews, newest first. Django renders the
+            # condition without parameters, so SQLite can use it as well
+            models.Index(fields=['created_at'], condition=models.Q(is_approved=True), name='review_approved_created'),
+        ]
     
     def __str__(self):
         return f"{self.client_name} - {self.rating} stars"
+
+
+# ==================== EMAIL OUTBOX MODEL ====================
+class EmailOutbox(models.Model):
+    """Outgoing emails, persisted in the request and delivered by a worker"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        verbose_name_plural = "Email Outbox"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+
+
+# ==================== SEARCH INDEX MODEL ====================
+class SearchEntry(models.Model):
+    """
+    One row per searchable object (booking, contact message, review), kept
+    in sync by signals. The full-text index over `text` is vendor specific
+    and created by migration 0011: a generated tsvector column with a GIN
+    index on PostgreSQL, an FTS5 table on SQLite (see salon_app/search.py).
+    """
+    
+    KIND_CHOICES = [
+        ('booking', 'Booking'),
+        ('contact', 'Contact message'),
+        ('review', 'Review'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=255)
+    text = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = "Search Entries"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_entry'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {self.title}"
+
+
+# ==================== CUSTOMER MODEL ====================
+class Customer(models.Model):
+    """
+    Per-customer booking aggregates, keyed by normalized phone. Kept up to
+    date by booking signals (see salon_app/customers.py); rebuild with
+    `python manage.py rebuild_customers` after writes that skip signals.
+    """
+    
+    phone_key = PhoneKeyField(source=None, max_length=16, unique=True)
+    # From the customer's latest booking
+    name = models.CharField(max_length=100)
+    email = models.EmailField(blank=True, null=True)
+    
+    booking_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    cancelled_count = models.PositiveIntegerField(default=0)
+    # Service prices of completed bookings
+    total_spent = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    first_booking_at = models.DateTimeField(blank=True, null=True)
+    last_booking_at = models.DateTimeField(blank=True, null=True)
+    last_visit_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-last_booking_at', '-id']
+        verbose_name_plural = "Customers"
+        indexes = [
+            # ?ordering=-total_spent / -last_booking_at keyset pages
+            models.Index(fields=['total_spent', 'id'], name='customer_spent_id'),
+            models.Index(fields=['last_booking_at', 'id'], name='customer_last_booking_id'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.phone_key})"
+    
+    @property
+    def cancellation_rate(self):
+        return round(self.cancelled_count / self.booking_count, 3) if self.booking_count else 0.0
@@ -0,0 +1,206 @@
+import base64
+import json
+from functools import reduce
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# ==================== KEYSET PAGINATION ====================
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a unique composite ordering.
+    Each page is a range scan starting after the last row of the previous
+    page, so latency stays flat however deep the client pages. NULLs in a
+    nullable ordering field sort last (first when paging backwards).
+    """
+    ordering = ('-id',)
+    # Optional {?ordering= value: keyset ordering}; each must end in a unique field
+    orderings = None
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    ordering_query_param = 'ordering'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE or 50
+        max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 200)
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, page_size))
+        except ValueError:
+            raise ParseError({'error': f'{self.page_size_query_param} must be a number'})
+        return max(1, min(page_size, max_page_size))
+
+    def get_ordering(self, request):
+        requested = request.query_params.get(self.ordering_query_param)
+        if not self.orderings or not requested:
+            return self.ordering
+        if requested not in self.orderings:
+            raise ParseError({'error': f'ordering must be one of: {", ".join(self.orderings)}'})
+        return self.orderings[requested]
+
+    def encode_cursor(self, direction, position):
+        data = json.dumps({'d': direction, 'p': position}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        """(direction, position) with each value converted by its ordering field; NotFound if tampered"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            direction, position = data['d'], data['p']
+            if direction not in ('n', 'p') or not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                None if value is None else field.to_python(value)
+                for field, value in zip(self.fields, position)
+            ]
+            if any(value is None and not field.null for field, value in zip(self.fields, position)):
+                raise ValueError
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return direction, position
+
+    def get_position(self, item):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = item[name] if isinstance(item, dict) else getattr(item, name)
+            if value is not None:
+                value = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+            position.append(value)
+        return position
+
+    def order_by(self, reverse):
+        ordering = []
+        for field, model_field in zip(self.ordering, self.fields):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            if model_field.null:
+                expression = F(name).desc if descending else F(name).asc
+                ordering.append(expression(nulls_first=True) if reverse else expression(nulls_last=True))
+            else:
+                ordering.append(f'-{name}' if descending else name)
+        return ordering
+
+    def keyset_filter(self, position, reverse):
+        """Rows strictly after `position` in ordering (before it when reverse)"""
+        conditions = []
+        for index, (field, model_field) in enumerate(zip(self.ordering, self.fields)):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            equal = Q(*[
+                Q(**{f'{f.lstrip("-")}__isnull': True}) if value is None else Q(**{f.lstrip('-'): value})
+                for f, value in zip(self.ordering[:index], position)
+            ])
+            value = position[index]
+            if value is None:
+                # NULLs come last: nothing after them, every non-NULL before them
+                if not reverse:
+                    continue
+                beyond = Q(**{f'{name}__isnull': False})
+            else:
+                beyond = Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+                if model_field.null and not reverse:
+                    beyond |= Q(**{f'{name}__isnull': True})
+            conditions.append(equal & beyond)
+        return reduce(lambda a, b: a | b, conditions)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        self.fields = [queryset.model._meta.get_field(field.lstrip('-')) for field in self.ordering]
+        direction, position = self.decode_cursor(request)
+        reverse = direction == 'p'
+
+        queryset = queryset.order_by(*self.order_by(reverse))
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(position, reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = position is not None if not reverse else has_more
+        self.first_position = self.get_position(results[0]) if results else position
+        self.last_position = self.get_position(results[-1]) if results else position
+        return results
+
+    def get_link(self, direction, position):
+        url = self.request.build_absolute_uri()
+        if position is None:
+            return remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(direction, position))
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.get_link('n', self.last_position)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.get_link('p', self.first_position)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class BookingPagination(KeysetPagination):
+    ordering = ('-date', '-time', '-id')
+    orderings = {
+        '-date': ('-date', '-time', '-id'),
+        'date': ('date', 'time', 'id'),
+        '-created_at': ('-created_at', '-id'),
+        'created_at': ('created_at', 'id'),
+    }
+
+
+class CustomerHistoryPagination(KeysetPagination):
+    ordering = ('-starts_at', '-id')
+
+
+class CustomerPagination(KeysetPagination):
+    ordering = ('-last_booking_at', '-id')
+    orderings = {
+        '-last_booking_at': ('-last_booking_at', '-id'),
+        '-total_spent': ('-total_spent', '-id'),
+    }
+
+
+class CreatedAtPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class ServicePagination(KeysetPagination):
+    ordering = ('category', 'name', 'id')
+
+
+class StylistPagination(KeysetPagination):
+    ordering = ('name', 'id')
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import Booking, Stylist, booking_start
+
+
+class SlotTaken(Exception):
+    """The stylist already has a booking overlapping the slot"""
+
+
+# ==================== SLOT LOCKING ====================
+def lock_stylist_schedule(stylist_id, date):
+    """
+    Serialize bookings for a stylist and day until the current transaction ends.
+    Must be called inside transaction.atomic().
+    """
+    if connection.vendor == 'postgresql':
+        # Transaction-scoped advisory lock keyed on (stylist, day)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [int(stylist_id), date.toordinal()])
+    elif connection.vendor == 'sqlite':
+        # SQLite has a single writer: take the write lock before reading so a
+        # concurrent booking waits for this transaction instead of reading stale rows
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'UPDATE %s SET id = id WHERE id = %%s' % connection.ops.quote_name(Stylist._meta.db_table),
+                [stylist_id]
+            )
+    else:
+        list(Stylist.objects.select_for_update().filter(pk=stylist_id).values_list('pk'))
+
+
+def is_slot_taken(stylist_id, date, time, duration_minutes, exclude_booking_id=None):
+    """Check if a booking at date/time overlaps an existing booking of the stylist (one indexed query)"""
+    starts_at = booking_start(date, time)
+    bookings = Booking.objects.overlapping(stylist_id, starts_at, starts_at + timedelta(minutes=duration_minutes))
+    if exclude_booking_id:
+        bookings = bookings.exclude(pk=exclude_booking_id)
+    return bookings.exists()
+
+
+# ==================== STATUS TRANSITIONS ====================
+def confirm_booking(booking):
+    """
+    Confirm a booking under the stylist's schedule lock. A cancelled booking
+    gave up its slot, which may have been re-booked since, so the overlap is
+    checked again. Raises SlotTaken (the booking is left unchanged).
+    """
+    previous = booking.status, booking.confirmed_at
+    try:
+        with transaction.atomic():
+            if booking.stylist_id:
+                lock_stylist_schedule(booking.stylist_id, booking.date)
+                if is_slot_taken(booking.stylist_id, booking.date, booking.time,
+                                 booking.service.duration_minutes, exclude_booking_id=booking.pk):
+                    raise SlotTaken
+            booking.status = 'confirmed'
+            booking.confirmed_at = timezone.now()
+            booking.save()
+    except (SlotTaken, IntegrityError):
+        booking.status, booking.confirmed_at = previous
+        raise SlotTaken
@@ -0,0 +1,159 @@
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Booking, ContactMessage, Review, SearchEntry, normalize_phone
+
+
+FTS_TABLE = 'salon_app_searchentry_fts'
+MAX_TERMS = 8
+WORD_RE = re.compile(r'\w+')
+
+
+# ==================== SOURCES ====================
+def phone_variants(phone):
+    """
+    International and local forms of a phone number however it was stored
+    ('0712...', '+254 712...', '254712...' -> 254712..., 0712...).
+    """
+    digits = ''.join(WORD_RE.findall(phone or ''))
+    key = normalize_phone(phone)
+    if not key:
+        return [digits]
+    variants = {digits, key[1:]}
+    country_code = getattr(settings, 'PHONE_COUNTRY_CODE', '254')
+    if key[1:].startswith(country_code):
+        variants.add('0' + key[1 + len(country_code):])
+    return sorted(variants)
+
+
+def booking_entry(row):
+    title = f"{row['fullname']} - {row['service__name']} on {row['date']} at {row['time']:%H:%M}"
+    return title, [row['fullname'], *phone_variants(row['phone']), row['email'], row['notes']]
+
+
+def contact_entry(row):
+    title = f"{row['name']} - {row['subject']}"
+    return title, [row['name'], row['email'], row['subject'], row['message']]
+
+
+def review_entry(row):
+    title = f"{row['client_name']} - {row['rating']} stars: {row['title']}"
+    return title, [row['client_name'], row['title'], row['comment']]
+
+
+# kind -> (model name, fields read with .values(), row -> (title, text parts))
+SEARCH_SOURCES = {
+    'booking': ('Booking', ['id', 'fullname', 'phone', 'email', 'notes', 'service__name', 'date', 'time'], booking_entry),
+    'contact': ('ContactMessage', ['id', 'name', 'email', 'subject', 'message'], contact_entry),
+    'review': ('Review', ['id', 'client_name', 'rating', 'title', 'comment'], review_entry),
+}
+SEARCH_MODELS = {'Booking': Booking, 'ContactMessage': ContactMessage, 'Review': Review}
+SEARCH_KINDS = {Booking: 'booking', ContactMessage: 'contact', Review: 'review'}
+
+
+def normalize(parts):
+    """
+    Lowercase words separated by single spaces. Punctuation (@ . + -) is
+    dropped so PostgreSQL's parser and SQLite's tokenizer split alike.
+    """
+    return ' '.join(WORD_RE.findall(' '.join(part for part in parts if part).lower()))
+
+
+def build_entries(kind, rows):
+    build = SEARCH_SOURCES[kind][2]
+    entries = []
+    for row in rows:
+        title, parts = build(row)
+        entries.append(SearchEntry(kind=kind, object_id=row['id'], title=title[:255], text=normalize(parts)))
+    return entries
+
+
+# ==================== INDEXING ====================
+def index_objects(kind, ids):
+    """(Re)index objects of one kind by id, removing entries for ids that no longer exist"""
+    model_name, fields, build = SEARCH_SOURCES[kind]
+    ids = list(ids)
+    rows = SEARCH_MODELS[model_name].objects.filter(pk__in=ids).values(*fields)
+    with transaction.atomic():
+        SearchEntry.objects.filter(kind=kind, object_id__in=ids).delete()
+        SearchEntry.objects.bulk_create(build_entries(kind, rows))
+
+
+def remove_objects(kind, ids):
+    SearchEntry.objects.filter(kind=kind, object_id__in=list(ids)).delete()
+
+
+def rebuild_index(kinds=None, chunk_size=2000, progress=None):
+    """Rebuild entries from scratch, chunk by chunk in id order"""
+    total = 0
+    for kind in kinds or SEARCH_SOURCES:
+        model_name, fields, build = SEARCH_SOURCES[kind]
+        model = SEARCH_MODELS[model_name]
+        SearchEntry.objects.filter(kind=kind).delete()
+        last_id, done = 0, 0
+        while True:
+            rows = list(model.objects.filter(pk__gt=last_id).order_by('pk').values(*fields)[:chunk_size])
+            if not rows:
+                break
+            with transaction.atomic():
+                SearchEntry.objects.bulk_create(build_entries(kind, rows), batch_size=500)
+            last_id = rows[-1]['id']
+            done += len(rows)
+            if progress:
+                progress(kind, done)
+        total += done
+    return total
+
+
+# ==================== QUERYING ====================
+def search_terms(query):
+    return WORD_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def match_ids(terms, kinds=None, limit=20):
+    """Entry ids matching every term as a prefix, best match first"""
+    kinds = list(kinds or SEARCH_SOURCES)
+    placeholders = ', '.join(['%s'] * len(kinds))
+    table = SearchEntry._meta.db_table
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        sql = (
+            f"SELECT id FROM {table} WHERE vector @@ to_tsquery('simple', %s) AND kind IN ({placeholders}) "
+            f"ORDER BY ts_rank(vector, to_tsquery('simple', %s)) DESC, id DESC LIMIT %s"
+        )
+        params = [tsquery, *kinds, tsquery, limit]
+    elif connection.vendor == 'sqlite':
+        match = ' AND '.join(f'"{term}"*' for term in terms)
+        sql = (
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND kind IN ({placeholders}) "
+            f"ORDER BY rank LIMIT %s"
+        )
+        params = [match, *kinds, limit]
+    else:
+        # No full-text index: substring scan of the single entries table
+        queryset = SearchEntry.objects.filter(kind__in=kinds)
+        for term in terms:
+            queryset = queryset.filter(text__icontains=term)
+        return list(queryset.order_by('-id').values_list('id', flat=True)[:limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search(query, kinds=None, limit=20):
+    """SearchEntry objects for a free-text query, best match first"""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    ids = match_ids(terms, kinds, limit)
+    entries = SearchEntry.objects.in_bulk(ids)
+    return [entries[pk] for pk in ids if pk in entries]
+
+
+def search_object_ids(kind, query, limit=1000):
+    """Ids of matching objects of one kind (for admin changelists)"""
+    return [entry.object_id for entry in search(query, [kind], limit)]
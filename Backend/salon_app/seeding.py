@@ -0,0 +1,253 @@
+import itertools
+import random
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import bump_model_version
+from .models import Booking, Review, Service, Stylist, booking_start
+
+
+# Seeded stylists use this email domain so re-runs can continue numbering
+SEED_EMAIL_DOMAIN = 'seed.smsalon.test'
+
+FIRST_NAMES = [
+    'Amina', 'Wanjiru', 'Akinyi', 'Njeri', 'Zawadi', 'Fatuma', 'Nekesa', 'Chebet',
+    'Brian', 'Kevin', 'Otieno', 'Kamau', 'Mwangi', 'Baraka', 'Juma', 'Kiprono',
+]
+LAST_NAMES = [
+    'Wambui', 'Ochieng', 'Mutua', 'Kariuki', 'Odhiambo', 'Njoroge', 'Wekesa', 'Kiptoo',
+    'Achieng', 'Muthoni', 'Omondi', 'Cherono', 'Kilonzo', 'Nyambura', 'Were', 'Koech',
+]
+SERVICE_NAMES = {
+    'hair': ['Haircut', 'Blow Dry', 'Colour', 'Treatment', 'Relaxer', 'Silk Press'],
+    'nails': ['Manicure', 'Pedicure', 'Gel Polish', 'Acrylics', 'Nail Art'],
+    'makeup': ['Day Makeup', 'Bridal Makeup', 'Evening Glam', 'Brows', 'Lashes'],
+    'braiding': ['Box Braids', 'Cornrows', 'Knotless Braids', 'Weave', 'Locs Retwist'],
+}
+SERVICE_DURATIONS = [30, 45, 60, 90, 120]
+REVIEW_TITLES = ['Loved it', 'Great service', 'Will come back', 'Okay', 'Not bad', 'Amazing stylist']
+
+
+# ==================== DISTRIBUTIONS ====================
+class Distribution:
+    """How generated bookings are spread over stylists, customers, days, hours and statuses"""
+
+    def __init__(self, days_back=180, days_ahead=60, stylist_skew=0.8, customer_skew=1.1,
+                 past_statuses=None, future_statuses=None, weekday_weights=None, hour_weights=None):
+        self.days_back = days_back
+        self.days_ahead = days_ahead
+        # Zipf exponents: 0 spreads bookings evenly, higher values favour a few popular stylists/customers
+        self.stylist_skew = stylist_skew
+        self.customer_skew = customer_skew
+        self.past_statuses = past_statuses or {'completed': 85, 'cancelled': 15}
+        self.future_statuses = future_statuses or {'pending': 45, 'confirmed': 45, 'cancelled': 10}
+        # Monday..Sunday, busiest towards the weekend
+        self.weekday_weights = weekday_weights or [6, 7, 8, 9, 14, 18, 8]
+        # Start hour -> weight, with lunchtime and after-work peaks
+        self.hour_weights = hour_weights or {
+            9: 4, 10: 6, 11: 8, 12: 9, 13: 8, 14: 6, 15: 6, 16: 7, 17: 9, 18: 8, 19: 4,
+        }
+
+
+def zipf_cum_weights(count, skew):
+    """Cumulative weights where item n has weight 1 / (n + 1) ** skew"""
+    return list(itertools.accumulate(1 / (rank + 1) ** skew for rank in range(count)))
+
+
+# ==================== SEEDER ====================
+class Seeder:
+    """
+    Deterministic synthetic data for load and benchmark runs. Rows are built
+    in memory and written with bulk_create in batches.
+    """
+
+    def __init__(self, seed=42, batch_size=5000, progress=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.progress = progress
+
+    def report(self, label, done, total):
+        if self.progress:
+            self.progress(label, done, total)
+
+    def bulk_create(self, model, rows, label, total=None, keep=False):
+        """
+        Insert rows from an iterable in batches, reporting progress. Returns the
+        created objects when keep is set, otherwise just the number of rows.
+        """
+        created, batch, count = [], [], 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                count += self.write(model, batch, created if keep else None)
+                self.report(label, count, total)
+                batch = []
+        if batch:
+            count += self.write(model, batch, created if keep else None)
+            self.report(label, count, total)
+        # bulk_create skips the post_save signals that invalidate cached data
+        bump_model_version(model._meta.auto_created or model)
+        return created if keep else count
+
+    def write(self, model, batch, created=None):
+        with transaction.atomic():
+            objects = model.objects.bulk_create(batch, batch_size=self.batch_size)
+        if created is not None:
+            created.extend(objects)
+        return len(objects)
+
+    def person_name(self):
+        return f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}'
+
+    def phone(self):
+        return f'+2547{self.rng.randrange(10 ** 8):08d}'
+
+    # ---------- catalog ----------
+    def create_services(self, count):
+        categories = list(SERVICE_NAMES)
+
+        def rows():
+            for index in range(count):
+                category = categories[index % len(categories)]
+                base = SERVICE_NAMES[category][(index // len(categories)) % len(SERVICE_NAMES[category])]
+                yield Service(
+                    name=base if index < 22 else f'{base} {index}',
+                    category=category,
+                    description=f'{base} ({category})',
+                    price=Decimal(self.rng.randrange(500, 12000, 50)),
+                    duration_minutes=self.rng.choice(SERVICE_DURATIONS),
+                )
+
+        return self.bulk_create(Service, rows(), 'services', count, keep=True)
+
+    def create_stylists(self, count, services, services_per_stylist=(2, 6)):
+        offset = Stylist.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}').count()
+        specializations = [code for code, label in Stylist.SPECIALIZATION_CHOICES]
+
+        def rows():
+            for index in range(offset, offset + count):
+                yield Stylist(
+                    name=self.person_name(),
+                    email=f'stylist{index}@{SEED_EMAIL_DOMAIN}',
+                    phone=self.phone(),
+                    specialization=self.rng.choice(specializations),
+                )
+
+        stylists = self.bulk_create(Stylist, rows(), 'stylists', count, keep=True)
+
+        low, high = services_per_stylist
+        Through = Stylist.available_services.through
+
+        def links():
+            for stylist in stylists:
+                offered = self.rng.sample(services, min(len(services), self.rng.randint(low, high)))
+                for service in offered:
+                    yield Through(stylist_id=stylist.pk, service_id=service.pk)
+
+        self.bulk_create(Through, links(), 'stylist services')
+        return stylists
+
+    # ---------- bookings ----------
+    def create_customers(self, count):
+        """Pool of (name, phone) pairs so customers come back for several bookings"""
+        return [(self.person_name(), self.phone()) for _ in range(count)]
+
+    def create_bookings(self, count, stylists, distribution=None, customers=None):
+        """
+        Bookings spread over [today - days_back, today + days_ahead] following
+        the Distribution. Active (pending/confirmed) bookings of a stylist never
+        overlap, matching the database constraints; collisions become
+        cancellations.
+        """
+        distribution = distribution or Distribution()
+        today = timezone.localdate()
+        offered = {}
+        links = Stylist.available_services.through.objects.filter(stylist_id__in=[s.pk for s in stylists])
+        for stylist_id, service_id in links.order_by('stylist_id', 'service_id').values_list('stylist_id', 'service_id'):
+            offered.setdefault(stylist_id, []).append(service_id)
+        stylist_ids = sorted(offered)
+        if not stylist_ids:
+            return 0
+        durations = dict(Service.objects.filter(pk__in={pk for ids in offered.values() for pk in ids})
+                         .values_list('id', 'duration_minutes'))
+        # Popularity order is random, not by id
+        self.rng.shuffle(stylist_ids)
+
+        customers = customers or self.create_customers(max(1, count // 4))
+        stylist_weights = zipf_cum_weights(len(stylist_ids), distribution.stylist_skew)
+        customer_weights = zipf_cum_weights(len(customers), distribution.customer_skew)
+        days = [today + timedelta(days=offset) for offset in range(-distribution.days_back, distribution.days_ahead + 1)]
+        day_weights = list(itertools.accumulate(distribution.weekday_weights[day.weekday()] for day in days))
+        hours = list(distribution.hour_weights)
+        hour_weights = list(itertools.accumulate(distribution.hour_weights.values()))
+        past_statuses, past_weights = zip(*distribution.past_statuses.items())
+        future_statuses, future_weights = zip(*distribution.future_statuses.items())
+
+        # (stylist, day, hour) cells held by active bookings
+        taken = set()
+        for stylist_id, day, start, starts_at, ends_at in Booking.objects.filter(
+            stylist_id__in=stylist_ids, status__in=Booking.ACTIVE_STATUSES, date__gte=days[0]
+        ).values_list('stylist_id', 'date', 'time', 'starts_at', 'ends_at'):
+            end_minute = start.hour * 60 + start.minute + (ends_at - starts_at) // timedelta(minutes=1)
+            taken.update((stylist_id, day, hour) for hour in range(start.hour, -(-end_minute // 60)))
+        slot_times = {hour: time(hour) for hour in hours}
+        starts = {}
+        choices = self.rng.choices
+
+        def rows():
+            for _ in range(count):
+                stylist_id = choices(stylist_ids, cum_weights=stylist_weights)[0]
+                service_id = self.rng.choice(offered[stylist_id])
+                day = choices(days, cum_weights=day_weights)[0]
+                hour = choices(hours, cum_weights=hour_weights)[0]
+                if day < today:
+                    status = choices(past_statuses, weights=past_weights)[0]
+                else:
+                    status = choices(future_statuses, weights=future_weights)[0]
+                if status in Booking.ACTIVE_STATUSES:
+                    cells = [(stylist_id, day, cell) for cell in range(hour, hour + -(-durations[service_id] // 60))]
+                    if taken.isdisjoint(cells):
+                        taken.update(cells)
+                    else:
+                        status = 'cancelled'
+                starts_at = starts.get((day, hour))
+                if starts_at is None:
+                    starts_at = starts[(day, hour)] = booking_start(day, slot_times[hour])
+                fullname, phone = choices(customers, cum_weights=customer_weights)[0]
+                yield Booking(
+                    fullname=fullname,
+                    phone=phone,
+                    service_id=service_id,
+                    stylist_id=stylist_id,
+                    date=day,
+                    time=slot_times[hour],
+                    starts_at=starts_at,
+                    ends_at=starts_at + timedelta(minutes=durations[service_id]),
+                    status=status,
+                    send_email=False,
+                )
+
+        return self.bulk_create(Booking, rows(), 'bookings', count)
+
+    def create_reviews(self, count):
+        """Reviews for completed bookings that don't have one yet"""
+        booking_ids = list(
+            Booking.objects.filter(status='completed', review__isnull=True)
+            .order_by('id').values_list('id', 'fullname')[:count]
+        )
+
+        def rows():
+            for booking_id, fullname in booking_ids:
+                yield Review(
+                    booking_id=booking_id,
+                    client_name=fullname,
+                    rating=self.rng.choices([1, 2, 3, 4, 5], weights=[3, 5, 12, 35, 45])[0],
+                    title=self.rng.choice(REVIEW_TITLES),
+                    comment='Seeded review',
+                    is_approved=self.rng.random() < 0.8,
+                )
+
+        return self.bulk_create(Review, rows(), 'reviews', len(booking_ids))
@@ -1,11 +1,29 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Service, Stylist, Booking, ContactMessage, Review, SalonSettings
+from .models import Service, Stylist, Booking, Customer, ContactMessage, Review, SalonSettings, booking_start, normalize_phone
+from .scheduling import lock_stylist_schedule, is_slot_taken
+from .emails import queue_email
+from .instrumentation import TimedListSerializer
+
+
+SLOT_TAKEN_ERROR = 'This time slot is no longer available for the selected stylist'
 
 # ==================== SERVICE SERIALIZER ====================
 class ServiceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Service
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'category', 'description', 'price', 'duration_minutes', 'is_active']
+    
+    def validate_duration_minutes(self, value):
+        if self.instance is not None:
+            try:
+                self.instance.check_duration_change(value)
+            except DjangoValidationError as e:
+                raise serializers.ValidationError(e.message_dict['duration_minutes'])
+        return value
 
 
 # ==================== STYLIST SERIALIZER ====================
@@ -14,6 +32,7 @@ class StylistSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Stylist
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'email', 'phone', 'specialization', 'bio', 'photo', 'available_services', 'is_active']
 
 
@@ -34,27 +53,34 @@ class BookingCreateSerializer(serializers.ModelSerializer):
         return value
     
     def validate_phone(self, value):
-        """Validate phone number format"""
-        import re
-        if not re.match(r'^\+?[0-9]{7,}$', value.replace(' ', '')):
+        """Validate phone number format (phone_key holds the normalized form)"""
+        if not normalize_phone(value):
             raise serializers.ValidationError("Invalid phone number format")
         return value
     
     def validate(self, data):
         """Validate date and time combination"""
-        from datetime import datetime
-        appointment_datetime = datetime.combine(data['date'], data['time'])
-        if appointment_datetime < datetime.now():
+        if booking_start(data['date'], data['time']) < timezone.now():
             raise serializers.ValidationError(
                 "Booking time must be in the future"
             )
         return data
     
     def create(self, validated_data):
-        """Create booking with pending status"""
-        booking = Booking.objects.create(**validated_data)
-        booking.status = 'pending'
-        booking.save()
+        """Create booking with pending status, rejecting overlapping slots"""
+        stylist = validated_data.get('stylist')
+        
+        try:
+            with transaction.atomic():
+                if stylist is not None:
+                    lock_stylist_schedule(stylist.pk, validated_data['date'])
+                    if is_slot_taken(stylist.pk, validated_data['date'], validated_data['time'],
+                                     validated_data['service'].duration_minutes):
+                        raise serializers.ValidationError({'time': [SLOT_TAKEN_ERROR]})
+                
+                booking = Booking.objects.create(status='pending', **validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({'time': [SLOT_TAKEN_ERROR]})
         
         # Send confirmation email
         if booking.send_email:
@@ -67,16 +93,14 @@ class BookingCreateSerializer(serializers.ModelSerializer):
     
     @staticmethod
     def send_admin_notification(booking):
-        """Send notification to salon admin"""
-        from django.core.mail import send_mail
+        """Queue notification to salon admin"""
         settings = SalonSettings.get_settings()
         
         if not settings.admin_notification_enabled:
             return
         
-        try:
-            subject = f"New Booking - {booking.service.name}"
-            message = f"""
+        subject = f"New Booking - {booking.service.name}"
+        message = f"""
             New booking received!
             
             Client: {booking.fullname}
@@ -87,16 +111,8 @@ class BookingCreateSerializer(serializers.ModelSerializer):
             Time: {booking.time}
             Notes: {booking.notes or 'None'}
             """
-            
-            send_mail(
-                subject,
-                message,
-                'noreply@salon.com',
-                [settings.email],
-                fail_silently=True,
-            )
-        except Exception as e:
-            print(f"Error sending admin notification: {e}")
+        
+        queue_email(subject, message, [settings.email])
 
 
 class BookingListSerializer(serializers.ModelSerializer):
@@ -108,6 +124,7 @@ class BookingListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Booking
+        list_serializer_class = TimedListSerializer
         fields = [
             'id', 'fullname', 'phone', 'email', 'service', 'stylist',
             'service_name', 'stylist_name', 'date', 'time', 'status', 
@@ -116,7 +133,40 @@ class BookingListSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'status']
     
     def get_is_upcoming(self, obj):
-        return obj.is_upcoming()
+        # Computed by the database when the queryset uses with_upcoming()
+        upcoming = getattr(obj, 'upcoming', None)
+        return obj.is_upcoming() if upcoming is None else upcoming
+    
+    def update(self, instance, validated_data):
+        """Update booking, rejecting moves onto an occupied slot"""
+        date = validated_data.get('date', instance.date)
+        time = validated_data.get('time', instance.time)
+        moved = date != instance.date or time != instance.time
+        
+        try:
+            with transaction.atomic():
+                if moved and instance.stylist_id and instance.status in Booking.BLOCKING_STATUSES:
+                    lock_stylist_schedule(instance.stylist_id, date)
+                    if is_slot_taken(instance.stylist_id, date, time, instance.service.duration_minutes,
+                                     exclude_booking_id=instance.pk):
+                        raise serializers.ValidationError({'time': [SLOT_TAKEN_ERROR]})
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({'time': [SLOT_TAKEN_ERROR]})
+
+
+# ==================== CUSTOMER SERIALIZER ====================
+class CustomerSerializer(serializers.ModelSerializer):
+    phone = serializers.CharField(source='phone_key', read_only=True)
+    cancellation_rate = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = Customer
+        list_serializer_class = TimedListSerializer
+        fields = [
+            'phone', 'name', 'email', 'booking_count', 'completed_count', 'cancelled_count',
+            'cancellation_rate', 'total_spent', 'first_booking_at', 'last_booking_at', 'last_visit_at'
+        ]
 
 
 # ==================== CONTACT MESSAGE SERIALIZER ====================
@@ -136,13 +186,11 @@ class ContactMessageSerializer(serializers.ModelSerializer):
     
     @staticmethod
     def send_admin_notification(contact_message):
-        """Send notification to salon admin"""
-        from django.core.mail import send_mail
+        """Queue notification to salon admin"""
         settings = SalonSettings.get_settings()
         
-        try:
-            subject = f"New Message - {contact_message.subject}"
-            message = f"""
+        subject = f"New Message - {contact_message.subject}"
+        message = f"""
             New contact message received!
             
             From: {contact_message.name}
@@ -152,22 +200,15 @@ class ContactMessageSerializer(serializers.ModelSerializer):
             Message:
             {contact_message.message}
             """
-            
-            send_mail(
-                subject,
-                message,
-                'noreply@salon.com',
-                [settings.email],
-                fail_silently=True,
-            )
-        except Exception as e:
-            print(f"Error sending contact notification: {e}")
+        
+        queue_email(subject, message, [settings.email])
 
 
 # ==================== REVIEW SERIALIZER ====================
 class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'booking', 'client_name', 'rating', 'title', 'comment', 'created_at']
         read_only_fields = ['id', 'created_at']
 
@@ -0,0 +1,112 @@
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import bump_model_version
+from .models import Booking, BookingTombstone, ContactMessage, Review, SalonSettings, Service, Stylist
+
+
+CACHED_MODELS = [Service, Stylist, Booking, Review, SalonSettings]
+
+
+# ==================== CACHE INVALIDATION ====================
+def model_changed(sender, **kwargs):
+    """Invalidate cached values built from the written model"""
+    bump_model_version(sender)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(model_changed, sender=model, dispatch_uid=f'cache-{model._meta.label_lower}-save')
+    post_delete.connect(model_changed, sender=model, dispatch_uid=f'cache-{model._meta.label_lower}-delete')
+
+
+# ==================== SALON SETTINGS SIGNALS ====================
+@receiver(post_save, sender=SalonSettings)
+@receiver(post_delete, sender=SalonSettings)
+def salon_settings_changed(sender, instance, **kwargs):
+    """Invalidate the cached settings singleton"""
+    SalonSettings.clear_cache()
+
+
+# ==================== SERVICE SIGNALS ====================
+@receiver(post_save, sender=Service)
+def service_saved(sender, instance, created, **kwargs):
+    """A new duration moves ends_at of the service's upcoming bookings"""
+    if not created:
+        Booking.objects.filter(service=instance, starts_at__gte=timezone.now()).refresh_ends_at()
+
+
+# ==================== BOOKING FEED SIGNALS ====================
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance, **kwargs):
+    """Leave a tombstone so changes feed clients drop the booking"""
+    from .feeds import prune_tombstones
+    BookingTombstone.objects.create(booking_id=instance.pk)
+    prune_tombstones()
+
+
+@receiver(pre_delete, sender=Stylist)
+def stylist_deleted(sender, instance, **kwargs):
+    """SET_NULL on bookings is a queryset update; bump updated_at so the feed sees it"""
+    Booking.objects.filter(stylist=instance).update(updated_at=timezone.now())
+
+
+# ==================== CUSTOMER SIGNALS ====================
+# Connected before booking_saved_event, which resets _loaded_status
+@receiver(post_save, sender=Booking)
+def booking_saved_customer(sender, instance, created, **kwargs):
+    """Apply the booking to its customer's aggregates"""
+    from .customers import booking_saved
+    booking_saved(instance, created)
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted_customer(sender, instance, **kwargs):
+    from .customers import refresh_customers
+    refresh_customers([instance.phone_key])
+
+
+# ==================== BOOKING EVENT SIGNALS ====================
+@receiver(post_save, sender=Booking)
+def booking_saved_event(sender, instance, created, **kwargs):
+    """Push created/confirmed/cancelled/... to live dashboard streams"""
+    from .events import booking_event_type, publish_booking_events
+    publish_booking_events(booking_event_type(instance, created), [instance.pk])
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted_event(sender, instance, **kwargs):
+    from .events import publish_booking_events
+    publish_booking_events('deleted', [instance.pk])
+
+
+# ==================== SEARCH INDEX SIGNALS ====================
+def searchable_saved(sender, instance, **kwargs):
+    """Reindex in the same transaction as the write, so search never sees a rolled back row"""
+    from .search import SEARCH_KINDS, index_objects
+    index_objects(SEARCH_KINDS[sender], [instance.pk])
+
+
+def searchable_deleted(sender, instance, **kwargs):
+    from .search import SEARCH_KINDS, remove_objects
+    remove_objects(SEARCH_KINDS[sender], [instance.pk])
+
+
+for model in (Booking, ContactMessage, Review):
+    post_save.connect(searchable_saved, sender=model, dispatch_uid=f'search-{model._meta.label_lower}-save')
+    post_delete.connect(searchable_deleted, sender=model, dispatch_uid=f'search-{model._meta.label_lower}-delete')
+
+
+# ==================== STYLIST SIGNALS ====================
+@receiver(m2m_changed, sender=Stylist.available_services.through)
+def stylist_services_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Bump updated_at so cached stylist representations are revalidated"""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        stylists = Stylist.objects.filter(available_services=instance) if pk_set is None else Stylist.objects.filter(pk__in=pk_set)
+    else:
+        stylists = Stylist.objects.filter(pk=instance.pk)
+    stylists.update(updated_at=timezone.now())
+    bump_model_version(Stylist)
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .caching import bump_model_version, cached_for_models
+from .models import Booking, Service, Stylist
+
+
+# ==================== BOOKING STATS ====================
+def invalidate_booking_stats():
+    """Drop cached booking aggregates (for bulk updates that skip signals)"""
+    bump_model_version(Booking)
+
+
+def compute_booking_stats(date_from=None, date_to=None):
+    """Booking counts by status, date range, service and stylist"""
+    queryset = Booking.objects.all()
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+
+    now = timezone.now()
+    today = timezone.localdate()
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
+    month_start = today.replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+    status_counts = {
+        code: Count('id', filter=Q(status=code))
+        for code, label in Booking.STATUS_CHOICES
+    }
+    totals = queryset.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=Q(date=today)),
+        this_week=Count('id', filter=Q(date__range=(week_start, week_end))),
+        this_month=Count('id', filter=Q(date__range=(month_start, month_end))),
+        # Not started yet (like Booking.objects.upcoming())
+        upcoming=Count('id', filter=Q(starts_at__gt=now, status__in=Booking.ACTIVE_STATUSES)),
+        **status_counts
+    )
+
+    by_service = (
+        queryset.order_by()
+        .values('service_id', 'service__name')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'service__name')
+    )
+    by_stylist = (
+        queryset.order_by()
+        .values('stylist_id', 'stylist__name')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'stylist__name')
+    )
+
+    return {
+        'total': totals['total'],
+        'by_status': {code: totals[code] for code in status_counts},
+        'by_date_range': {
+            'today': totals['today'],
+            'this_week': totals['this_week'],
+            'this_month': totals['this_month'],
+            'upcoming': totals['upcoming'],
+        },
+        'by_service': [
+            {'service_id': row['service_id'], 'service_name': row['service__name'], 'count': row['count']}
+            for row in by_service
+        ],
+        'by_stylist': [
+            {'stylist_id': row['stylist_id'], 'stylist_name': row['stylist__name'], 'count': row['count']}
+            for row in by_stylist
+        ],
+        'date_from': date_from,
+        'date_to': date_to,
+    }
+
+
+def get_booking_stats(date_from=None, date_to=None):
+    """Cached booking stats, invalidated on booking writes"""
+    return cached_for_models(
+        'booking-stats', [Booking, Service, Stylist],
+        lambda: compute_booking_stats(date_from, date_to),
+        timezone.localdate(), date_from or '', date_to or '',
+        timeout=getattr(settings, 'BOOKING_STATS_CACHE_SECONDS', 60),
+    )
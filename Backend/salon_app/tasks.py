@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from .emails import deliver_outbox
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def deliver_outbox_task(self):
+    """Deliver due outbox emails"""
+    try:
+        return deliver_outbox()
+    except Exception as e:
+        raise self.retry(exc=e)
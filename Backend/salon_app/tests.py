@@ -0,0 +1,497 @@
+import base64
+import json
+import time as clock
+from datetime import time, timedelta
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import F
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+try:
+    import fakeredis
+except ImportError:  # requirements-dev.txt
+    fakeredis = None
+
+from .caching import CACHE_STATS, bump_model_version, cached_for_models, get_model_version, versioned_key
+from .customers import rebuild_customers
+from .events import authenticate_stream, issue_stream_ticket
+from .metrics import get_business_gauges
+from .stats import compute_booking_stats
+from .models import Booking, Customer, Service, Stylist
+
+
+# ==================== QUERY COUNT REGRESSIONS ====================
+class ConstantQueryCountTests(TestCase):
+    """
+    List, detail, upcoming and availability endpoints must load related
+    objects up front: the number of queries may not grow with the rows.
+    """
+
+    def setUp(self):
+        self.services = [
+            Service.objects.create(
+                name=f'Service {i}', category='hair', description='d', price=1000, duration_minutes=60
+            )
+            for i in range(3)
+        ]
+        self.day = timezone.localdate() + timedelta(days=2)
+        self.stylists = []
+        self.bookings = 0
+
+    def add_rows(self, count):
+        """Add `count` stylists (each offering every service) with one upcoming booking each"""
+        for _ in range(count):
+            n = len(self.stylists)
+            stylist = Stylist.objects.create(name=f'Stylist {n}', email=f's{n}@example.com', phone=f'+2547000000{n:02d}')
+            stylist.available_services.set(self.services)
+            self.stylists.append(stylist)
+            Booking.objects.create(
+                fullname=f'Client {n}', phone=f'+2547110000{n:02d}', service=self.services[n % 3],
+                stylist=stylist, date=self.day, time=time(9 + n % 8), send_email=False,
+            )
+
+    def count_queries(self, url, params=None):
+        # Warm per-process caches (salon settings), then miss the shared cache
+        self.client.get(url, params)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(queries)
+
+    def assertConstantQueries(self, url, params=None):
+        self.add_rows(2)
+        few = self.count_queries(url, params)
+        self.add_rows(8)
+        self.assertEqual(self.count_queries(url, params), few, f'{url} queries grow with the number of rows')
+
+    def test_booking_list(self):
+        self.assertConstantQueries('/api/bookings/')
+
+    def test_booking_list_compact(self):
+        self.assertConstantQueries('/api/bookings/', {'compact': 'true'})
+
+    def test_booking_detail(self):
+        self.add_rows(10)
+        first, last = Booking.objects.order_by('id')[0], Booking.objects.order_by('-id')[0]
+        self.assertEqual(
+            self.count_queries(f'/api/bookings/{first.pk}/'), self.count_queries(f'/api/bookings/{last.pk}/')
+        )
+
+    def test_upcoming(self):
+        self.assertConstantQueries('/api/bookings/upcoming/')
+
+    def test_stylist_list(self):
+        self.assertConstantQueries('/api/stylists/')
+
+    def test_availability(self):
+        self.assertConstantQueries('/api/stylists/availability/', {'date': self.day.isoformat(), 'days': 3})
+
+    def test_availability_for_service(self):
+        self.assertConstantQueries(
+            '/api/stylists/availability/',
+            {'service': self.services[0].pk, 'date': self.day.isoformat(), 'days': 3},
+        )
+
+    def test_available_slots(self):
+        self.add_rows(1)
+        self.assertConstantQueries(
+            f'/api/stylists/{self.stylists[0].pk}/available_slots/',
+            {'date': self.day.isoformat(), 'service': self.services[0].pk},
+        )
+
+
+# ==================== AVAILABILITY PARAMETERS ====================
+class AvailabilityParamsTests(TestCase):
+    """Each bad availability parameter gets its own 400 message"""
+
+    def setUp(self):
+        self.stylist = Stylist.objects.create(name='Stylist', email='s@example.com', phone='+254700000000')
+
+    def assertError(self, url, params, message):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn(message, response.json()['error'])
+
+    def test_available_slots_errors(self):
+        url = f'/api/stylists/{self.stylist.pk}/available_slots/'
+        self.assertError(url, {'date': '2030-13-40'}, 'Invalid date format')
+        self.assertError(url, {'date': '2030-01-10', 'service': '999'}, 'Unknown service: 999')
+
+    def test_availability_errors(self):
+        url = '/api/stylists/availability/'
+        self.assertError(url, {'days': 'abc'}, 'days must be a number')
+        self.assertError(url, {'days': '0'}, 'days must be a number')
+        self.assertError(url, {'stylists': '1,x'}, 'stylists must be')
+        self.assertError(url, {'service': 'abc'}, 'Unknown service')
+
+
+# ==================== METRICS ====================
+class BusinessGaugeTests(TestCase):
+    def test_gauges_do_not_count_as_cache_traffic(self):
+        cache.clear()
+        before = dict(CACHE_STATS)
+        first = get_business_gauges()
+        self.assertEqual(get_business_gauges(), first)
+        self.assertEqual(dict(CACHE_STATS), before)
+
+    def test_gauges_are_one_query_each_and_follow_booking_writes(self):
+        cache.clear()
+        with self.assertNumQueries(2):
+            get_business_gauges()
+        with self.assertNumQueries(0):
+            get_business_gauges()
+
+        service = Service.objects.create(name='Cut', category='hair', description='d', price=500, duration_minutes=60)
+        Booking.objects.create(
+            fullname='Client', phone='+254711000000', service=service,
+            date=timezone.localdate() + timedelta(days=1), time=time(10), send_email=False,
+        )
+        self.assertEqual(get_business_gauges()['bookings_pending'], 1)
+
+
+# ==================== KEYSET PAGINATION ====================
+def encode_cursor(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+
+
+class KeysetPaginationTests(TestCase):
+    client_class = APIClient
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user('admin', 'admin@example.com', 'pw', is_staff=True))
+        now = timezone.now()
+        # Every other customer has no bookings yet (NULL last_booking_at)
+        for n in range(7):
+            Customer.objects.create(
+                phone_key=f'+2547000000{n:02d}', name=f'Customer {n}',
+                last_booking_at=now - timedelta(days=n) if n % 2 else None,
+            )
+
+    def walk(self, url):
+        """Phone keys of every page, following `next`"""
+        forward, pages = [], []
+        while url:
+            data = self.client.get(url).json()
+            pages.append([row['phone'] for row in data['results']])
+            forward += pages[-1]
+            url = data['next']
+        return forward, pages
+
+    def test_pages_cover_null_positions(self):
+        expected = [customer.phone_key for customer in Customer.objects.order_by(
+            F('last_booking_at').desc(nulls_last=True), '-id'
+        )]
+        forward, pages = self.walk('/api/customers/?limit=2')
+        self.assertEqual(forward, expected)
+        self.assertEqual(len(pages), 4)
+
+        # `previous` of the last page (which starts at a NULL) is the page before it
+        page = self.client.get('/api/customers/?limit=2').json()
+        while page['next']:
+            before, page = page, self.client.get(page['next']).json()
+        self.assertEqual(
+            [row['phone'] for row in self.client.get(page['previous']).json()['results']],
+            [row['phone'] for row in before['results']],
+        )
+
+    def test_tampered_cursor_is_not_found(self):
+        for cursor in (
+            encode_cursor({'d': 'n', 'p': ['abc', 'x', '1']}),
+            encode_cursor({'d': 'n', 'p': 'abc'}),
+            encode_cursor({'d': 'n', 'p': [None, None, '1']}),
+            'not-base64!',
+        ):
+            response = self.client.get('/api/bookings/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+    def test_invalid_limit(self):
+        response = self.client.get('/api/bookings/', {'limit': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('limit', response.json()['error'])
+
+
+# ==================== CATALOG CACHE HEADERS ====================
+class CatalogCacheHeaderTests(TestCase):
+    client_class = APIClient
+
+    def setUp(self):
+        Stylist.objects.create(name='Active', email='a@example.com', phone='+254700000001')
+        Stylist.objects.create(name='Inactive', email='i@example.com', phone='+254700000002', is_active=False)
+
+    def test_staff_list_is_never_public(self):
+        anonymous = self.client.get('/api/stylists/')
+        self.assertIn('public', anonymous['Cache-Control'])
+        self.assertIn('Authorization', anonymous['Vary'])
+
+        self.client.force_authenticate(User.objects.create_user('staff', 'staff@example.com', 'pw', is_staff=True))
+        staff = self.client.get('/api/stylists/')
+        self.assertEqual(len(staff.json()['results']), 2)
+        self.assertIn('private', staff['Cache-Control'])
+        self.assertNotIn('public', staff['Cache-Control'])
+        self.assertIn('Authorization', staff['Vary'])
+
+
+# ==================== SERVICE DURATION CHANGES ====================
+class ServiceDurationTests(TestCase):
+    client_class = APIClient
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user('staff', 'staff@example.com', 'pw', is_staff=True))
+        self.service = Service.objects.create(name='Cut', category='hair', description='d', price=500, duration_minutes=60)
+        self.stylist = Stylist.objects.create(name='Stylist', email='s@example.com', phone='+254700000000')
+        day = timezone.localdate() + timedelta(days=3)
+        # Back to back: 10:00-11:00 and 11:00-12:00
+        self.first, self.second = [
+            Booking.objects.create(
+                fullname=f'Client {hour}', phone='+254711000000', service=self.service, stylist=self.stylist,
+                date=day, time=time(hour), send_email=False,
+            )
+            for hour in (10, 11)
+        ]
+
+    def test_lengthening_into_the_next_booking_is_refused(self):
+        response = self.client.patch(f'/api/services/{self.service.pk}/', {'duration_minutes': 90}, format='json')
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn(f'#{self.first.pk}', response.json()['duration_minutes'][0])
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.ends_at - self.first.starts_at, timedelta(minutes=60))
+
+        self.service.duration_minutes = 90
+        with self.assertRaises(ValidationError):
+            self.service.full_clean()
+
+    def test_changes_without_clashes_move_ends_at(self):
+        response = self.client.patch(f'/api/services/{self.service.pk}/', {'duration_minutes': 45}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.second.delete()
+        response = self.client.patch(f'/api/services/{self.service.pk}/', {'duration_minutes': 120}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.ends_at - self.first.starts_at, timedelta(minutes=120))
+
+
+class UpcomingTests(TestCase):
+    def test_started_bookings_are_not_upcoming(self):
+        service = Service.objects.create(name='Cut', category='hair', description='d', price=500, duration_minutes=60)
+        now = timezone.localtime()
+        for starts in (now - timedelta(hours=1), now + timedelta(hours=1)):
+            # Saved with raw dates: the serializer (not the model) rejects past slots
+            Booking.objects.create(
+                fullname='Client', phone='+254711000000', service=service,
+                date=starts.date(), time=starts.time().replace(microsecond=0), send_email=False,
+            )
+        later = Booking.objects.get(starts_at__gt=timezone.now())
+        self.assertEqual(compute_booking_stats()['by_date_range']['upcoming'], 1)
+        self.assertEqual(list(Booking.objects.upcoming()), [later])
+
+
+# ==================== STAFF-ONLY BOOKING ENDPOINTS ====================
+class StaffBookingEndpointTests(TestCase):
+    client_class = APIClient
+
+    def test_registered_users_cannot_read_salon_wide_data(self):
+        self.client.force_authenticate(User.objects.create_user('client', 'client@example.com', 'pw'))
+        for url in ('/api/bookings/stats/', '/api/bookings/changes/', '/api/bookings/export/'):
+            self.assertEqual(self.client.get(url).status_code, 403, url)
+
+        self.client.force_authenticate(User.objects.create_user('staff', 'staff@example.com', 'pw', is_staff=True))
+        for url in ('/api/bookings/stats/', '/api/bookings/changes/'):
+            self.assertEqual(self.client.get(url).status_code, 200, url)
+        for url in ('/api/bookings/stats/', '/api/bookings/export/'):
+            response = self.client.get(url, {'date_from': '2030-02-30'})
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn('Invalid date format', response.json()['error'])
+
+
+# ==================== LIVE EVENTS ====================
+class StreamTicketTests(TestCase):
+    client_class = APIClient
+
+    def setUp(self):
+        self.staff = User.objects.create_user('staff', 'staff@example.com', 'pw', is_staff=True)
+
+    def stream_user(self, **params):
+        return authenticate_stream(RequestFactory().get('/api/events/bookings/', params))
+
+    def test_only_staff_get_tickets(self):
+        self.client.force_authenticate(User.objects.create_user('client', 'client@example.com', 'pw'))
+        self.assertEqual(self.client.post('/api/events/bookings/ticket/').status_code, 403)
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.post('/api/events/bookings/ticket/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.stream_user(ticket=response.json()['ticket']), self.staff)
+
+    def test_stream_url_takes_only_a_fresh_ticket(self):
+        ticket = issue_stream_ticket(self.staff)
+        self.assertIsNone(self.stream_user(ticket=ticket + 'x'))
+        # The access token no longer works in the URL
+        self.assertIsNone(self.stream_user(token=str(AccessToken.for_user(self.staff))))
+
+        with mock.patch('django.core.signing.time.time', return_value=clock.time() + 61):
+            self.assertIsNone(self.stream_user(ticket=ticket))
+
+        self.staff.is_active = False
+        self.staff.save()
+        self.assertIsNone(self.stream_user(ticket=issue_stream_ticket(self.staff)))
+
+
+# ==================== MODEL-VERSIONED CACHE (REDIS) ====================
+FAKE_REDIS_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/1',
+        'OPTIONS': {'connection_class': fakeredis.FakeConnection} if fakeredis else {},
+        'KEY_PREFIX': 'salon-test',
+    }
+}
+
+
+@skipUnless(fakeredis, 'fakeredis is not installed (pip install -r requirements-dev.txt)')
+@override_settings(CACHES=FAKE_REDIS_CACHES)
+class VersionedCacheTests(TestCase):
+    """Version keys and signal-driven invalidation against the Redis cache backend"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_versioned_key_changes_only_on_bump(self):
+        key = versioned_key('services', [Service, Stylist], 'page', 1)
+        self.assertEqual(versioned_key('services', [Service, Stylist], 'page', 1), key)
+        self.assertEqual(get_model_version(Service), 1)
+
+        bump_model_version(Service)
+        self.assertEqual(get_model_version(Service), 2)
+        self.assertNotEqual(versioned_key('services', [Service, Stylist], 'page', 1), key)
+
+    def test_bump_without_a_stored_version(self):
+        bump_model_version(Stylist)
+        self.assertEqual(get_model_version(Stylist), 2)
+
+    def test_writes_invalidate_cached_values(self):
+        computed = []
+
+        def service_names():
+            computed.append(1)
+            return sorted(Service.objects.values_list('name', flat=True))
+
+        def names():
+            return cached_for_models('service-names', [Service], service_names)
+
+        service = Service.objects.create(name='Cut', category='hair', description='d', price=500, duration_minutes=60)
+        self.assertEqual(names(), ['Cut'])
+        self.assertEqual(names(), ['Cut'])
+        self.assertEqual(len(computed), 1)
+
+        service.name = 'Trim'
+        service.save()
+        self.assertEqual(names(), ['Trim'])
+        service.delete()
+        self.assertEqual(names(), [])
+        self.assertEqual(len(computed), 3)
+
+    def test_catalog_response_follows_writes(self):
+        Service.objects.create(name='Cut', category='hair', description='d', price=500, duration_minutes=60)
+        self.assertEqual(len(self.client.get('/api/services/').json()['results']), 1)
+        Service.objects.create(name='Wash', category='hair', description='d', price=300, duration_minutes=30)
+        self.assertEqual(len(self.client.get('/api/services/').json()['results']), 2)
+
+
+# ==================== CUSTOMER PROFILES ====================
+class CustomerAggregateTests(TestCase):
+    FIELDS = [
+        'phone_key', 'name', 'email', 'booking_count', 'completed_count', 'cancelled_count', 'total_spent',
+        'first_booking_at', 'last_booking_at', 'last_visit_at',
+    ]
+
+    def customers(self):
+        return list(Customer.objects.order_by('phone_key').values(*self.FIELDS))
+
+    def test_incremental_updates_match_a_rebuild(self):
+        service = Service.objects.create(name='Cut', category='hair', description='d', price=500, duration_minutes=60)
+        today = timezone.localdate()
+
+        def book(days, name, email=None, phone='0711 000000', status='pending'):
+            return Booking.objects.create(
+                fullname=name, email=email, phone=phone, service=service, status=status,
+                date=today + timedelta(days=days), time=time(10), send_email=False,
+            )
+
+        book(10, 'Latest', 'latest@example.com')
+        # Created later but earlier appointments: must not overwrite name/email
+        book(-30, 'Old name', 'old@example.com', phone='+254 711 000000', status='completed')
+        book(5, 'Middle', None, phone='254711000000')
+        visit = book(-3, 'Other', phone='0722000000')
+        visit.status = 'completed'
+        visit.save()
+        cancelled = book(-1, 'Other again', phone='0722000000')
+        cancelled.status = 'cancelled'
+        cancelled.save()
+
+        incremental = self.customers()
+        self.assertEqual(incremental[0]['name'], 'Latest')
+        self.assertEqual(incremental[0]['email'], 'latest@example.com')
+        rebuild_customers()
+        self.assertEqual(self.customers(), incremental)
+
+
+# ==================== DOUBLE BOOKING ====================
+class SlotOverlapTests(TestCase):
+    """Overlapping bookings of a stylist are rejected with a 400, never stored"""
+    client_class = APIClient
+
+    def setUp(self):
+        self.service = Service.objects.create(name='Cut', category='hair', description='d', price=500, duration_minutes=60)
+        self.stylist = Stylist.objects.create(name='Stylist', email='s@example.com', phone='+254700000000')
+        self.day = timezone.localdate() + timedelta(days=3)
+        self.booking = self.book(time(10))
+
+    def book(self, at, **fields):
+        return Booking.objects.create(
+            fullname='Client', phone='+254711000000', service=self.service, stylist=self.stylist,
+            date=self.day, time=at, send_email=False, **fields
+        )
+
+    def active(self):
+        return Booking.objects.filter(stylist=self.stylist, status__in=Booking.ACTIVE_STATUSES).count()
+
+    def test_create_overlapping_booking(self):
+        for at in ('10:00', '10:30', '09:30'):
+            response = self.client.post('/api/bookings/', {
+                'fullname': 'Other', 'phone': '0722000000', 'email': 'o@example.com', 'service': self.service.pk,
+                'stylist': self.stylist.pk, 'date': self.day.isoformat(), 'time': at, 'notes': '', 'send_email': False,
+            }, format='json')
+            self.assertEqual(response.status_code, 400, at)
+            self.assertIn('time', response.json())
+        self.assertEqual(self.active(), 1)
+
+    def test_reconfirm_cancelled_booking_after_slot_was_taken(self):
+        self.booking.status = 'cancelled'
+        self.booking.save()
+        self.book(time(10, 30))
+
+        response = self.client.post(f'/api/bookings/{self.booking.pk}/confirm/')
+        self.assertEqual(response.status_code, 400, response.content)
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.status, 'cancelled')
+        self.assertEqual(self.active(), 1)
+
+    def test_move_onto_taken_slot(self):
+        later = self.book(time(12))
+        response = self.client.patch(f'/api/bookings/{later.pk}/', {'time': '10:30'}, format='json')
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn('time', response.json())
+        later.refresh_from_db()
+        self.assertEqual(later.time, time(12))
+
+        response = self.client.patch(f'/api/bookings/{later.pk}/', {'time': '11:00'}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
@@ -1,14 +1,23 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
     ServiceViewSet,
     StylistViewSet,
     BookingViewSet,
+    CustomerViewSet,
     ContactMessageViewSet,
     ReviewViewSet,
     SalonSettingsViewSet,
     health_check,
+    health_live,
+    health_ready,
+    request_metrics,
+    metrics,
+    booking_events,
+    booking_events_ticket,
+    search,
     LoginView,
     SignupView,
     LogoutView,
@@ -22,6 +31,7 @@ router = DefaultRouter()
 router.register(r'services', ServiceViewSet, basename='service')
 router.register(r'stylists', StylistViewSet, basename='stylist')
 router.register(r'bookings', BookingViewSet, basename='booking')
+router.register(r'customers', CustomerViewSet, basename='customer')
 router.register(r'contacts', ContactMessageViewSet, basename='contact')
 router.register(r'reviews', ReviewViewSet, basename='review')
 router.register(r'settings', SalonSettingsViewSet, basename='settings')
@@ -32,8 +42,16 @@ router.register(r'settings', SalonSettingsViewSet, basename='settings')
 urlpatterns = [
     path('', include(router.urls)),
     path('health/', health_check, name='health-check'),
+    path('health/live/', health_live, name='health-live'),
+    path('health/ready/', health_ready, name='health-ready'),
+    path('metrics/', metrics, name='metrics'),
+    path('metrics/requests/', request_metrics, name='request-metrics'),
+    path('events/bookings/', booking_events, name='booking-events'),
+    path('events/bookings/ticket/', booking_events_ticket, name='booking-events-ticket'),
+    path('search/', search, name='search'),
     path('auth/signup/', SignupView.as_view(), name='signup'),
     path('auth/login/', LoginView.as_view(), name='login'),
     path('auth/logout/', LogoutView.as_view(), name='logout'),
+    path('auth/token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
     path('auth/profile/', UserProfileView.as_view(), name='profile'),
 ]
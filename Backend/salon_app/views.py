@@ -1,35 +1,57 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, BasePermission, IsAdminUser, IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.conf import settings as django_settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare
+from django.db.models import F, Q
 from django.utils import timezone
+from asgiref.sync import sync_to_async
 
-from .models import Service, Stylist, Booking, ContactMessage, Review, SalonSettings
+from .models import Service, Stylist, Booking, Customer, ContactMessage, Review, SalonSettings, normalize_phone
 from .serializers import (
     ServiceSerializer, StylistSerializer, BookingCreateSerializer,
-    BookingListSerializer, ContactMessageSerializer, ReviewSerializer,
-    SalonSettingsSerializer
+    BookingListSerializer, CustomerSerializer, ContactMessageSerializer, ReviewSerializer,
+    SalonSettingsSerializer, SLOT_TAKEN_ERROR
 )
+from .stats import get_booking_stats
+from .exports import EXPORT_FORMATS, booking_export_rows
+from .feeds import InvalidToken, TokenExpired, booking_changes
+from .events import authenticate_stream, event_stream, issue_stream_ticket
+from .search import SEARCH_SOURCES, search as search_index
+from .instrumentation import route_registry
+from .metrics import render_metrics
+from . import health
+from .conditional import ConditionalCatalogMixin, make_etag, not_modified_response, set_validators
+from .pagination import (
+    BookingPagination, CreatedAtPagination, CustomerHistoryPagination, CustomerPagination,
+    ServicePagination, StylistPagination
+)
+from .availability import find_available_slots, find_first_available_slot
+from .scheduling import SlotTaken, confirm_booking
 
 
 # ==================== SERVICE VIEWSET ====================
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(ConditionalCatalogMixin, viewsets.ModelViewSet):
     """
     List, retrieve, create, and manage services.
     GET /api/services/
     GET /api/services/{id}/
+    GET /api/services/?category=hair,nails
     POST /api/services/ - Create new service (admin only)
     PUT /api/services/{id}/ - Update service (admin only)
     DELETE /api/services/{id}/ - Delete service (admin only)
     """
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
-    filterset_fields = ['category']
+    pagination_class = ServicePagination
+    filter_fields = {'category': 'category'}
     
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -56,7 +78,7 @@ class ServiceViewSet(viewsets.ModelViewSet):
 
 
 # ==================== STYLIST VIEWSET ====================
-class StylistViewSet(viewsets.ModelViewSet):
+class StylistViewSet(ConditionalCatalogMixin, viewsets.ModelViewSet):
     """
     List, retrieve, create, and manage stylists.
     GET /api/stylists/
@@ -64,10 +86,13 @@ class StylistViewSet(viewsets.ModelViewSet):
     POST /api/stylists/ - Create new stylist (admin only)
     PUT /api/stylists/{id}/ - Update stylist (admin only)
     DELETE /api/stylists/{id}/ - Delete stylist (admin only)
-    GET /api/stylists/{id}/available-slots/?date=2026-01-20
+    GET /api/stylists/{id}/available-slots/?date=2026-01-20&service=1
+    GET /api/stylists/availability/?service=1&date=2026-01-20&days=7&stylists=1,2
+    GET /api/stylists/first_available/?service=1&days=14
     """
     queryset = Stylist.objects.filter(is_active=True)
     serializer_class = StylistSerializer
+    pagination_class = StylistPagination
     
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -76,9 +101,47 @@ class StylistViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Show inactive stylists to admins, only active to others"""
+        queryset = Stylist.objects.prefetch_related('available_services')
         if self.request.user and self.request.user.is_authenticated:
-            return Stylist.objects.all()
-        return Stylist.objects.filter(is_active=True)
+            return queryset
+        return queryset.filter(is_active=True)
+    
+    def get_catalog_querysets(self):
+        """Stylists embed their services, so service changes count too"""
+        return [self.get_queryset(), Service.objects.all()]
+    
+    MAX_AVAILABILITY_DAYS = 31
+    
+    def get_availability_params(self, request, default_days=1):
+        """Parse service, date, days and stylists query parameters; ValueError names the bad one"""
+        from datetime import datetime, timedelta
+        
+        service = None
+        service_id = request.query_params.get('service')
+        if service_id:
+            service = Service.objects.filter(pk=service_id, is_active=True).first() if service_id.isdigit() else None
+            if service is None:
+                raise ValueError(f'Unknown service: {service_id}')
+        
+        date_str = request.query_params.get('date')
+        try:
+            date_from = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else timezone.localdate()
+        except ValueError:
+            raise ValueError('Invalid date format. Use YYYY-MM-DD')
+        
+        days = request.query_params.get('days', str(default_days))
+        if not days.isdigit() or not 1 <= int(days) <= self.MAX_AVAILABILITY_DAYS:
+            raise ValueError(f'days must be a number between 1 and {self.MAX_AVAILABILITY_DAYS}')
+        
+        stylists = None
+        stylist_ids = request.query_params.get('stylists')
+        if stylist_ids:
+            stylists = [pk.strip() for pk in stylist_ids.split(',') if pk.strip()]
+            if not all(pk.isdigit() for pk in stylists):
+                raise ValueError('stylists must be a comma-separated list of stylist ids')
+            stylists = [int(pk) for pk in stylists]
+        
+        return service, date_from, date_from + timedelta(days=int(days) - 1), stylists
     
     @action(detail=True, methods=['get'])
     def available_slots(self, request, pk=None):
@@ -93,19 +156,66 @@ class StylistViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            from datetime import datetime
-            date = datetime.strptime(date_str, '%Y-%m-%d').date()
-            slots = stylist.available_slots(date)
-            
-            return Response({
-                'date': date,
-                'available_slots': [str(slot) for slot in slots]
-            })
-        except ValueError:
-            return Response(
-                {'error': 'Invalid date format. Use YYYY-MM-DD'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+            service, date, _, _ = self.get_availability_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        slots = stylist.available_slots(date, service=service)
+        return Response({
+            'date': date,
+            'available_slots': [str(slot) for slot in slots]
+        })
+    
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        """Get available time slots for many stylists over a date range"""
+        try:
+            service, date_from, date_to, stylists = self.get_availability_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if stylists is None and service is None:
+            stylists = self.get_queryset()
+        availability = find_available_slots(service, date_from, date_to, stylists)
+        
+        return Response({
+            'service': service.pk if service else None,
+            'date_from': date_from,
+            'date_to': date_to,
+            'stylists': [
+                {
+                    'id': stylist.pk,
+                    'name': stylist.name,
+                    'available_slots': {
+                        str(day): [str(slot) for slot in slots]
+                        for day, slots in per_day.items()
+                    },
+                }
+                for stylist, per_day in availability.items()
+            ],
+        })
+    
+    @action(detail=False, methods=['get'])
+    def first_available(self, request):
+        """Get the first free slot across all stylists"""
+        try:
+            service, date_from, date_to, stylists = self.get_availability_params(request, default_days=14)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        days = (date_to - date_from).days + 1
+        slot = find_first_available_slot(service, date_from, days, stylists)
+        if slot is None:
+            return Response({'available': False, 'date_from': date_from, 'date_to': date_to})
+        
+        stylist, date, time = slot
+        return Response({
+            'available': True,
+            'stylist_id': stylist.pk,
+            'stylist_name': stylist.name,
+            'date': date,
+            'time': str(time),
+        })
 
 
 # ==================== BOOKING VIEWSET ====================
@@ -115,34 +225,69 @@ class BookingViewSet(viewsets.ModelViewSet):
     
     POST /api/bookings/ - Create new booking
     GET /api/bookings/ - List all bookings
+    GET /api/bookings/?status=pending,confirmed&date_from=&date_to=&stylist=&service=&category=&phone=
+    GET /api/bookings/?ordering=-date|date|-created_at|created_at
+    GET /api/bookings/?compact=true - List bookings as flat rows
     GET /api/bookings/{id}/ - Get booking details
     PUT /api/bookings/{id}/ - Update booking
     DELETE /api/bookings/{id}/ - Cancel booking
     POST /api/bookings/{id}/confirm/ - Confirm booking
     POST /api/bookings/{id}/cancel/ - Cancel booking
+    GET /api/bookings/stats/ - Booking counts for the dashboard (admin only)
+    GET /api/bookings/changes/?since=<token> - Incremental upcoming-bookings feed (admin only)
     """
     
+    queryset = Booking.objects.all()
     permission_classes = [AllowAny]
-    filterset_fields = ['status', 'date', 'phone']
-    search_fields = ['fullname', 'phone', 'email']
-    ordering_fields = ['date', 'time', 'created_at']
-    ordering = ['-date', '-time']
+    pagination_class = BookingPagination
+    # Query parameter -> lookup; each must be backed by an index (checked at startup)
+    filter_fields = {
+        'status': 'status',
+        'date': 'date',
+        'date_from': 'date__gte',
+        'date_to': 'date__lte',
+        'stylist': 'stylist',
+        'service': 'service',
+        'category': 'service__category',
+        # Normalized, so +254 712..., 0712... and 254712... find the same customer
+        'phone': 'phone_key',
+    }
+    
+    # Flat row fields for ?compact=true, read straight from the database
+    COMPACT_FIELDS = {
+        'service_name': F('service__name'),
+        'stylist_name': F('stylist__name'),
+        'price': F('service__price'),
+    }
+    
+    def is_compact(self):
+        return self.request.query_params.get('compact', '').lower() in ('1', 'true', 'yes')
     
     def get_queryset(self):
-        """Filter bookings by phone number or status"""
-        queryset = Booking.objects.all()
-        phone = self.request.query_params.get('phone')
-        
-        if phone:
-            queryset = queryset.filter(phone=phone)
-        
-        return queryset
+        """Bookings, with related objects unless listing compact rows (filters: filter_fields)"""
+        if self.action == 'list' and self.is_compact():
+            return Booking.objects.all()
+        return Booking.objects.with_related().with_upcoming()
     
     def get_serializer_class(self):
         if self.action == 'create':
             return BookingCreateSerializer
         return BookingListSerializer
     
+    def list(self, request, *args, **kwargs):
+        """List bookings, as flat rows without nested objects when compact"""
+        if not self.is_compact():
+            return super().list(request, *args, **kwargs)
+        
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            'id', 'fullname', 'phone', 'service_id', 'stylist_id',
+            'date', 'time', 'status', 'created_at', **self.COMPACT_FIELDS
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
+    
     @action(detail=True, methods=['post'])
     def confirm(self, request, pk=None):
         """Confirm a booking"""
@@ -154,9 +299,13 @@ class BookingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        booking.status = 'confirmed'
-        booking.confirmed_at = timezone.now()
-        booking.save()
+        try:
+            confirm_booking(booking)
+        except SlotTaken:
+            return Response(
+                {'error': SLOT_TAKEN_ERROR},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         booking.send_confirmation_email()
         
         serializer = BookingListSerializer(booking)
@@ -181,15 +330,134 @@ class BookingViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
-        """Get upcoming bookings"""
-        from datetime import datetime
-        bookings = Booking.objects.filter(
-            date__gte=datetime.today(),
-            status__in=['confirmed', 'pending']
-        ).order_by('date', 'time')
+        """Get upcoming bookings (one range scan on starts_at)"""
+        bookings = Booking.objects.with_related().upcoming()
         
         serializer = BookingListSerializer(bookings, many=True)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def changes(self, request):
+        """
+        Upcoming bookings changed since a token, for dashboards keeping a local copy.
+        GET /api/bookings/changes/ - snapshot of the upcoming set, plus a token
+        GET /api/bookings/changes/?since=<next>&limit=200 - upserts and removed ids since then
+        """
+        limit = self.paginator.get_page_size(request)
+        try:
+            return Response(booking_changes(request.query_params.get('since'), limit))
+        except InvalidToken as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except TokenExpired as e:
+            return Response({'error': str(e)}, status=status.HTTP_410_GONE)
+    
+    def get_date_range(self, request):
+        """date_from/date_to query parameters as dates (None when absent); ValueError if malformed"""
+        from datetime import datetime
+        return [
+            datetime.strptime(value, '%Y-%m-%d').date() if value else None
+            for value in (request.query_params.get('date_from'), request.query_params.get('date_to'))
+        ]
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def stats(self, request):
+        """Get booking counts by status, date range, service and stylist"""
+        try:
+            date_from, date_to = self.get_date_range(request)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid date format. Use YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(get_booking_stats(date_from, date_to))
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """
+        Stream bookings as CSV or NDJSON (staff only), without loading them into memory.
+        GET /api/bookings/export/?type=csv|ndjson&date_from=YYYY-MM-DD&date_to=YYYY-MM-DD&status=confirmed,completed
+        """
+        try:
+            date_from, date_to = self.get_date_range(request)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid date format. Use YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        statuses = [code for code in request.query_params.get('status', '').split(',') if code]
+        invalid = set(statuses) - {code for code, label in Booking.STATUS_CHOICES}
+        if invalid:
+            return Response(
+                {'error': f'Invalid status: {", ".join(sorted(invalid))}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        export_type = request.query_params.get('type', 'csv')
+        if export_type not in EXPORT_FORMATS:
+            return Response(
+                {'error': 'type must be csv or ndjson'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        stream, content_type = EXPORT_FORMATS[export_type]
+        response = StreamingHttpResponse(
+            stream(booking_export_rows(date_from, date_to, statuses)),
+            content_type=content_type
+        )
+        filename = f'bookings-{date_from or "start"}-{date_to or "end"}.{export_type}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+# ==================== CUSTOMER VIEWSET ====================
+class CustomerViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Customer profiles (one aggregate row each) and booking history, looked
+    up by phone number in any format.
+    
+    GET /api/customers/?ordering=-last_booking_at|-total_spent - Customers (admin only)
+    GET /api/customers/{phone}/ - Visit count, spend, last visit... (admin only)
+    GET /api/customers/{phone}/bookings/ - Bookings for the phone, newest first
+    """
+    
+    queryset = Customer.objects.all()
+    serializer_class = CustomerSerializer
+    pagination_class = CustomerPagination
+    lookup_field = 'phone_key'
+    lookup_url_kwarg = 'phone'
+    lookup_value_regex = '[^/]+'
+    
+    def get_permissions(self):
+        if self.action == 'bookings':
+            return [AllowAny()]
+        return [IsAdminUser()]
+    
+    # Booking columns all come from booking_phone_key_history (no table reads)
+    HISTORY_FIELDS = ('id', 'starts_at', 'status', 'service_id', 'stylist_id')
+    HISTORY_ANNOTATIONS = {
+        'service_name': F('service__name'),
+        'stylist_name': F('stylist__name'),
+        'price': F('service__price'),
+    }
+    
+    @action(detail=True, methods=['get'])
+    def bookings(self, request, phone=None):
+        """Flat booking rows for one customer, keyset paginated on (starts_at, id)"""
+        phone_key = normalize_phone(phone)
+        if not phone_key:
+            return Response({'error': 'Invalid phone number'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = Booking.objects.filter(phone_key=phone_key).values(
+            *self.HISTORY_FIELDS, **self.HISTORY_ANNOTATIONS
+        )
+        paginator = CustomerHistoryPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        for row in page:
+            starts_at = timezone.localtime(row['starts_at'])
+            row['date'], row['time'] = starts_at.date(), starts_at.time()
+        return paginator.get_paginated_response(page)
 
 
 # ==================== CONTACT MESSAGE VIEWSET ====================
@@ -203,6 +471,7 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
     
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
+    pagination_class = CreatedAtPagination
     
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -211,7 +480,7 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
 
 
 # ==================== REVIEW VIEWSET ====================
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalCatalogMixin, viewsets.ModelViewSet):
     """
     Manage reviews and testimonials.
     
@@ -221,6 +490,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     
     serializer_class = ReviewSerializer
     permission_classes = [AllowAny]
+    pagination_class = CreatedAtPagination
     
     def get_queryset(self):
         if self.request.method == 'GET':
@@ -242,10 +512,15 @@ class SalonSettingsViewSet(viewsets.ReadOnlyModelViewSet):
     
     @action(detail=False, methods=['get'])
     def current(self, request):
-        """Get current salon settings"""
+        """Get current salon settings (supports If-None-Match / If-Modified-Since)"""
         settings = SalonSettings.get_settings()
-        serializer = self.get_serializer(settings)
-        return Response(serializer.data)
+        etag = make_etag('settings', settings.pk, settings.updated_at.isoformat())
+        
+        response = not_modified_response(request, etag, settings.updated_at)
+        if response is None:
+            serializer = self.get_serializer(settings)
+            response = Response(serializer.data)
+        return set_validators(response, etag, settings.updated_at, max_age=60)
 
 
 # ==================== UTILITY ENDPOINTS ====================
@@ -256,6 +531,155 @@ def health_check(request):
     return Response({'status': 'ok', 'message': 'Salon API is running'})
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def health_live(request):
+    """
+    Liveness probe: the worker is up (never touches dependencies).
+    GET /api/health/live/
+    """
+    return Response({'status': 'ok', **health.liveness()})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def health_ready(request):
+    """
+    Readiness probe: database, migrations, cache and email backend, with timings.
+    GET /api/health/ready/ - 503 when a required dependency is down
+    """
+    ready, checks = health.readiness()
+    return Response(
+        {'status': 'ok' if ready else 'unavailable', 'checks': checks},
+        status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def request_metrics(request):
+    """
+    Per-route latency percentiles, query counts and sizes for this worker.
+    GET /api/metrics/requests/
+    DELETE /api/metrics/requests/ - Reset the rolling windows
+    """
+    if request.method == 'DELETE':
+        route_registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    import os
+    return Response({
+        'pid': os.getpid(),
+        'window': route_registry.window,
+        'routes': route_registry.snapshot(),
+    })
+
+
+class MetricsPermission(BasePermission):
+    """Staff users, or scrapers sending `Authorization: Token <METRICS_TOKEN>`"""
+
+    def has_permission(self, request, view):
+        if request.user and request.user.is_staff:
+            return True
+        token = getattr(django_settings, 'METRICS_TOKEN', '')
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        return bool(token) and constant_time_compare(header, f'Token {token}')
+
+
+@api_view(['GET'])
+@permission_classes([MetricsPermission])
+def metrics(request):
+    """
+    Prometheus scrape endpoint (counters are per worker process).
+    GET /api/metrics/
+    """
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# ==================== SEARCH ====================
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def search(request):
+    """
+    Full-text search over bookings, contact messages and reviews.
+    GET /api/search/?q=wanjiku braids&type=booking,review&limit=20
+    
+    Every word matches as a prefix ("wanj" finds "Wanjiku"); phone numbers
+    match in 2547... and 07... form.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind]
+    unknown = [kind for kind in kinds if kind not in SEARCH_SOURCES]
+    if unknown:
+        return Response(
+            {'error': f'Unknown type: {", ".join(unknown)}. Use {", ".join(SEARCH_SOURCES)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    except ValueError:
+        return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    entries = search_index(query, kinds or None, limit)
+    return Response({
+        'query': query,
+        'results': [
+            {'type': entry.kind, 'id': entry.object_id, 'title': entry.title}
+            for entry in entries
+        ],
+    })
+
+
+# ==================== LIVE EVENTS ====================
+async def booking_events(request):
+    """
+    Server-Sent Events stream of booking changes for the staff dashboard.
+    GET /api/events/bookings/?ticket=<stream ticket>
+    
+    Needs the ASGI application (salon_project.asgi): each open stream is a
+    coroutine instead of a blocked worker thread.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'error': 'Live events are served by the ASGI application (salon_project.asgi)'},
+            status=status.HTTP_501_NOT_IMPLEMENTED
+        )
+    
+    user = await sync_to_async(authenticate_stream)(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided or are invalid'}, status=401)
+    if not user.is_staff:
+        return JsonResponse({'error': 'Staff access required'}, status=403)
+    
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def booking_events_ticket(request):
+    """
+    Ticket for opening the booking events stream.
+    POST /api/events/bookings/ticket/
+    
+    EventSource can't send an Authorization header; the ticket goes in the
+    stream URL instead of the access token and expires within a minute.
+    """
+    return Response({
+        'ticket': issue_stream_ticket(request.user),
+        'expires_in': getattr(django_settings, 'BOOKING_EVENTS_TICKET_SECONDS', 60),
+    })
+
+
 # ==================== AUTHENTICATION VIEWSET ====================
 class SignupView(APIView):
     """
@@ -2,6 +2,7 @@
 __init__ file for salon_project
 """
 
-# Celery app initialization (if using Celery)
-# from .celery import app as celery_app
-# __all__ = ['celery_app']
+# Celery app initialization (background email delivery)
+from .celery import app as celery_app
+
+__all__ = ['celery_app']
@@ -0,0 +1,16 @@
+"""
+ASGI config for salon_project.
+
+Required for the long-lived /api/events/ streams; route only those here
+and keep the rest of the site on wsgi.py (streamed exports, persistent DB
+connections). Run it with an async worker, e.g.:
+
+    gunicorn salon_project.asgi:application -k uvicorn.workers.UvicornWorker
+"""
+
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'salon_project.settings')
+
+application = get_asgi_application()
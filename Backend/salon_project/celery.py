@@ -0,0 +1,12 @@
+"""
+Celery config for salon_project.
+"""
+
+import os
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'salon_project.settings')
+
+app = Celery('salon_project')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
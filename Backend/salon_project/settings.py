@@ -36,6 +36,7 @@ INSTALLED_APPS = [
 # Middleware
 # ---------------------------
 MIDDLEWARE = [
+    'salon_app.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -68,6 +69,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'salon_project.wsgi.application'
+ASGI_APPLICATION = 'salon_project.asgi.application'
 
 # ---------------------------
 # Database (PostgreSQL on production, SQLite for local dev)
@@ -77,12 +79,76 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Concurrent bookings wait for the write lock instead of failing fast
+        'OPTIONS': {'timeout': 20},
     }
 }
 # Override with PostgreSQL if DATABASE_URL is set (DigitalOcean)
 if os.environ.get('DATABASE_URL'):
     DATABASES['default'] = dj_database_url.config(conn_max_age=500, ssl_require=True)
 
+# Persistent connections are pinged before reuse, so a worker whose PostgreSQL
+# connection died reconnects instead of failing the next request
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# ---------------------------
+# Logging
+# ---------------------------
+# salon_app.requests emits one JSON line per request (timings, query count, size)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'salon_app': {
+            'handlers': ['console'],
+            'level': os.environ.get('SALON_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# ---------------------------
+# Cache
+# ---------------------------
+# CACHE_BACKEND: "redis" (shared across gunicorn workers; default when REDIS_URL
+# is set), "file", "locmem" (per-process, local dev) or "fakeredis" (offline tests)
+REDIS_URL = os.environ.get('REDIS_URL', '')
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'redis' if REDIS_URL else 'locmem')
+
+if CACHE_BACKEND in ('redis', 'fakeredis'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL or 'redis://localhost:6379/1',
+            'OPTIONS': {},
+        }
+    }
+    if CACHE_BACKEND == 'fakeredis':
+        import fakeredis
+        CACHES['default']['OPTIONS']['connection_class'] = fakeredis.FakeConnection
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', '/tmp/salon_cache'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'salon',
+        }
+    }
+
+CACHES['default'].update({
+    'KEY_PREFIX': 'salon',
+    'TIMEOUT': 300,
+})
+
 # ---------------------------
 # Password validators
 # ---------------------------
@@ -116,13 +182,101 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "salon_app.instrumentation.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_FILTER_BACKENDS": (
+        "salon_app.filters.IndexedFilterBackend",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "salon_app.pagination.KeysetPagination",
+    "PAGE_SIZE": int(os.environ.get("API_PAGE_SIZE", 50)),
 }
 
+# Upper bound for the ?limit= page size on list endpoints
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 200))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
 }
 
+# Dashboard booking stats are cached and invalidated on booking writes
+BOOKING_STATS_CACHE_SECONDS = int(os.environ.get('BOOKING_STATS_CACHE_SECONDS', 60))
+
+# /api/bookings/changes/: rows younger than the settle delay are held back so
+# late commits aren't skipped; tokens (and tombstones) expire after the retention
+BOOKING_FEED_SETTLE_SECONDS = 1
+BOOKING_FEED_RETENTION_DAYS = 30
+
+# Country code assumed for phone numbers typed in local form (0712... -> +254712...)
+PHONE_COUNTRY_CODE = os.environ.get('PHONE_COUNTRY_CODE', '254')
+
+# Minutes between two bookable slot start times
+BOOKING_SLOT_INTERVAL_MINUTES = int(os.environ.get('BOOKING_SLOT_INTERVAL_MINUTES', 60))
+
+# SalonSettings singleton: shared cache entry (invalidated on save) plus a
+# short process-local copy so most reads never leave the worker
+SALON_SETTINGS_CACHE_SECONDS = 3600
+SALON_SETTINGS_LOCAL_SECONDS = 5
+
+# Serialized service/stylist/review responses, keyed by their ETag
+CATALOG_CACHE_SECONDS = 300
+
+# /api/metrics/ is open to staff users and to scrapers sending
+# `Authorization: Token <METRICS_TOKEN>`. Booking gauges are cached until a booking
+# is written (at most METRICS_BOOKING_GAUGE_CACHE_SECONDS); outbox gauges briefly.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+METRICS_GAUGE_CACHE_SECONDS = 15
+METRICS_BOOKING_GAUGE_CACHE_SECONDS = 300
+
+# /api/health/ready/ probes: per-check timeout and how long results are reused
+HEALTH_CHECK_TIMEOUT = float(os.environ.get('HEALTH_CHECK_TIMEOUT', 2))
+HEALTH_CHECK_CACHE_SECONDS = 5
+HEALTH_MIGRATIONS_CACHE_SECONDS = 60
+
+# /api/events/bookings/ (SSE, served by salon_project.asgi). Events fan out
+# in-process, or through Redis pub/sub across workers when a URL is set
+BOOKING_EVENTS_REDIS_URL = os.environ.get('BOOKING_EVENTS_REDIS_URL', REDIS_URL)
+BOOKING_EVENTS_CHANNEL = 'salon:booking-events'
+BOOKING_EVENTS_QUEUE_SIZE = 100
+BOOKING_EVENTS_HEARTBEAT_SECONDS = 15
+# Streams are closed after this long; the dashboard reconnects with a new ticket
+BOOKING_EVENTS_MAX_SECONDS = 600
+# Lifetime of the ?ticket= issued by /api/events/bookings/ticket/
+BOOKING_EVENTS_TICKET_SECONDS = 60
+
+# ---------------------------
+# Email
+# ---------------------------
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'False') == 'True'
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_TIMEOUT = 10
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@salon.com')
+
+# Outgoing emails are written to the EmailOutbox table and delivered by Celery
+# (when CELERY_BROKER_URL is set), `manage.py process_outbox`, or a background thread.
+# Failed sends are retried with backoff: Celery beat and the background thread poll
+# for due retries every EMAIL_OUTBOX_POLL_SECONDS.
+EMAIL_OUTBOX_EAGER = os.environ.get('EMAIL_OUTBOX_EAGER', 'False') == 'True'
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_POLL_SECONDS = 60
+
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', '')
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', '')
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_BEAT_SCHEDULE = {
+    'deliver-email-outbox': {
+        'task': 'salon_app.tasks.deliver_outbox_task',
+        'schedule': EMAIL_OUTBOX_POLL_SECONDS,
+    },
+}
+
 # ---------------------------
 # CORS Configuration
 # ---------------------------
@@ -168,6 +322,7 @@ CORS_ALLOW_HEADERS = [
 CORS_EXPOSE_HEADERS = [
     "content-type",
     "authorization",
+    "server-timing",
 ]
 
 CSRF_TRUSTED_ORIGINS = [